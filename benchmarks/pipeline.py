@@ -0,0 +1,132 @@
+"""
+Compare the time matching_version takes with the manifests fetched while the
+browser version is detected against the same steps one after the other.
+
+The network and the browser are simulated with a fixed latency, so the numbers
+only depend on how the steps overlap:
+
+    python benchmarks/pipeline.py --latency 0.2 --runs 5
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from unittest import mock
+
+from get_chrome_driver import GetChromeDriver, constants, get_driver
+from get_chrome_driver.enums import OsPlatform
+from get_chrome_driver.transport import MemoryTransport
+
+LEGACY_LISTING = b"""<?xml version='1.0' encoding='UTF-8'?>
+<ListBucketResult xmlns="http://doc.s3.amazonaws.com/2006-03-01">
+<Contents><Key>114.0.5735.90/chromedriver_linux64.zip</Key></Contents>
+</ListBucketResult>"""
+
+
+class DelayedTransport(MemoryTransport):
+    """
+    Serve the documents after a fixed latency.
+    """
+
+    def __init__(self, latency: float, documents: dict = None):
+        """
+        :param latency: Seconds each request takes.
+        :param documents: Documents by URL.
+        """
+
+        super().__init__(documents)
+        self.__latency = latency
+
+    def request(self, method, url, headers=None, timeout=None, stream=False):
+        threading.Event().wait(self.__latency)
+        return super().request(method, url, headers, timeout, stream)
+
+
+def delayed_popen(latency: float):
+    """
+    Return a Popen replacement reporting a Chrome version after a fixed latency.
+
+    :param latency: Seconds the browser takes to report its version.
+    """
+
+    class DelayedPopen:
+        def __init__(self, args, **kwargs):
+            pass
+
+        def communicate(self, timeout=None):
+            threading.Event().wait(latency)
+            return b"Google Chrome 114.0.5735.45\n", b""
+
+        def kill(self):
+            pass
+
+    return DelayedPopen
+
+
+def new_transport(latency: float) -> DelayedTransport:
+    """
+    Return a transport serving the manifests a version lookup needs.
+
+    :param latency: Seconds each request takes.
+    """
+
+    return DelayedTransport(
+        latency,
+        {
+            constants.CHROMEDRIVER_STORAGE_URL: LEGACY_LISTING,
+            constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL: {"versions": []},
+        },
+    )
+
+
+def serial(latency: float) -> float:
+    """
+    Return the seconds the detection and the two fetches take one after the other.
+
+    :param latency: Seconds each step takes.
+    """
+
+    transport = new_transport(latency)
+    start = time.perf_counter()
+    delayed_popen(latency)(None).communicate()
+    transport.request("GET", constants.CHROMEDRIVER_STORAGE_URL)
+    transport.request("GET", constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL)
+
+    return time.perf_counter() - start
+
+
+def pipelined(latency: float) -> float:
+    """
+    Return the seconds matching_version takes.
+
+    :param latency: Seconds each step takes.
+    """
+
+    driver = GetChromeDriver(
+        OsPlatform.linux,
+        use_daemon=False,
+        use_catalog=False,
+        negative_ttl=0,
+        transport=new_transport(latency),
+    )
+    start = time.perf_counter()
+    with mock.patch.object(get_driver.subprocess, "Popen", delayed_popen(latency)):
+        driver.matching_version()
+
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, run in (("serial", serial), ("pipelined", pipelined)):
+        seconds = [run(args.latency) for _ in range(args.runs)]
+        print(f"{name:>10}: {statistics.median(seconds):.3f}s median of {args.runs}")
+
+
+if __name__ == "__main__":
+    main()
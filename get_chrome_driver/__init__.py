@@ -1,3 +1,10 @@
 __version__ = "1.5.3"
 
-from get_chrome_driver.get_driver import GetChromeDriver
+
+def __getattr__(name):
+    # Imported on first use, the pytest plugin is loaded by every pytest run
+    if name == "GetChromeDriver":
+        from get_chrome_driver.get_driver import GetChromeDriver
+
+        return GetChromeDriver
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,12 +1,92 @@
+import json
+import os
+import sys
+import time
+from typing import List
+
 import typer
 
-from get_chrome_driver import __version__
+from get_chrome_driver import (
+    __version__,
+    constants,
+    daemon,
+    prefetch,
+    store,
+    matrix,
+    tracing,
+    manifest_sync,
+    watch,
+    delta,
+)
 from get_chrome_driver.enums import Phase, OsPlatform
 from get_chrome_driver.exceptions import GetChromeDriverError
 from get_chrome_driver.get_driver import GetChromeDriver
+from get_chrome_driver.hedging import Hedger
+from get_chrome_driver.rate_limit import RateLimiter
+from get_chrome_driver.transport import (
+    Transport,
+    RequestsTransport,
+    PooledTransport,
+    Http2Transport,
+    FileTransport,
+)
 
 app = typer.Typer(name="Get ChromeDriver", add_completion=False)
-get_driver = GetChromeDriver()
+
+
+class _Resolution:
+    """
+    Resolution context shared by all actions of a run.
+    """
+
+    def __init__(
+        self,
+        hedger: Hedger = None,
+        rate_limiter: RateLimiter = None,
+        tracer: tracing.Tracer = None,
+        timeout: float = None,
+        transport: Transport = None,
+        use_deltas: bool = False,
+        offline: bool = None,
+    ):
+        """
+        :param hedger: Hedge slow requests.
+        :param rate_limiter: Limit the request rate per host.
+        :param tracer: Record the spans of the run.
+        :param timeout: Seconds each call may take.
+        :param transport: Send all requests with this transport.
+        :param use_deltas: Install versions by patching older drivers.
+        :param offline: Resolve and install only from the local caches.
+        """
+
+        self.manifest_cache = {}
+        self.hedger = hedger
+        self.rate_limiter = rate_limiter
+        self.tracer = tracer
+        self.timeout = timeout
+        self.transport = transport
+        self.use_deltas = use_deltas
+        self.offline = offline
+
+    def new_get_driver(self, os_platform: OsPlatform = None) -> GetChromeDriver:
+        """
+        Return a GetChromeDriver instance that shares the resolution context.
+
+        :param os_platform: OS.
+        """
+
+        return GetChromeDriver(
+            os_platform=os_platform,
+            manifest_ttl=constants.CLI_MANIFEST_TTL,
+            hedger=self.hedger,
+            manifest_cache=self.manifest_cache,
+            rate_limiter=self.rate_limiter,
+            tracer=self.tracer,
+            timeout=self.timeout,
+            transport=self.transport,
+            use_deltas=self.use_deltas,
+            offline=self.offline,
+        )
 
 
 @app.command()
@@ -59,185 +139,753 @@ def main(
     version: bool = typer.Option(
         default=False, help="Application version", show_default=False
     ),
+    serve_daemon: bool = typer.Option(
+        False,
+        "--daemon",
+        help="Run the resolver daemon that keeps manifests and results warm",
+        show_default=False,
+    ),
+    prefetch_drivers: bool = typer.Option(
+        False,
+        "--prefetch",
+        help="Download and extract the stable and beta versions if not downloaded yet",
+        show_default=False,
+    ),
+    prefetch_interval: float = typer.Option(
+        default=None,
+        help="Keep prefetching every given number of seconds",
+        show_default=False,
+    ),
+    gc: bool = typer.Option(
+        default=False,
+        help="Evict least recently used drivers from the local store",
+        show_default=False,
+    ),
+    store_max_mb: int = typer.Option(
+        default=None,
+        help="Disk budget of the local store in MB, used with --gc",
+        show_default=False,
+    ),
+    store_max_versions_per_milestone: int = typer.Option(
+        default=None,
+        help="Versions to keep per major version, used with --gc",
+        show_default=False,
+    ),
+    compress_store: bool = typer.Option(
+        default=False,
+        help="Compress the drivers of the local store that were not used recently, they are extracted again on use",
+        show_default=False,
+    ),
+    compress_min_idle: float = typer.Option(
+        default=None,
+        help="Seconds a driver must be unused before it is compressed, used with --compress-store, 7 days if not set",
+        show_default=False,
+    ),
+    hedge: bool = typer.Option(
+        default=False,
+        help="Send a second request when a request is slow to respond",
+        show_default=False,
+    ),
+    hedge_delay: float = typer.Option(
+        default=None,
+        help="Seconds to wait before hedging, adapts to observed latencies if not set",
+        show_default=False,
+    ),
+    export_matrix: str = typer.Option(
+        default=None,
+        help="Print the download url of every version and platform as jsonl or csv",
+        show_default=False,
+    ),
+    min_milestone: int = typer.Option(
+        default=None,
+        help="Lowest major version to export, used with --export-matrix",
+        show_default=False,
+    ),
+    max_milestone: int = typer.Option(
+        default=None,
+        help="Highest major version to export, used with --export-matrix",
+        show_default=False,
+    ),
+    platform: List[str] = typer.Option(
+        default=None,
+        help="Platform to export, e.g. linux64, repeatable, used with --export-matrix, --export-bundle or --build-deltas",
+        show_default=False,
+    ),
+    browsers: bool = typer.Option(
+        default=False,
+        help="Print every installed Chrome and Chromium variant with its version",
+        show_default=False,
+    ),
+    auto_download_all: bool = typer.Option(
+        default=False,
+        help="Download a ChromeDriver version for every installed browser variant",
+        show_default=False,
+    ),
+    rate_limit: float = typer.Option(
+        default=None,
+        help="Maximum requests per second per host, shared by all processes",
+        show_default=False,
+    ),
+    build_catalog: bool = typer.Option(
+        default=False,
+        help="Build the catalog file used for fast version and url lookups",
+        show_default=False,
+    ),
+    output_json: bool = typer.Option(
+        False,
+        "--json",
+        help="Print the results of all actions as one JSON object, with timings",
+        show_default=False,
+    ),
+    timeout_seconds: float = typer.Option(
+        None,
+        "--timeout",
+        help="Seconds each action may take, fails with the stage that ran out of time",
+        show_default=False,
+    ),
+    sync: bool = typer.Option(
+        default=False,
+        help="Index the versions published since the last sync and print them",
+        show_default=False,
+    ),
+    trace: str = typer.Option(
+        default=None,
+        help="Write a Chrome trace of the run to a JSON file, viewable in chrome://tracing or Perfetto",
+        show_default=False,
+    ),
+    export_bundle: str = typer.Option(
+        default=None,
+        help="Write an offline bundle with the manifests and the drivers of --bundle-version to a file",
+        show_default=False,
+    ),
+    bundle_version: List[str] = typer.Option(
+        default=None,
+        help="Version to include, repeatable, used with --export-bundle",
+        show_default=False,
+    ),
+    import_bundle: str = typer.Option(
+        default=None,
+        help="Load an offline bundle into the catalog and the local store, before other actions",
+        show_default=False,
+    ),
+    watch_browser: bool = typer.Option(
+        False,
+        "--watch",
+        help="Install the matching driver whenever the browser is updated, until interrupted",
+        show_default=False,
+    ),
+    transport_name: str = typer.Option(
+        None,
+        "--transport",
+        help="Send requests with requests, pooled (keep-alive connections) or http2 (needs httpx)",
+        show_default=False,
+    ),
+    mirror_dir: str = typer.Option(
+        default=None,
+        help="Serve all requests from a local mirror directory instead of the network",
+        show_default=False,
+    ),
+    deltas: bool = typer.Option(
+        default=False,
+        help="Patch an older driver in the local store with a delta from the mirror instead of downloading the archive, needs zstandard",
+        show_default=False,
+    ),
+    offline_mode: bool = typer.Option(
+        False,
+        "--offline",
+        help="Resolve and install only from the local caches, without any request, also set by GET_CHROME_DRIVER_OFFLINE=1",
+        show_default=False,
+    ),
+    build_deltas: bool = typer.Option(
+        default=False,
+        help="Write the deltas between consecutive versions of the archives in --mirror-dir, needs zstandard",
+        show_default=False,
+    ),
 ):
     """
     Main.
     """
 
+    try:
+        transport = (
+            __new_transport(transport_name, mirror_dir)
+            if transport_name or mirror_dir
+            else None
+        )
+    except GetChromeDriverError as err:
+        print(err)
+        return
+
+    resolution = _Resolution(
+        hedger=Hedger(delay=hedge_delay) if hedge or hedge_delay is not None else None,
+        rate_limiter=RateLimiter(rate=rate_limit, shared=True) if rate_limit else None,
+        tracer=tracing.Tracer() if trace else None,
+        timeout=timeout_seconds or None,
+        transport=transport,
+        use_deltas=deltas,
+        offline=True if offline_mode else None,
+    )
+    get_driver = resolution.new_get_driver()
+
+    # Actions run in this order and share the resolution context
+    # (name, function, text to print on success, text to print on error)
+    actions = []
+
+    if import_bundle:
+        actions.append(
+            (
+                "import_bundle",
+                lambda: get_driver.import_bundle(import_bundle),
+                lambda result: "\n".join(
+                    [f"Imported {version}" for version in result["versions"]]
+                    + [f"Catalog built with {result['catalog_versions']} versions"]
+                ),
+                "Could not import bundle",
+            )
+        )
+
     if beta_version:
-        __print_latest_version(phase=Phase.beta)
+        actions.append(
+            ("beta_version", get_driver.beta_version, None, "No latest version found")
+        )
+
+    if stable_version:
+        actions.append(
+            (
+                "stable_version",
+                get_driver.stable_version,
+                None,
+                "No latest version found",
+            )
+        )
+
+    if latest_urls:
+        actions.append(
+            (
+                "latest_urls",
+                lambda: __latest_urls(resolution),
+                __format_latest_urls,
+                "",
+            )
+        )
+
+    if version_url:
+        actions.append(
+            (
+                "version_url",
+                lambda: get_driver.version_url(version_url),
+                None,
+                "Could not find version url",
+            )
+        )
+
+    if beta_url:
+        actions.append(
+            (
+                "beta_url",
+                get_driver.beta_version_url,
+                None,
+                "Could not find version url",
+            )
+        )
+
+    if stable_url:
+        actions.append(
+            (
+                "stable_url",
+                get_driver.stable_version_url,
+                None,
+                "Could not find version url",
+            )
+        )
+
+    if auto_download:
+        actions.append(
+            (
+                "auto_download",
+                lambda: get_driver.auto_download(extract=extract, chromium=chromium),
+                "Download finished",
+                "An error occurred at downloading",
+            )
+        )
+
+    if download_beta:
+        actions.append(
+            (
+                "download_beta",
+                lambda: get_driver.download_beta_version(extract=extract),
+                "Download complete",
+                "Could not download beta version",
+            )
+        )
+
+    if download_stable:
+        actions.append(
+            (
+                "download_stable",
+                lambda: get_driver.download_stable_version(extract=extract),
+                "Download complete",
+                "Could not download stable version",
+            )
+        )
+
+    if download_version:
+        actions.append(
+            (
+                "download_version",
+                lambda: get_driver.download_version(
+                    version=download_version, extract=extract
+                ),
+                "Download finished",
+                "Could not download version",
+            )
+        )
+
+    if driver_filename:
+        actions.append(("driver_filename", get_driver.driver_filename, None, ""))
+
+    if version:
+        actions.append(("version", lambda: f"v{__version__}", None, ""))
+
+    if prefetch_drivers:
+        actions.append(
+            (
+                "prefetch",
+                lambda: prefetch.prefetch(
+                    transport=resolution.transport,
+                    hedger=resolution.hedger,
+                    rate_limiter=resolution.rate_limiter,
+                    timeout=resolution.timeout,
+                ),
+                lambda versions: __format_versions("Prefetched", versions),
+                "Could not prefetch",
+            )
+        )
+
+    if gc:
+        actions.append(
+            (
+                "gc",
+                lambda: __collect_garbage(
+                    max_mb=store_max_mb,
+                    max_versions_per_milestone=store_max_versions_per_milestone,
+                ),
+                lambda versions: __format_versions("Evicted", versions),
+                "",
+            )
+        )
+
+    if compress_store:
+        actions.append(
+            (
+                "compress_store",
+                lambda: __compress_store(min_idle=compress_min_idle),
+                __format_compressed,
+                "Could not compress the store",
+            )
+        )
+
+    if browsers:
+        actions.append(
+            (
+                "browsers",
+                lambda: [
+                    browser._asdict() for browser in get_driver.installed_browsers()
+                ],
+                lambda found: "\n".join(
+                    f"{browser['name']} {browser['version']} {browser['path']}"
+                    for browser in found
+                ),
+                "",
+            )
+        )
+
+    if auto_download_all:
+        actions.append(
+            (
+                "auto_download_all",
+                lambda: get_driver.download_for_browsers(extract=extract),
+                __format_browser_downloads,
+                "An error occurred at downloading",
+            )
+        )
+
+    if sync:
+        actions.append(
+            (
+                "sync",
+                lambda: manifest_sync.new_versions(get_driver.sync_manifests()),
+                lambda versions: __format_versions("New", versions),
+                "Could not sync",
+            )
+        )
+
+    if build_catalog:
+        actions.append(
+            (
+                "build_catalog",
+                get_driver.build_catalog,
+                lambda count: f"Catalog built with {count} versions",
+                "Could not build catalog",
+            )
+        )
+
+    if export_bundle:
+        actions.append(
+            (
+                "export_bundle",
+                lambda: get_driver.export_bundle(
+                    export_bundle,
+                    versions=bundle_version or [],
+                    platforms=platform or None,
+                ),
+                lambda index: f"Bundle written with {len(index['archives'])} drivers",
+                "Could not export bundle",
+            )
+        )
+
+    if build_deltas:
+        actions.append(
+            (
+                "build_deltas",
+                lambda: __build_deltas(mirror_dir, platforms=platform or None),
+                lambda written: f"Deltas written: {len(written)}",
+                "Could not build deltas",
+            )
+        )
+
+    # Modes run alone, the export streams to stdout, the others run until interrupted
+    modes = [
+        option
+        for option, value in [
+            ("--export-matrix", export_matrix),
+            ("--daemon", serve_daemon),
+            ("--prefetch-interval", prefetch_interval),
+            ("--watch", watch_browser),
+        ]
+        if value
+    ]
+    if modes and (actions or len(modes) > 1):
+        others = modes[1:] + [f"--{name.replace('_', '-')}" for name, *_ in actions]
+        raise typer.BadParameter(
+            f"cannot be combined with {', '.join(others)}", param_hint=f"'{modes[0]}'"
+        )
+
+    if offline_mode:
+        # Also for the instances of prefetch, the daemon and watch mode
+        os.environ[constants.OFFLINE_ENV] = "1"
 
-    elif stable_version:
-        __print_latest_version(phase=Phase.stable)
+    try:
+        if actions:
+            __run_actions(actions, output_json=output_json, tracer=resolution.tracer)
 
-    elif latest_urls:
-        __print_latest_urls()
+        elif export_matrix:
+            __export_matrix(
+                get_driver,
+                output_format=export_matrix,
+                min_milestone=min_milestone,
+                max_milestone=max_milestone,
+                platforms=platform or None,
+            )
 
-    elif version_url:
-        __print_version_url(version=version_url)
+        elif serve_daemon:
+            __serve_daemon()
 
-    elif beta_url:
-        __print_latest_url(phase=Phase.beta)
+        elif prefetch_interval:
+            __prefetch_loop(interval=prefetch_interval, resolution=resolution)
 
-    elif stable_url:
-        __print_latest_url(phase=Phase.stable)
+        elif watch_browser:
+            __watch(get_driver, chromium=chromium)
+    finally:
+        if resolution.tracer:
+            resolution.tracer.save(trace)
 
-    elif auto_download:
-        __auto_download(extract=extract, chromium=chromium)
 
-    elif download_beta:
-        __download_latest_version(phase=Phase.beta, extract=extract)
+def __build_deltas(mirror_dir: str, platforms: list) -> list:
+    """
+    Write the deltas of the archives in a mirror, return the written deltas.
 
-    elif download_stable:
-        __download_latest_version(phase=Phase.stable, extract=extract)
+    :param mirror_dir: Mirror directory.
+    :param platforms: Platforms to write deltas for, None for all.
+    """
 
-    elif download_version:
-        __download_version(version=download_version, extract=extract)
+    if not mirror_dir:
+        raise GetChromeDriverError("--build-deltas needs --mirror-dir.")
 
-    elif driver_filename:
-        print(get_driver.driver_filename())
+    return delta.build(mirror_dir, platforms=platforms)
 
-    elif version:
-        print(f"v{__version__}")
 
+def __new_transport(name: str, mirror_dir: str) -> Transport:
+    """
+    Return the transport of the run.
 
-def __print_latest_version(phase: Phase):
+    :param name: Transport name: requests, pooled or http2.
+    :param mirror_dir: Local mirror directory, overrides the name.
     """
-    Print latest stable version or latest beta version.
 
-    :param phase: Stable or beta.
+    if mirror_dir:
+        return FileTransport(mirror_dir)
+
+    transports = {
+        "requests": RequestsTransport,
+        "pooled": PooledTransport,
+        "http2": Http2Transport,
+    }
+    if name not in transports:
+        raise GetChromeDriverError(
+            f"Unknown transport {name}, use one of: {', '.join(transports)}."
+        )
+
+    return transports[name]()
+
+
+def __run_actions(actions: list, output_json: bool, tracer: tracing.Tracer = None):
     """
+    Run actions in order and print their results.
 
-    error = "No latest version found"
-    if phase == Phase.beta:
-        try:
-            print(get_driver.beta_version())
-        except GetChromeDriverError:
-            print(error)
-    elif phase == Phase.stable:
-        try:
-            print(get_driver.stable_version())
-        except GetChromeDriverError:
-            print(error)
-    else:
-        print(error)
+    :param actions: (name, function, text on success, text on error) tuples.
+    :param output_json: Print one JSON object instead of text.
+    :param tracer: Tracer recording a span per action.
+    """
 
+    results = {}
+    errors = {}
+    timings = {}
+    start = time.perf_counter()
 
-def __print_latest_urls():
+    for name, func, text, error_text in actions:
+        action_start = time.perf_counter()
+        try:
+            with tracing.span(tracer, name, "action"):
+                result = func()
+        except GetChromeDriverError as err:
+            errors[name] = str(err)
+            if not output_json:
+                print(error_text)
+        else:
+            results[name] = result
+            if not output_json:
+                if text is None:
+                    print(result)
+                elif callable(text):
+                    print(text(result))
+                else:
+                    print(text)
+        finally:
+            timings[name] = round(time.perf_counter() - action_start, 6)
+
+    if output_json:
+        timings["total"] = round(time.perf_counter() - start, 6)
+        print(
+            json.dumps(
+                {"results": results, "errors": errors, "timings": timings}, indent=2
+            )
+        )
+
+
+def __latest_urls(resolution: _Resolution) -> dict:
     """
-    Print the stable and beta url version for all platforms.
+    Return the stable and beta url version for all platforms.
+
+    :param resolution: Resolution context of the run.
     """
 
-    get_driver_win = GetChromeDriver(OsPlatform.win)
-    get_driver_linux = GetChromeDriver(OsPlatform.linux)
-    get_driver_mac = GetChromeDriver(OsPlatform.mac)
     get_drivers = {
-        "Windows": get_driver_win,
-        "Linux": get_driver_linux,
-        "macOS": get_driver_mac,
+        "Windows": resolution.new_get_driver(OsPlatform.win),
+        "Linux": resolution.new_get_driver(OsPlatform.linux),
+        "macOS": resolution.new_get_driver(OsPlatform.mac),
     }
 
-    result = ""
-    for index, (key, value) in enumerate(get_drivers.items()):
+    urls = {}
+    for key, value in get_drivers.items():
         try:
-            result += f"Latest beta and stable version for {key}:\n"
-            result += f"stable : {value.stable_version_url()}\n"
-            result += f"beta   : {value.beta_version_url()}"
-            if index < len(get_drivers) - 1:
-                result += "\n"
+            urls[key] = {
+                "stable": value.stable_version_url(),
+                "beta": value.beta_version_url(),
+            }
         except GetChromeDriverError:
             continue
 
-    print(result)
+    return urls
 
 
-def __print_version_url(version: str):
+def __format_latest_urls(urls: dict) -> str:
     """
-    Print the url of a version.
+    Format the stable and beta url version for all platforms.
 
-    :param version: Chromedriver version.
+    :param urls: Urls by platform name.
     """
 
-    error = "Could not find version url"
+    result = ""
+    for index, (key, value) in enumerate(urls.items()):
+        result += f"Latest beta and stable version for {key}:\n"
+        result += f"stable : {value['stable']}\n"
+        result += f"beta   : {value['beta']}"
+        if index < len(urls) - 1:
+            result += "\n"
 
-    try:
-        print(get_driver.version_url(version))
-    except GetChromeDriverError:
-        print(error)
+    return result
 
 
-def __print_latest_url(phase: Phase):
+def __format_browser_downloads(downloads: dict) -> str:
     """
-    Print latest stable url or latest beta url.
+    Format one line per browser, with the driver path or the error.
 
-    :param phase: Stable or beta.
+    :param downloads: Driver paths and errors by browser executable path.
     """
 
-    error = "Could not find version url"
+    lines = [f"{browser}: {path}" for browser, path in downloads["paths"].items()]
+    lines += [f"{browser}: {error}" for browser, error in downloads["errors"].items()]
 
-    if phase == Phase.beta:
-        try:
-            print(get_driver.beta_version_url())
-        except GetChromeDriverError:
-            print(error)
-    elif phase == Phase.stable:
-        try:
-            print(get_driver.stable_version_url())
-        except GetChromeDriverError:
-            print(error)
+    return "\n".join(lines)
 
 
-def __auto_download(extract: bool, chromium: bool):
+def __format_versions(prefix: str, versions: list) -> str:
     """
-    Auto download driver.
+    Format one line per version.
 
-    :param extract: Extract the downloaded driver or not.
-    :param chromium: Look for the installed Chromium version instead of Chrome.
+    :param prefix: Text before each version.
+    :param versions: Versions.
+    """
+
+    return "\n".join(f"{prefix} {version}" for version in versions)
+
+
+def __serve_daemon():
+    """
+    Run the resolver daemon until interrupted.
     """
 
     try:
-        get_driver.auto_download(extract=extract, chromium=chromium)
-        print("Download finished")
-    except GetChromeDriverError:
-        print("An error occurred at downloading")
+        daemon.ResolverDaemon().serve()
+    except (GetChromeDriverError, OSError) as err:
+        print(f"Could not start daemon: {err}")
 
 
-def __download_latest_version(phase: Phase, extract: bool):
+def __prefetch_loop(interval: float, resolution: _Resolution):
     """
-    Download the driver for the stable version or beta version.
+    Prefetch the stable and beta versions until interrupted.
 
-    :param phase: Stable or beta.
-    :param extract: Extract the downloaded driver or not.
+    :param interval: Seconds between runs.
+    :param resolution: Resolution context of the run.
     """
 
-    download_complete = "Download complete"
-    beta_error = "Could not download beta version"
-    stable_error = "Could not download stable version"
+    try:
+        prefetch.run(
+            interval=interval,
+            transport=resolution.transport,
+            hedger=resolution.hedger,
+            rate_limiter=resolution.rate_limiter,
+            timeout=resolution.timeout,
+            on_prefetch=lambda versions: versions
+            and print(__format_versions("Prefetched", versions)),
+            on_sync=lambda rows: rows
+            and print(__format_versions("New", manifest_sync.new_versions(rows))),
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+def __watch(get_driver: GetChromeDriver, chromium: bool):
+    """
+    Install the matching driver whenever the browser is updated, until interrupted.
 
-    if phase == Phase.beta:
-        try:
-            get_driver.download_beta_version(extract=extract)
-            print(download_complete)
-        except GetChromeDriverError:
-            print(beta_error)
-    elif phase == Phase.stable:
-        try:
-            get_driver.download_stable_version(extract=extract)
-            print(download_complete)
-        except GetChromeDriverError:
-            print(stable_error)
+    :param get_driver: GetChromeDriver of the run.
+    :param chromium: Watch Chromium instead of Chrome.
+    """
+
+    try:
+        watch.run(
+            get_driver,
+            chromium=chromium,
+            on_refresh=lambda state: print(
+                f"Installed {state['driver_path']} for {state['browser_version']}"
+            ),
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+def __collect_garbage(max_mb: int, max_versions_per_milestone: int) -> list:
+    """
+    Evict least recently used drivers from the local store, return the evicted versions.
+    Without a policy, the policy set through the environment is used.
+
+    :param max_mb: Disk budget in MB.
+    :param max_versions_per_milestone: Versions to keep per major version.
+    """
+
+    if max_mb is None and max_versions_per_milestone is None:
+        return store.collect_garbage_from_env()
 
+    return store.collect_garbage(
+        max_bytes=max_mb * 1024 * 1024 if max_mb is not None else None,
+        max_versions_per_milestone=max_versions_per_milestone,
+    )
 
-def __download_version(version: str, extract: bool):
+
+def __compress_store(min_idle: float) -> list:
     """
-    Download driver version.
+    Compress the drivers of the local store that were not used recently,
+    return the compressed versions with their sizes.
 
-    :param version: Chromedriver version.
-    :param extract: Extract the downloaded driver or not.
+    :param min_idle: Seconds a driver must be unused, defaults to 7 days.
     """
 
+    if min_idle is None:
+        min_idle = constants.STORE_COMPRESS_MIN_IDLE
+
+    try:
+        compressed = store.compress_idle(min_idle=min_idle)
+    except OSError as err:
+        raise GetChromeDriverError(err)
+
+    return [compressed_version._asdict() for compressed_version in compressed]
+
+
+def __format_compressed(compressed: list) -> str:
+    """
+    Format compressed versions with the space saved.
+
+    :param compressed: Compressed versions with their sizes.
+    """
+
+    size = sum(entry["size"] for entry in compressed) / 1024 / 1024
+    compressed_size = (
+        sum(entry["compressed_size"] for entry in compressed) / 1024 / 1024
+    )
+    return f"Compressed {len(compressed)} versions from {size:.1f} MB to {compressed_size:.1f} MB"
+
+
+def __export_matrix(
+    get_driver: GetChromeDriver,
+    output_format: str,
+    min_milestone: int,
+    max_milestone: int,
+    platforms: list,
+):
+    """
+    Print the download url of every version and platform.
+    Errors are printed to stderr and exit with code 1.
+
+    :param get_driver: GetChromeDriver of the run.
+    :param output_format: jsonl or csv.
+    :param min_milestone: Lowest major version to export.
+    :param max_milestone: Highest major version to export.
+    :param platforms: Platforms to export.
+    """
+
+    writers = {"jsonl": matrix.write_jsonl, "csv": matrix.write_csv}
+    if output_format not in writers:
+        print("Unknown format, use jsonl or csv", file=sys.stderr)
+        raise typer.Exit(code=1)
+
+    rows = get_driver.version_matrix(
+        min_milestone=min_milestone, max_milestone=max_milestone, platforms=platforms
+    )
     try:
-        get_driver.download_version(version=version, extract=extract)
-        print("Download finished")
+        writers[output_format](rows, sys.stdout)
     except GetChromeDriverError:
-        print("Could not download version")
+        # Kept out of the exported rows, which are usually redirected
+        print("Could not export version matrix", file=sys.stderr)
+        raise typer.Exit(code=1)
@@ -0,0 +1,129 @@
+import glob
+import os
+import re
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+from get_chrome_driver import constants
+from get_chrome_driver.enums import OsPlatform
+
+# Executable names looked up on PATH
+LINUX_NAMES = [
+    "google-chrome",
+    "google-chrome-stable",
+    "google-chrome-beta",
+    "google-chrome-unstable",
+    "chromium",
+    "chromium-browser",
+    "chrome",
+]
+
+# Known install locations, Chrome for Testing installs have a directory per version
+LINUX_PATHS = [
+    "/opt/google/chrome/chrome",
+    "/opt/google/chrome-beta/chrome",
+    "/opt/google/chrome-unstable/chrome",
+    "/usr/lib/chromium/chromium",
+    "/usr/lib/chromium-browser/chromium-browser",
+    "/snap/bin/chromium",
+    "/opt/chrome-linux64/chrome",
+    "~/.cache/puppeteer/chrome/linux-*/chrome-linux64/chrome",
+    "~/.cache/selenium/chrome/linux64/*/chrome",
+]
+MAC_PATHS = [
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    "/Applications/Google Chrome Beta.app/Contents/MacOS/Google Chrome Beta",
+    "/Applications/Google Chrome Dev.app/Contents/MacOS/Google Chrome Dev",
+    "/Applications/Google Chrome Canary.app/Contents/MacOS/Google Chrome Canary",
+    "/Applications/Google Chrome for Testing.app/Contents/MacOS/Google Chrome for Testing",
+    "/Applications/Chromium.app/Contents/MacOS/Chromium",
+]
+
+VERSION_PATTERN = re.compile(r"\d+(?:\.\d+){1,3}")
+
+
+class Browser(NamedTuple):
+    name: str
+    path: str
+    version: str
+
+
+def discover(os_platform: OsPlatform = OsPlatform.linux) -> list:
+    """
+    Return every installed Chrome and Chromium variant with its version.
+    Executables are found on PATH and at known locations and probed concurrently.
+
+    :param os_platform: OS, Linux and macOS are supported.
+    """
+
+    candidates = __candidates(os_platform)
+    if not candidates:
+        return []
+
+    with ThreadPoolExecutor(max_workers=len(candidates)) as executor:
+        probed = list(executor.map(probe, candidates))
+
+    return [browser for browser in probed if browser]
+
+
+def probe(path: str) -> Browser:
+    """
+    Return the browser at path with its version, or None if it does not report one.
+
+    :param path: Browser executable.
+    """
+
+    try:
+        process = subprocess.run(
+            [path, "--version"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            stdin=subprocess.DEVNULL,
+            timeout=constants.BROWSER_PROBE_TIMEOUT,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+    output = process.stdout.decode("UTF-8", errors="replace").strip()
+    match = VERSION_PATTERN.search(output)
+    if process.returncode != 0 or not match:
+        return None
+
+    # e.g. "Google Chrome 120.0.6099.109" or "Chromium 120.0.6099.109 built on Debian"
+    name = output[: match.start()].strip() or os.path.basename(path)
+
+    return Browser(name=name, path=path, version=match.group(0))
+
+
+def __candidates(os_platform: OsPlatform) -> list:
+    """
+    Return the browser executables to probe, one per install.
+
+    :param os_platform: OS.
+    """
+
+    if os_platform == OsPlatform.linux:
+        paths = [shutil.which(name) for name in LINUX_NAMES]
+        for pattern in LINUX_PATHS:
+            paths += sorted(glob.glob(os.path.expanduser(pattern)), reverse=True)
+    elif os_platform == OsPlatform.mac:
+        paths = MAC_PATHS
+    else:
+        return []
+
+    candidates = []
+    seen = set()
+    for path in paths:
+        if not path or not os.path.isfile(path) or not os.access(path, os.X_OK):
+            continue
+
+        # Wrapper scripts and links point into the same install
+        real_path = os.path.realpath(path)
+        if real_path in seen:
+            continue
+        seen.add(real_path)
+        candidates.append(path)
+
+    return candidates
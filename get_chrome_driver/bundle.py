@@ -0,0 +1,208 @@
+import hashlib
+import io
+import json
+import os
+import tarfile
+import time
+
+from get_chrome_driver.exceptions import BundleError
+
+# Tar members, the index comes first:
+#   index.json           format version, creation time and one entry per member
+#                        with its name, size and SHA-256, manifests by URL and
+#                        archives with their version and download URL
+#   manifests/<name>     manifest documents, e.g. the legacy listing objects
+#   archives/<version>/  driver archives as downloaded
+INDEX_NAME = "index.json"
+FORMAT_VERSION = 1
+CHUNK_SIZE = 1024 * 1024
+
+
+def write(path: str, manifests: dict, archives: list) -> dict:
+    """
+    Write a bundle. Return its index.
+    The file is replaced atomically, a failed export leaves no partial bundle.
+
+    :param path: Bundle path.
+    :param manifests: (name, content bytes) tuples by manifest URL.
+    :param archives: Dicts with the keys version, url and file, the path of the downloaded archive.
+    """
+
+    index = {
+        "format": FORMAT_VERSION,
+        "created": time.time(),
+        "manifests": {},
+        "archives": [],
+    }
+
+    for url, (name, content) in manifests.items():
+        index["manifests"][url] = {
+            "name": f"manifests/{name}",
+            "size": len(content),
+            "sha256": hashlib.sha256(content).hexdigest(),
+        }
+
+    for archive in archives:
+        index["archives"].append(
+            {
+                "version": archive["version"],
+                "url": archive["url"],
+                "name": f"archives/{archive['version']}/{os.path.basename(archive['file'])}",
+                "size": os.path.getsize(archive["file"]),
+                "sha256": _file_sha256(archive["file"]),
+            }
+        )
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with tarfile.open(tmp_path, "w") as tar:
+            _add_bytes(tar, INDEX_NAME, json.dumps(index, indent=2).encode("UTF-8"))
+            for url, (_, content) in manifests.items():
+                _add_bytes(tar, index["manifests"][url]["name"], content)
+            for archive, entry in zip(archives, index["archives"]):
+                tar.add(archive["file"], arcname=entry["name"], recursive=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return index
+
+
+class Bundle:
+    """
+    A bundle opened for reading. Members are checked against the SHA-256 in the index.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Bundle path.
+        """
+
+        try:
+            self.__tar = tarfile.open(path, "r")
+        except (OSError, tarfile.TarError) as err:
+            raise BundleError(f"Could not open bundle {path}: {err}")
+
+        try:
+            self.index = json.loads(self.__read(INDEX_NAME))
+        except ValueError:
+            self.__tar.close()
+            raise BundleError(f"{path} has no valid index.")
+        except BundleError:
+            self.__tar.close()
+            raise
+
+        if self.index.get("format") != FORMAT_VERSION:
+            self.__tar.close()
+            raise BundleError(
+                f"{path} has format {self.index.get('format')}, expected {FORMAT_VERSION}."
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def manifest(self, url: str) -> bytes:
+        """
+        Return the content of a manifest, or None if the bundle has none for the URL.
+
+        :param url: Manifest URL.
+        """
+
+        entry = self.index["manifests"].get(url)
+        if not entry:
+            return None
+
+        content = self.__read(entry["name"])
+        if hashlib.sha256(content).hexdigest() != entry["sha256"]:
+            raise BundleError(f"{entry['name']} does not match its checksum.")
+
+        return content
+
+    def extract_archive(self, entry: dict, output_path: str) -> str:
+        """
+        Extract an archive to a directory. Return the path of the archive file.
+
+        :param entry: Archive entry of the index.
+        :param output_path: Directory to extract to.
+        """
+
+        source = self.__member(entry["name"])
+        os.makedirs(output_path, exist_ok=True)
+        file_path = os.path.join(output_path, os.path.basename(entry["name"]))
+
+        digest = hashlib.sha256()
+        with source, open(file_path, "wb") as file:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                file.write(chunk)
+
+        if digest.hexdigest() != entry["sha256"]:
+            os.remove(file_path)
+            raise BundleError(f"{entry['name']} does not match its checksum.")
+
+        return file_path
+
+    def close(self):
+        self.__tar.close()
+
+    def __read(self, name: str) -> bytes:
+        """
+        Return the content of a member.
+
+        :param name: Member name.
+        """
+
+        with self.__member(name) as file:
+            return file.read()
+
+    def __member(self, name: str):
+        """
+        Return a member as a file object.
+
+        :param name: Member name.
+        """
+
+        try:
+            file = self.__tar.extractfile(name)
+        except (KeyError, tarfile.TarError):
+            file = None
+        if file is None:
+            raise BundleError(f"The bundle has no {name}.")
+
+        return file
+
+
+def _add_bytes(tar: tarfile.TarFile, name: str, content: bytes):
+    """
+    Add a member from bytes.
+
+    :param tar: Tar file.
+    :param name: Member name.
+    :param content: Member content.
+    """
+
+    info = tarfile.TarInfo(name)
+    info.size = len(content)
+    info.mtime = int(time.time())
+    tar.addfile(info, io.BytesIO(content))
+
+
+def _file_sha256(path: str) -> str:
+    """
+    Return the SHA-256 of a file.
+
+    :param path: File path.
+    """
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
@@ -0,0 +1,363 @@
+import mmap
+import os
+import struct
+import threading
+import time
+
+from get_chrome_driver import constants
+
+# File layout, all integers little-endian:
+#   header     magic, format version, platform count, entry count, pool offset,
+#              build time in seconds since the epoch
+#   platforms  platform count string pool offsets of the platform names
+#   entries    entry count entries sorted by packed version, each entry being the
+#              packed version, a platform bitmask, the pool offset of the version
+#              string and one pool offset per platform of the download URL
+#   pool       strings, each a 2 byte length followed by UTF-8 bytes
+MAGIC = b"GCDCATLG"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<8sHHIId")
+PLATFORM = struct.Struct("<I")
+ABSENT = 0xFFFFFFFF
+MAX_PLATFORMS = 32
+
+_open_catalogs = {}
+_open_catalogs_lock = threading.Lock()
+
+
+def pack_version(version: str) -> int:
+    """
+    Pack a version of up to 4 numbers below 65536 into one integer, which sorts like the version.
+    Return None if the version can not be packed.
+
+    :param version: Version, e.g. 120.0.6099.109.
+    """
+
+    numbers = version.split(".")
+    if len(numbers) > 4 or not all(number.isnumeric() for number in numbers):
+        return None
+
+    packed = 0
+    for index in range(4):
+        number = int(numbers[index]) if index < len(numbers) else 0
+        if number > 0xFFFF:
+            return None
+        packed = (packed << 16) | number
+
+    return packed
+
+
+def build(rows, path: str = None, built_at: float = None) -> int:
+    """
+    Build a catalog file from version matrix rows. Return the number of versions.
+    The file is replaced atomically, processes that have the old file open keep reading it.
+
+    :param rows: Rows from GetChromeDriver.version_matrix().
+    :param path: Catalog path, defaults to the catalog in the cache directory.
+    :param built_at: Time the manifests of the rows were fetched, defaults to now.
+    """
+
+    path = path or default_path()
+
+    platforms = []
+    versions = {}
+    for row in rows:
+        packed = pack_version(row["version"])
+        if packed is None:
+            continue
+        if row["platform"] not in platforms:
+            if len(platforms) == MAX_PLATFORMS:
+                continue
+            platforms.append(row["platform"])
+        urls = versions.setdefault((packed, row["version"]), {})
+
+        # The new api is preferred over the old storage
+        if row["api"] == "new" or row["platform"] not in urls:
+            urls[row["platform"]] = row["url"]
+
+    pool = bytearray()
+    pool_offsets = {}
+
+    def add_string(text: str) -> int:
+        if text not in pool_offsets:
+            data = text.encode("UTF-8")
+            pool_offsets[text] = len(pool)
+            pool.extend(struct.pack("<H", len(data)))
+            pool.extend(data)
+        return pool_offsets[text]
+
+    entry = _entry_struct(len(platforms))
+    platform_table = b"".join(
+        PLATFORM.pack(add_string(platform)) for platform in platforms
+    )
+
+    entries = bytearray()
+    for packed, version in sorted(versions):
+        urls = versions[(packed, version)]
+        mask = 0
+        url_offsets = []
+        for index, platform in enumerate(platforms):
+            if platform in urls:
+                mask |= 1 << index
+                url_offsets.append(add_string(urls[platform]))
+            else:
+                url_offsets.append(ABSENT)
+        entries.extend(entry.pack(packed, mask, add_string(version), *url_offsets))
+
+    pool_offset = HEADER.size + len(platform_table) + len(entries)
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        len(platforms),
+        len(versions),
+        pool_offset,
+        time.time() if built_at is None else built_at,
+    )
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(header)
+        file.write(platform_table)
+        file.write(entries)
+        file.write(pool)
+    os.replace(tmp_path, path)
+
+    return len(versions)
+
+
+def default_path() -> str:
+    """
+    Return the path of the catalog in the cache directory.
+    """
+
+    return os.path.join(constants.CACHE_DIR, constants.CATALOG_FILENAME)
+
+
+def load(path: str = None):
+    """
+    Return the opened catalog, or None if there is no valid catalog.
+    Catalogs are opened once per process and reopened when the file is rebuilt.
+
+    :param path: Catalog path, defaults to the catalog in the cache directory.
+    """
+
+    path = path or default_path()
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    with _open_catalogs_lock:
+        opened = _open_catalogs.get(path)
+        if opened and opened[0] == identity:
+            return opened[1]
+
+        try:
+            catalog = Catalog(path)
+        except (OSError, ValueError):
+            return None
+        _open_catalogs[path] = (identity, catalog)
+
+    return catalog
+
+
+class Catalog:
+    """
+    Read-only, memory-mapped catalog of driver download URLs.
+    Lookups read straight from the mapped file, which is shared between processes.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Catalog path.
+        """
+
+        with open(path, "rb") as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.__map) < HEADER.size:
+            raise ValueError("Invalid catalog.")
+        magic, format_version, platform_count, entry_count, pool_offset, built_at = (
+            HEADER.unpack_from(self.__map, 0)
+        )
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            raise ValueError("Invalid catalog.")
+
+        self.__entry = _entry_struct(platform_count)
+        self.__count = entry_count
+        self.__built_at = built_at
+        self.__pool_offset = pool_offset
+        self.__entries_offset = HEADER.size + platform_count * PLATFORM.size
+        self.__platforms = [
+            self.__string(
+                PLATFORM.unpack_from(self.__map, HEADER.size + index * PLATFORM.size)[0]
+            )
+            for index in range(platform_count)
+        ]
+
+    def __len__(self) -> int:
+        return self.__count
+
+    @property
+    def platforms(self) -> list:
+        return list(self.__platforms)
+
+    @property
+    def built_at(self) -> float:
+        return self.__built_at
+
+    def age(self) -> float:
+        """
+        Return the seconds since the manifests of the catalog were fetched.
+        """
+
+        return time.time() - self.__built_at
+
+    def url(self, version: str, platform: str) -> str:
+        """
+        Return the download URL of a version for a platform, or None.
+
+        :param version: Chromedriver version.
+        :param platform: Platform, e.g. linux64.
+        """
+
+        if platform not in self.__platforms:
+            return None
+
+        index = self.__find(version)
+        if index is None:
+            return None
+
+        offset = self.__unpack(index)[3 + self.__platforms.index(platform)]
+        if offset == ABSENT:
+            return None
+
+        return self.__string(offset)
+
+    def version_platforms(self, version: str) -> list:
+        """
+        Return the platforms a version can be downloaded for.
+
+        :param version: Chromedriver version.
+        """
+
+        index = self.__find(version)
+        if index is None:
+            return []
+
+        mask = self.__unpack(index)[1]
+
+        return [
+            platform
+            for bit, platform in enumerate(self.__platforms)
+            if mask & (1 << bit)
+        ]
+
+    def versions(self) -> list:
+        """
+        Return all versions, lowest first.
+        """
+
+        return [self.__string(self.__unpack(index)[2]) for index in range(self.__count)]
+
+    def latest_matching(self, version: str, components: int = 3) -> str:
+        """
+        Return the highest version that shares the first components of a version, or None.
+
+        :param version: Version, e.g. the installed Chrome version.
+        :param components: Number of leading numbers that must match.
+        """
+
+        numbers = version.split(".")[:components]
+        low = pack_version(".".join(numbers))
+        if low is None:
+            return None
+        high = low | ((1 << (16 * (4 - len(numbers)))) - 1)
+
+        # Last entry with a packed version of at most high
+        index = self.__bisect(high + 1) - 1
+        if index < 0 or self.__unpack(index)[0] < low:
+            return None
+
+        return self.__string(self.__unpack(index)[2])
+
+    def close(self):
+        """
+        Unmap the catalog file.
+        """
+
+        self.__map.close()
+
+    def __find(self, version: str) -> int:
+        """
+        Return the entry index of a version, or None.
+
+        :param version: Chromedriver version.
+        """
+
+        packed = pack_version(version)
+        if packed is None:
+            return None
+
+        index = self.__bisect(packed)
+        while index < self.__count:
+            entry = self.__unpack(index)
+            if entry[0] != packed:
+                return None
+            if self.__string(entry[2]) == version:
+                return index
+            index += 1
+
+        return None
+
+    def __bisect(self, packed: int) -> int:
+        """
+        Return the index of the first entry with a packed version of at least packed.
+
+        :param packed: Packed version.
+        """
+
+        low, high = 0, self.__count
+        while low < high:
+            middle = (low + high) // 2
+            if self.__unpack(middle)[0] < packed:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def __unpack(self, index: int) -> tuple:
+        """
+        Return an entry.
+
+        :param index: Entry index.
+        """
+
+        return self.__entry.unpack_from(
+            self.__map, self.__entries_offset + index * self.__entry.size
+        )
+
+    def __string(self, offset: int) -> str:
+        """
+        Return a string from the pool.
+
+        :param offset: Offset in the pool.
+        """
+
+        start = self.__pool_offset + offset
+        (length,) = struct.unpack_from("<H", self.__map, start)
+
+        return self.__map[start + 2 : start + 2 + length].decode("UTF-8")
+
+
+def _entry_struct(platform_count: int) -> struct.Struct:
+    """
+    Return the entry layout for a number of platforms.
+
+    :param platform_count: Number of platforms.
+    """
+
+    return struct.Struct("<QII" + "I" * platform_count)
@@ -1,3 +1,5 @@
+import os
+
 CHROMEDRIVER_STORAGE_URL = "https://chromedriver.storage.googleapis.com"
 LAST_KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL = "https://googlechromelabs.github.io/chrome-for-testing/last-known-good-versions-with-downloads.json"
 LAST_KNOWN_GOOD_VERSIONS_URL = "https://googlechromelabs.github.io/chrome-for-testing/last-known-good-versions.json"
@@ -8,3 +10,121 @@ KNOWN_GOOD_VERSIONS_URL = (
 CSS_SELECTOR_VERSIONS = "ul.n8H08c:nth-child(5)"
 LATEST_STABLE_VERSION_STR = "Latest stable release"
 LATEST_BETA_VERSION_STR = "Latest beta release"
+
+# Local cache directory, shared by all processes of the same user
+CACHE_DIR = os.getenv("GET_CHROME_DRIVER_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "get-chrome-driver"
+)
+
+# Binary catalog of download URLs
+CATALOG_FILENAME = "catalog.bin"
+CATALOG_MAX_AGE = 86400
+
+# Negative cache of lookups without a result
+NEGATIVE_CACHE_FILENAME = "negative_cache.json"
+NEGATIVE_CACHE_TTL = 600
+
+# Incremental manifest sync
+SYNC_DIRNAME = "sync"
+SYNC_LOCK_FILENAME = "sync.lock"
+SYNC_STATE_FILENAME = "state.json"
+SYNC_INDEX_FILENAME = "index.jsonl"
+SYNC_DELTA_FILENAME = "delta.json"
+
+# Resolver daemon
+DAEMON_ENV = "GET_CHROME_DRIVER_DAEMON"
+DAEMON_SOCKET_ENV = "GET_CHROME_DRIVER_DAEMON_SOCKET"
+DAEMON_PORT_ENV = "GET_CHROME_DRIVER_DAEMON_PORT"
+DAEMON_SOCKET_FILENAME = "daemon.sock"
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = 47815
+DAEMON_CONNECT_TIMEOUT = 0.1
+DAEMON_CALL_TIMEOUT = 120
+DAEMON_ENSURE_TIMEOUT = 720
+DAEMON_MANIFEST_TTL = 300
+DAEMON_BROWSER_TTL = 60
+
+# Prefetch
+PREFETCH_JITTER = 0.2
+PREFETCH_MANIFEST_TTL = 30
+
+# Local driver store
+STORE_DIR = "chromedriver"
+STORE_LAST_USED_FILENAME = ".last_used"
+STORE_LOCKS_DIRNAME = ".locks"
+STORE_MAX_BYTES_ENV = "GET_CHROME_DRIVER_STORE_MAX_BYTES"
+STORE_MAX_VERSIONS_PER_MILESTONE_ENV = (
+    "GET_CHROME_DRIVER_STORE_MAX_VERSIONS_PER_MILESTONE"
+)
+STORE_MIN_IDLE = 3600
+# Versions unused for this long are kept compressed, zstd if installed, else xz
+STORE_COMPRESS_MIN_IDLE = 7 * 86400
+STORE_COMPRESS_MIN_IDLE_ENV = "GET_CHROME_DRIVER_STORE_COMPRESS_MIN_IDLE"
+STORE_COMPRESSED_FILENAMES = {"zstd": "bin.tar.zst", "xz": "bin.tar.xz"}
+STORE_COMPRESSION_LEVEL = 10
+
+# Watch mode
+WATCH_DIRNAME = "watch"
+WATCH_POLL_INTERVAL = 60
+WATCH_SETTLE = 2
+
+# Downloads
+DOWNLOAD_CHUNK_SIZE = 1048576
+# Bytes that must stay free after a download, e.g. to extract it
+DOWNLOAD_FREE_SPACE_MARGIN = 16 * 1048576
+
+# Binary deltas between driver versions, next to the archives of a mirror
+DELTA_SUFFIX = ".deltas"
+DELTA_INDEX_FILENAME = "index.json"
+DELTA_FORMAT = "zstd"
+DELTA_LEVEL = 19
+DELTA_MAX_SOURCES = 3
+# Deltas larger than this share of the archive are not kept
+DELTA_MAX_RATIO = 0.5
+
+# Transports
+OFFLINE_ENV = "GET_CHROME_DRIVER_OFFLINE"
+TRANSPORT_POOL_SIZE = 10
+TRANSPORT_INDEX_FILENAME = "index"
+
+# Request hedging
+HEDGE_PERCENTILE = 95
+HEDGE_MAX_RATE = 0.1
+HEDGE_LATENCY_WINDOW = 100
+HEDGE_MIN_SAMPLES = 10
+HEDGE_INITIAL_DELAY = 1.0
+HEDGE_MIN_DELAY = 0.05
+
+# Command-line application
+CLI_MANIFEST_TTL = 300
+
+# Browser discovery
+BROWSER_PROBE_TIMEOUT = 10
+
+# Rate limiting and retries
+RATE_LIMIT_RATE = 5
+RATE_LIMIT_BURST = 10
+RATE_LIMIT_DIRNAME = "rate_limit"
+RETRIES = 5
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_BACKOFF_MAX = 30
+RETRY_AFTER_MAX = 120
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+# Pre-started chromedriver processes
+POOL_HOST = "127.0.0.1"
+POOL_SIZE = 2
+POOL_MAX_USES = 50
+POOL_STARTUP_TIMEOUT = 10
+POOL_POLL_INTERVAL = 0.05
+POOL_HEALTH_TIMEOUT = 1
+POOL_STOP_TIMEOUT = 5
+POOL_MAX_FAILED_STARTS = 3
+
+# Seconds each stage of a call may take
+STAGE_TIMEOUTS = {
+    "metadata": 60,
+    "probe": 30,
+    "download": 600,
+    "detect": 30,
+}
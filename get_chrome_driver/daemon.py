@@ -0,0 +1,349 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+
+from get_chrome_driver import constants, deadline, exceptions
+from get_chrome_driver.enums import OsPlatform
+from get_chrome_driver.exceptions import (
+    GetChromeDriverError,
+    DaemonUnavailableError,
+    DeadlineExceededError,
+)
+
+
+def address():
+    """
+    Return the daemon address.
+    A socket path on platforms with Unix sockets, otherwise a localhost (host, port) tuple.
+    """
+
+    if hasattr(socket, "AF_UNIX"):
+        return os.getenv(constants.DAEMON_SOCKET_ENV) or os.path.join(
+            constants.CACHE_DIR, constants.DAEMON_SOCKET_FILENAME
+        )
+
+    return (
+        constants.DAEMON_HOST,
+        int(os.getenv(constants.DAEMON_PORT_ENV) or constants.DAEMON_PORT),
+    )
+
+
+def is_enabled() -> bool:
+    """
+    Return False if the daemon has been disabled through the environment.
+    """
+
+    value = os.getenv(constants.DAEMON_ENV, "1").strip().lower()
+
+    return value not in ("0", "false", "no", "off")
+
+
+def call(action: str, **params):
+    """
+    Send a request to the daemon and return its result. Inside a deadline, the
+    reply is waited for until the call runs out of time, and the daemon gets the
+    seconds left as its own deadline.
+
+    :param action: Action name, e.g. version_url.
+    :param params: Action parameters.
+    """
+
+    current = deadline.current()
+    remaining = current.remaining() if current else None
+
+    if not is_enabled():
+        raise DaemonUnavailableError("Daemon is disabled.")
+
+    addr = address()
+    if isinstance(addr, str) and not os.path.exists(addr):
+        raise DaemonUnavailableError("Daemon is not running.")
+
+    try:
+        sock = _connect(addr)
+    except OSError as err:
+        raise DaemonUnavailableError(err)
+
+    # A hung daemon must not block the client, ensure may download a driver
+    if action == "ensure":
+        timeout = constants.DAEMON_ENSURE_TIMEOUT
+    else:
+        timeout = constants.DAEMON_CALL_TIMEOUT
+    bounded = remaining is not None and remaining < timeout
+    if bounded:
+        timeout = remaining
+
+    try:
+        sock.settimeout(timeout)
+        request = {"action": action, "params": params, "timeout": remaining}
+        sock.sendall(json.dumps(request).encode("UTF-8") + b"\n")
+        with sock.makefile("rb") as file:
+            line = file.readline()
+    except socket.timeout:
+        if bounded:
+            raise DeadlineExceededError(timeout=current.timeout)
+        raise DaemonUnavailableError(f"Daemon did not reply within {timeout}s.")
+    except OSError as err:
+        raise DaemonUnavailableError(err)
+    finally:
+        sock.close()
+
+    if not line:
+        raise DaemonUnavailableError("Daemon closed the connection.")
+
+    try:
+        reply = json.loads(line)
+    except ValueError:
+        raise DaemonUnavailableError("Daemon sent an invalid reply.")
+    if not isinstance(reply, dict):
+        raise DaemonUnavailableError("Daemon sent an invalid reply.")
+
+    if reply.get("ok"):
+        return reply.get("result")
+
+    # Raise the same exception type the daemon raised
+    message = reply.get("message")
+    error = getattr(exceptions, str(reply.get("error")), None)
+    if not isinstance(error, type) or not issubclass(error, GetChromeDriverError):
+        raise GetChromeDriverError(message)
+    if issubclass(error, DeadlineExceededError):
+        raise error(reply.get("stage"), reply.get("timeout"))
+    try:
+        err = error(message)
+    except TypeError:
+        # Constructors taking more than the message
+        err = GetChromeDriverError(message)
+    raise err
+
+
+def _connect(addr) -> socket.socket:
+    """
+    Connect to the daemon address.
+
+    :param addr: Socket path or (host, port) tuple.
+    """
+
+    family = socket.AF_UNIX if isinstance(addr, str) else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(constants.DAEMON_CONNECT_TIMEOUT)
+        sock.connect(addr)
+    except OSError:
+        sock.close()
+        raise
+
+    return sock
+
+
+class ResolverDaemon:
+    """
+    Long-running resolver that keeps manifests, browser detection and results warm.
+    Requests are newline delimited JSON objects: {"action": ..., "params": {...}},
+    with the seconds the client has left under "timeout".
+    """
+
+    def __init__(
+        self,
+        manifest_ttl: float = constants.DAEMON_MANIFEST_TTL,
+        browser_ttl: float = constants.DAEMON_BROWSER_TTL,
+    ):
+        self.__manifest_ttl = manifest_ttl
+        self.__browser_ttl = browser_ttl
+        self.__drivers = {}
+        self.__results = {}
+        self.__lock = threading.Lock()
+        self.__download_locks = {}
+        self.__server = None
+
+    def handle(self, action: str, params: dict):
+        """
+        Run an action and return its result.
+
+        :param action: Action name.
+        :param params: Action parameters.
+        """
+
+        os_platform = OsPlatform(params["os_platform"])
+        get_driver = self.__get_driver(os_platform)
+
+        if action == "stable_version":
+            return self.__memoize(
+                (action, os_platform), self.__manifest_ttl, get_driver.stable_version
+            )
+
+        if action == "beta_version":
+            return self.__memoize(
+                (action, os_platform), self.__manifest_ttl, get_driver.beta_version
+            )
+
+        if action == "version_url":
+            version = params["version"]
+            return self.__memoize(
+                (action, os_platform, version),
+                self.__manifest_ttl,
+                lambda: get_driver.version_url(version),
+            )
+
+        if action == "matching_version":
+            chromium = bool(params.get("chromium"))
+            return self.__memoize(
+                (action, os_platform, chromium),
+                self.__browser_ttl,
+                lambda: get_driver.matching_version(chromium=chromium),
+            )
+
+        if action == "ensure":
+            return self.__ensure(
+                get_driver,
+                version=params["version"],
+                output_path=params["output_path"],
+                extract=bool(params.get("extract")),
+            )
+
+        raise GetChromeDriverError(f"Unknown action {action}.")
+
+    def serve(self, addr=None):
+        """
+        Serve requests until interrupted.
+
+        :param addr: Socket path or (host, port) tuple, defaults to address().
+        """
+
+        addr = addr or address()
+        handler = _DaemonRequestHandler
+
+        if isinstance(addr, str):
+            os.makedirs(os.path.dirname(addr) or ".", exist_ok=True)
+            if os.path.exists(addr):
+                try:
+                    _connect(addr).close()
+                except OSError:
+                    # Stale socket left behind by a daemon that did not shut down
+                    os.remove(addr)
+                else:
+                    raise GetChromeDriverError(
+                        f"A daemon is already running at {addr}."
+                    )
+            server = socketserver.ThreadingUnixStreamServer(addr, handler)
+            os.chmod(addr, 0o600)
+        else:
+            socketserver.ThreadingTCPServer.allow_reuse_address = True
+            server = socketserver.ThreadingTCPServer(addr, handler)
+
+        server.daemon_threads = True
+        server.resolver = self
+        self.__server = server
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if isinstance(addr, str) and os.path.exists(addr):
+                os.remove(addr)
+
+    def shutdown(self):
+        """
+        Stop serving, called from another thread.
+        """
+
+        if self.__server:
+            self.__server.shutdown()
+
+    def __get_driver(self, os_platform: OsPlatform):
+        """
+        Return the warm GetChromeDriver instance for a platform.
+
+        :param os_platform: OS.
+        """
+
+        # Imported here, get_driver imports this module
+        from get_chrome_driver.get_driver import GetChromeDriver
+
+        with self.__lock:
+            if os_platform not in self.__drivers:
+                self.__drivers[os_platform] = GetChromeDriver(
+                    os_platform=os_platform,
+                    use_daemon=False,
+                    manifest_ttl=self.__manifest_ttl,
+                )
+
+            return self.__drivers[os_platform]
+
+    def __memoize(self, key: tuple, ttl: float, func):
+        """
+        Return a remembered result, or compute and remember it for ttl seconds.
+
+        :param key: Result key.
+        :param ttl: Seconds to remember the result.
+        :param func: Function computing the result.
+        """
+
+        with self.__lock:
+            cached = self.__results.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        result = func()
+        with self.__lock:
+            self.__results[key] = (time.monotonic() + ttl, result)
+
+        return result
+
+    def __ensure(self, get_driver, version: str, output_path: str, extract: bool):
+        """
+        Download a version unless it is already present at output path.
+
+        :param get_driver: GetChromeDriver instance.
+        :param version: Chromedriver version.
+        :param output_path: Absolute path to download the driver to.
+        :param extract: Extract the downloaded driver or not.
+        """
+
+        driver_file_path = os.path.join(output_path, get_driver.driver_filename())
+
+        # Downloads of the same version wait for each other, others run in parallel
+        with self.__lock:
+            download_lock = self.__download_locks.setdefault(version, threading.Lock())
+
+        with download_lock:
+            if extract and os.path.isfile(driver_file_path):
+                return output_path
+
+            return get_driver.download_version(
+                version=version, output_path=output_path, extract=extract
+            )
+
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Handle newline delimited JSON requests on one connection.
+    """
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                # The work for a client is bounded by the time the client has left
+                with deadline.scope(request.get("timeout")):
+                    result = self.server.resolver.handle(
+                        request["action"], request.get("params") or {}
+                    )
+                reply = {"ok": True, "result": result}
+            except DeadlineExceededError as err:
+                reply = {
+                    "ok": False,
+                    "error": type(err).__name__,
+                    "message": str(err),
+                    "stage": err.stage,
+                    "timeout": err.timeout,
+                }
+            except GetChromeDriverError as err:
+                reply = {"ok": False, "error": type(err).__name__, "message": str(err)}
+            except Exception as err:
+                reply = {"ok": False, "error": None, "message": str(err)}
+
+            self.wfile.write(json.dumps(reply).encode("UTF-8") + b"\n")
+            self.wfile.flush()
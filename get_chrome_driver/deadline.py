@@ -0,0 +1,186 @@
+import contextlib
+import contextvars
+import subprocess
+import time
+
+from requests.exceptions import Timeout
+
+from get_chrome_driver import constants
+from get_chrome_driver.enums import Stage
+from get_chrome_driver.exceptions import DeadlineExceededError
+
+_current = contextvars.ContextVar("deadline", default=None)
+
+
+class Deadline:
+    """
+    Time limits of a call: an optional overall timeout, and a timeout for each
+    network or subprocess operation per stage, e.g. each manifest fetch.
+    An operation gets the time left of its stage or of the call, whichever is less.
+    """
+
+    def __init__(self, timeout: float = None, stage_timeouts: dict = None):
+        """
+        :param timeout: Seconds the whole call may take, None for no limit.
+        :param stage_timeouts: Seconds by Stage or stage name, merged with the defaults.
+        """
+
+        self.__timeout = timeout
+        self.__expires = None if timeout is None else time.monotonic() + timeout
+        self.__stage_timeouts = dict(constants.STAGE_TIMEOUTS)
+        for stage, seconds in (stage_timeouts or {}).items():
+            self.__stage_timeouts[Stage(stage).value] = seconds
+        self.__cancelled = False
+
+    @property
+    def timeout(self) -> float:
+        return self.__timeout
+
+    def remaining(self) -> float:
+        """
+        Return the seconds left of the whole call, or None if it has no timeout.
+        Raise DeadlineExceededError if there are none.
+        """
+
+        if self.__cancelled:
+            raise DeadlineExceededError(timeout=0)
+        if self.__expires is None:
+            return None
+
+        left = self.__expires - time.monotonic()
+        if left <= 0:
+            raise DeadlineExceededError(timeout=self.__timeout)
+
+        return left
+
+    def fork(self):
+        """
+        Return a deadline with the same time left that can be cancelled on its own,
+        e.g. for background work of a call.
+        """
+
+        forked = Deadline(stage_timeouts=self.__stage_timeouts)
+        forked.__timeout = self.__timeout
+        forked.__expires = self.__expires
+        forked.__cancelled = self.__cancelled
+
+        return forked
+
+    def cancel(self):
+        """
+        Make the operations of the deadline fail at their next check,
+        e.g. when their result is no longer needed.
+        """
+
+        self.__cancelled = True
+
+    def time_left(self, stage: Stage, started: float, needed: float = 0) -> float:
+        """
+        Return the seconds left for an operation of a stage.
+        Raise DeadlineExceededError if there are no more than needed.
+
+        :param stage: Stage of the operation.
+        :param started: Monotonic time the operation started.
+        :param needed: Seconds the operation is about to wait, e.g. before a retry.
+        """
+
+        if self.__cancelled:
+            raise DeadlineExceededError(stage.value, 0)
+
+        now = time.monotonic()
+        stage_timeout = self.__stage_timeouts[stage.value]
+        left = stage_timeout - (now - started)
+        if left <= needed:
+            raise DeadlineExceededError(stage.value, stage_timeout)
+
+        if self.__expires is not None:
+            if self.__expires - now <= needed:
+                raise DeadlineExceededError(stage.value, self.__timeout)
+            left = min(left, self.__expires - now)
+
+        return left
+
+    def exceeded(self, stage: Stage, started: float) -> DeadlineExceededError:
+        """
+        Return the error of an operation that timed out.
+
+        :param stage: Stage of the operation.
+        :param started: Monotonic time the operation started.
+        """
+
+        stage_timeout = self.__stage_timeouts[stage.value]
+        if self.__expires is not None and self.__expires - started < stage_timeout:
+            return DeadlineExceededError(stage.value, self.__timeout)
+
+        return DeadlineExceededError(stage.value, stage_timeout)
+
+
+def current() -> Deadline:
+    """
+    Return the deadline of the running call, or None.
+    """
+
+    return _current.get()
+
+
+@contextlib.contextmanager
+def scope(timeout: float = None, stage_timeouts: dict = None):
+    """
+    Run the with block under one deadline. Inside a block that already has a
+    deadline, that deadline is kept, so nested calls share the time of the outer call.
+
+    :param timeout: Seconds the whole block may take, None for no limit.
+    :param stage_timeouts: Seconds by Stage or stage name.
+    """
+
+    if _current.get() is not None:
+        yield _current.get()
+        return
+
+    deadline = Deadline(timeout, stage_timeouts)
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+@contextlib.contextmanager
+def use(deadline: Deadline):
+    """
+    Run the with block under a given deadline, e.g. a forked one.
+
+    :param deadline: Deadline.
+    """
+
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+@contextlib.contextmanager
+def stage(stage: Stage):
+    """
+    Run one operation of a stage. Yields a function returning the seconds left,
+    to pass as timeout, which raises DeadlineExceededError once there are none, or
+    no more than the seconds passed to it.
+    Request and subprocess timeouts raised in the block become DeadlineExceededError.
+
+    :param stage: Stage of the operation.
+    """
+
+    deadline = _current.get() or Deadline()
+    started = time.monotonic()
+
+    def time_left(needed: float = 0) -> float:
+        return deadline.time_left(stage, started, needed)
+
+    # Fail before starting if the call is out of time
+    time_left()
+
+    try:
+        yield time_left
+    except (Timeout, subprocess.TimeoutExpired) as err:
+        raise deadline.exceeded(stage, started) from err
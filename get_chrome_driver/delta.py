@@ -0,0 +1,284 @@
+import hashlib
+import json
+import os
+import zipfile
+
+from get_chrome_driver import catalog, constants
+from get_chrome_driver.exceptions import DeltaError
+from get_chrome_driver.transport import FileTransport
+
+# Deltas of an archive live next to it on the mirror, e.g. for
+# .../120.0.6099.109/linux64/chromedriver-linux64.zip:
+#   chromedriver-linux64.zip.deltas/index.json
+#       format, SHA-256 and size of the driver in the archive, and one entry per
+#       older version with the SHA-256 of its driver, which the delta applies to
+#   chromedriver-linux64.zip.deltas/<older version>.zst
+#       the driver compressed with zstd, using the older driver as dictionary
+DRIVER_FILENAMES = ("chromedriver", "chromedriver.exe")
+
+
+def index_url(archive_url: str) -> str:
+    """
+    Return the URL of the delta index of an archive.
+
+    :param archive_url: Archive URL.
+    """
+
+    return f"{archive_url}{constants.DELTA_SUFFIX}/{constants.DELTA_INDEX_FILENAME}"
+
+
+def delta_url(archive_url: str, source_version: str) -> str:
+    """
+    Return the URL of the delta from the driver of an older version to the driver of an archive.
+
+    :param archive_url: Archive URL.
+    :param source_version: Older version.
+    """
+
+    return f"{archive_url}{constants.DELTA_SUFFIX}/{source_version}.zst"
+
+
+def is_available() -> bool:
+    """
+    Return True if deltas can be made and applied, which needs zstandard:
+    pip install get-chrome-driver[delta]
+    """
+
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+
+    return True
+
+
+def diff(source: bytes, target: bytes) -> bytes:
+    """
+    Return the delta from source to target: target compressed with zstd, with source
+    as raw content dictionary and a window that spans both.
+
+    :param source: Older driver.
+    :param target: Newer driver.
+    """
+
+    zstandard = _zstandard()
+    window_log = min(
+        max((len(source) + len(target)).bit_length(), zstandard.WINDOWLOG_MIN),
+        zstandard.WINDOWLOG_MAX,
+    )
+    params = zstandard.ZstdCompressionParameters.from_level(
+        constants.DELTA_LEVEL,
+        window_log=window_log,
+        enable_ldm=True,
+        source_size=len(target),
+    )
+    compressor = zstandard.ZstdCompressor(
+        dict_data=_dictionary(zstandard, source), compression_params=params
+    )
+
+    return compressor.compress(target)
+
+
+def patch(source: bytes, delta: bytes) -> bytes:
+    """
+    Apply a delta from diff() to the older driver. Raise DeltaError if it does not apply.
+
+    :param source: Older driver.
+    :param delta: Delta.
+    """
+
+    zstandard = _zstandard()
+    decompressor = zstandard.ZstdDecompressor(
+        dict_data=_dictionary(zstandard, source),
+        max_window_size=1 << zstandard.WINDOWLOG_MAX,
+    )
+    try:
+        return decompressor.decompress(delta)
+    except zstandard.ZstdError as err:
+        raise DeltaError(f"The delta does not apply: {err}")
+
+
+def read_driver(archive_path: str) -> bytes:
+    """
+    Return the driver in an archive.
+
+    :param archive_path: Driver archive.
+    """
+
+    with zipfile.ZipFile(archive_path) as archive:
+        for name in archive.namelist():
+            if os.path.basename(name) in DRIVER_FILENAMES:
+                return archive.read(name)
+
+    raise DeltaError(f"{archive_path} has no driver.")
+
+
+def build(
+    mirror_dir: str,
+    max_sources: int = constants.DELTA_MAX_SOURCES,
+    platforms: list = None,
+) -> list:
+    """
+    Write the deltas of every archive in a mirror from the drivers of the versions
+    before it, per platform. Archives are found through the known good versions
+    manifest of the mirror. Deltas written by an earlier build are kept, deltas
+    larger than DELTA_MAX_RATIO of the archive are not written.
+    Return the written deltas.
+
+    :param mirror_dir: Mirror directory, as served by FileTransport.
+    :param max_sources: Older versions to write a delta from per archive.
+    :param platforms: Platforms to write deltas for, e.g. linux64, None for all.
+    """
+
+    mirror = FileTransport(mirror_dir)
+    manifest_path = mirror.path(constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL)
+    try:
+        with open(manifest_path, "rb") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError) as err:
+        raise DeltaError(f"Could not read the manifest of the mirror: {err}")
+
+    # Archives in the mirror by platform, oldest first
+    archives = {}
+    for version in manifest.get("versions", []):
+        if catalog.pack_version(version.get("version", "")) is None:
+            continue
+        for download in version.get("downloads", {}).get("chromedriver", []):
+            platform = download.get("platform")
+            if platforms and platform not in platforms:
+                continue
+            path = mirror.path(download.get("url", ""))
+            if path and os.path.isfile(path):
+                archives.setdefault(platform, []).append(
+                    (version["version"], download["url"], path)
+                )
+
+    written = []
+    for platform, platform_archives in archives.items():
+        platform_archives.sort(key=lambda archive: catalog.pack_version(archive[0]))
+        for position, (version, url, path) in enumerate(platform_archives):
+            sources = platform_archives[max(position - max_sources, 0) : position]
+            for source_version, size in _build_archive(
+                mirror, url, path, version, sources
+            ):
+                written.append(
+                    {
+                        "platform": platform,
+                        "version": version,
+                        "source_version": source_version,
+                        "size": size,
+                        "archive_size": os.path.getsize(path),
+                    }
+                )
+
+    return written
+
+
+def _build_archive(
+    mirror: FileTransport, url: str, path: str, version: str, sources: list
+) -> list:
+    """
+    Write the deltas of one archive and its index. Return the new deltas as
+    (source version, size) tuples.
+
+    :param mirror: Mirror.
+    :param url: Archive URL.
+    :param path: Archive path.
+    :param version: Archive version.
+    :param sources: (version, url, path) tuples of the older archives.
+    """
+
+    if not sources:
+        return []
+
+    target = read_driver(path)
+    target_sha256 = hashlib.sha256(target).hexdigest()
+    index_path = mirror.path(index_url(url))
+
+    # Reuse the deltas of an earlier build of the same driver
+    index = {}
+    try:
+        with open(index_path, "rb") as file:
+            index = json.load(file)
+    except (OSError, ValueError):
+        pass
+    if index.get("sha256") != target_sha256:
+        index = {}
+    deltas = {
+        source_version: entry
+        for source_version, entry in index.get("deltas", {}).items()
+        if os.path.isfile(mirror.path(delta_url(url, source_version)))
+    }
+
+    new = []
+    max_size = os.path.getsize(path) * constants.DELTA_MAX_RATIO
+    for source_version, _, source_path in sources:
+        if source_version in deltas:
+            continue
+
+        source = read_driver(source_path)
+        delta = diff(source, target)
+        if len(delta) > max_size:
+            continue
+
+        _write_atomic(mirror.path(delta_url(url, source_version)), delta)
+        deltas[source_version] = {
+            "sha256": hashlib.sha256(source).hexdigest(),
+            "size": len(delta),
+        }
+        new.append((source_version, len(delta)))
+
+    if new:
+        index = {
+            "format": constants.DELTA_FORMAT,
+            "version": version,
+            "sha256": target_sha256,
+            "size": len(target),
+            "deltas": deltas,
+        }
+        _write_atomic(index_path, json.dumps(index, indent=2).encode("UTF-8"))
+
+    return new
+
+
+def _dictionary(zstandard, source: bytes):
+    """
+    Return the older driver as zstd dictionary.
+
+    :param zstandard: Zstandard module.
+    :param source: Older driver.
+    """
+
+    return zstandard.ZstdCompressionDict(
+        source, dict_type=zstandard.DICT_TYPE_RAWCONTENT
+    )
+
+
+def _zstandard():
+    """
+    Return the zstandard module, raise DeltaError if it is not installed.
+    """
+
+    try:
+        import zstandard
+    except ImportError as err:
+        raise DeltaError(
+            "Deltas need zstandard, install it with: pip install get-chrome-driver[delta]"
+        ) from err
+
+    return zstandard
+
+
+def _write_atomic(path: str, content: bytes):
+    """
+    Write a file atomically.
+
+    :param path: File path.
+    :param content: Content.
+    """
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(content)
+    os.replace(tmp_path, path)
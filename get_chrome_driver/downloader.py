@@ -1,31 +1,62 @@
+import errno
 import os
-import requests
-from urllib3.util.retry import Retry
-from requests.adapters import HTTPAdapter
+import shutil
 from urllib.parse import urlparse
 from requests.exceptions import RequestException
 from requests.exceptions import HTTPError
-
-
-def download(url: str, output_path: str = None, file_name: str = None):
+from requests.exceptions import Timeout
+
+from get_chrome_driver import constants, rate_limit
+from get_chrome_driver.exceptions import DownloadError, InsufficientSpaceError
+from get_chrome_driver.hedging import Hedger
+from get_chrome_driver.rate_limit import RateLimiter
+from get_chrome_driver.transport import Transport, RequestsTransport
+
+
+def download(
+    url: str,
+    output_path: str = None,
+    file_name: str = None,
+    hedger: Hedger = None,
+    rate_limiter: RateLimiter = None,
+    time_left=None,
+    transport: Transport = None,
+):
     """
     Download a file from url.
     If output_path is None, the file will be downloaded directly at the current directory.
     If file_name is None, the file name from the url will be used.
+    If hedger is set, a slow response is hedged with a second request.
+    If rate_limiter is set, the download waits for its turn.
+    If time_left is set, it returns the seconds the download may still take and raises
+    once there are none, the partly downloaded file is removed then.
+    If transport is set, the file is requested with it instead of with requests.
+    Throttled and failed requests are retried with backoff.
+    When the response has a Content-Length, the free disk space is checked and the file
+    is preallocated before the transfer starts, and its size is verified after.
+    InsufficientSpaceError is raised if the disk is too full, DownloadError if the
+    transfer ended early.
     """
 
-    session = __retry_session(
-        retries=3,
-        backoff_factor=0.1,
-        status_forcelist=[429, 500, 502, 503, 504],
-        method_whitelist=["GET"],
-    )
+    transport = transport or RequestsTransport()
+
+    def request():
+        timeout = time_left() if time_left else None
+        if hedger:
+            return hedger.get(url, session=transport, timeout=timeout)
+        return transport.request("GET", url, timeout=timeout, stream=True)
+
     try:
-        res = session.get(url=url)
+        res = rate_limit.send(
+            request, url, rate_limiter=rate_limiter, time_left=time_left
+        )
+    except Timeout:
+        raise
     except RequestException as err:
         raise RequestException(err)
     else:
         if res.status_code != 200:
+            res.close()
             raise HTTPError("Invalid URL")
 
         if file_name == "" or file_name is None:
@@ -38,38 +69,102 @@ def download(url: str, output_path: str = None, file_name: str = None):
             __makedirs(output_path)
             file_path = output_path + "/" + file_name
 
-        with open(file_path, "wb") as file:
-            # Download the file in chunks
-            for chunk in res.iter_content(chunk_size=1048576):
-                if chunk:
-                    file.write(chunk)
+        size = __content_length(res)
+        try:
+            if size is not None:
+                __check_free_space(os.path.dirname(os.path.abspath(file_path)), size)
+
+            with open(file_path, "wb") as file:
+                if size:
+                    __preallocate(file, size)
+
+                # Download the file in chunks
+                written = 0
+                for chunk in res.iter_content(chunk_size=constants.DOWNLOAD_CHUNK_SIZE):
+                    if chunk:
+                        __write(file, chunk)
+                        written += len(chunk)
+                    if time_left:
+                        time_left()
+
+                if size is not None and written != size:
+                    raise DownloadError(
+                        f"Downloaded {written} of {size} bytes of {file_name}."
+                    )
+        except BaseException:
+            res.close()
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            # A read that timed out is reported as running out of time
+            if time_left:
+                time_left()
+            raise
 
         return file_path, file_name
-    finally:
-        session.close()
 
 
-def __retry_session(
-    retries: int, backoff_factor: float, status_forcelist: any, method_whitelist: any
-):
+def __content_length(res):
     """
-    Retry session.
+    Return the size of the body from Content-Length, or None if it is not known,
+    e.g. when the body is compressed in transfer and decompressed while read.
     """
 
-    retry = Retry(
-        total=retries,
-        read=retries,
-        connect=retries,
-        backoff_factor=backoff_factor,
-        status_forcelist=status_forcelist,
-        allowed_methods=method_whitelist,
-    )
-
-    adapter = HTTPAdapter(max_retries=retry)
-    session = requests.Session()
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    return session
+    headers = getattr(res, "headers", None) or {}
+    if headers.get("Content-Encoding", "identity") != "identity":
+        return None
+
+    try:
+        size = int(headers.get("Content-Length"))
+    except (TypeError, ValueError):
+        return None
+
+    return size if size >= 0 else None
+
+
+def __check_free_space(path: str, size: int):
+    """
+    Raise InsufficientSpaceError if a file of size bytes does not fit in path.
+    """
+
+    free = shutil.disk_usage(path).free
+    needed = size + constants.DOWNLOAD_FREE_SPACE_MARGIN
+    if free < needed:
+        raise InsufficientSpaceError(
+            f"Downloading {size} bytes needs {needed} bytes of free space in {path}, "
+            f"only {free} are free."
+        )
+
+
+def __preallocate(file, size: int):
+    """
+    Reserve the disk space of a file up front, so that it is written contiguously
+    and a full disk fails before the transfer. Skipped where not supported.
+    """
+
+    if not hasattr(os, "posix_fallocate"):
+        return
+
+    try:
+        os.posix_fallocate(file.fileno(), 0, size)
+    except OSError as err:
+        if err.errno == errno.ENOSPC:
+            raise InsufficientSpaceError(
+                f"Could not reserve {size} bytes for {file.name}: {err}"
+            )
+        # e.g. EOPNOTSUPP or EINVAL on file systems without preallocation
+
+
+def __write(file, chunk: bytes):
+    """
+    Write a chunk, a full disk raises InsufficientSpaceError.
+    """
+
+    try:
+        file.write(chunk)
+    except OSError as err:
+        if err.errno == errno.ENOSPC:
+            raise InsufficientSpaceError(f"The disk of {file.name} is full: {err}")
+        raise
 
 
 def __get_file_name_from_url(url: str):
@@ -0,0 +1,354 @@
+import contextlib
+import socket
+import subprocess
+import threading
+import time
+from collections import deque
+
+from requests.exceptions import RequestException
+
+from get_chrome_driver import constants
+from get_chrome_driver.exceptions import DriverPoolError, GetChromeDriverError
+from get_chrome_driver.transport import Transport, RequestsTransport
+
+
+class Endpoint:
+    """
+    A chromedriver process listening on a local port.
+    """
+
+    def __init__(self, process: subprocess.Popen, port: int):
+        """
+        :param process: Chromedriver process.
+        :param port: Port it listens on.
+        """
+
+        self.process = process
+        self.port = port
+        self.uses = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://{constants.POOL_HOST}:{self.port}"
+
+    def is_running(self) -> bool:
+        return self.process.poll() is None
+
+
+class DriverPool:
+    """
+    Chromedriver processes started ahead of time, so that a session can start
+    without waiting for a new process to listen.
+
+    Processes are started on free ports and handed out once they report ready.
+    A released process goes back to the pool, or is replaced by a new one once
+    it has been used max_uses times, has exited or is reported unhealthy.
+    """
+
+    def __init__(
+        self,
+        executable_path: str,
+        size: int = constants.POOL_SIZE,
+        args: list = None,
+        max_uses: int = constants.POOL_MAX_USES,
+        startup_timeout: float = constants.POOL_STARTUP_TIMEOUT,
+        transport: Transport = None,
+    ):
+        """
+        :param executable_path: Chromedriver executable, e.g. from GetChromeDriver.install().
+        :param size: Number of processes.
+        :param args: Extra chromedriver arguments.
+        :param max_uses: Times a process is handed out before it is replaced.
+        :param startup_timeout: Seconds a process may take to report ready.
+        :param transport: Send the readiness checks with this transport, e.g. a
+            PooledTransport to keep the connections to the processes open.
+        """
+
+        self.__executable_path = executable_path
+        self.__size = size
+        self.__args = args or []
+        self.__max_uses = max_uses
+        self.__startup_timeout = startup_timeout
+        self.__transport = transport or RequestsTransport()
+
+        self.__condition = threading.Condition()
+        self.__ready = deque()
+        self.__endpoints = set()
+        self.__started = False
+        self.__closed = False
+        self.__failed_starts = 0
+        self.__error = None
+        self.__metrics = {
+            "acquired": 0,
+            "wait_total": 0.0,
+            "wait_max": 0.0,
+            "started": 0,
+            "restarted": 0,
+            "failed_starts": 0,
+        }
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def start(self):
+        """
+        Start the processes. They become available as soon as they report ready.
+        """
+
+        with self.__condition:
+            if self.__started:
+                return self
+            self.__started = True
+
+        for _ in range(self.__size):
+            self.__spawn()
+
+        return self
+
+    def acquire(self, timeout: float = None) -> Endpoint:
+        """
+        Return a ready endpoint, waiting for one if none is ready.
+
+        :param timeout: Seconds to wait, None waits until one is ready.
+        """
+
+        self.start()
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+
+        while True:
+            with self.__condition:
+                while not self.__ready:
+                    if self.__closed:
+                        raise DriverPoolError("The pool is closed.")
+                    if self.__error:
+                        raise DriverPoolError(self.__error)
+
+                    remaining = (
+                        None if deadline is None else deadline - time.monotonic()
+                    )
+                    if remaining is not None and remaining <= 0:
+                        raise DriverPoolError(
+                            f"No chromedriver was ready within {timeout} seconds."
+                        )
+                    self.__condition.wait(remaining)
+
+                endpoint = self.__ready.popleft()
+
+            # Exited while waiting in the pool
+            if not endpoint.is_running():
+                self.__restart(endpoint)
+                continue
+
+            wait = time.monotonic() - start
+            with self.__condition:
+                self.__metrics["acquired"] += 1
+                self.__metrics["wait_total"] += wait
+                self.__metrics["wait_max"] = max(self.__metrics["wait_max"], wait)
+
+            return endpoint
+
+    def release(self, endpoint: Endpoint, healthy: bool = True):
+        """
+        Give an endpoint back to the pool.
+
+        :param endpoint: Endpoint from acquire().
+        :param healthy: False replaces the process, e.g. after a failed session.
+        """
+
+        endpoint.uses += 1
+        if not healthy or endpoint.uses >= self.__max_uses or not endpoint.is_running():
+            self.__restart(endpoint)
+            return
+
+        with self.__condition:
+            if self.__closed:
+                _terminate(endpoint.process)
+                return
+            self.__ready.append(endpoint)
+            self.__condition.notify()
+
+    @contextlib.contextmanager
+    def endpoint(self, timeout: float = None):
+        """
+        Acquire an endpoint for a with block. It is replaced if the block raises.
+
+        :param timeout: Seconds to wait, None waits until one is ready.
+        """
+
+        endpoint = self.acquire(timeout=timeout)
+        healthy = False
+        try:
+            yield endpoint
+            healthy = True
+        finally:
+            self.release(endpoint, healthy=healthy)
+
+    def metrics(self) -> dict:
+        """
+        Return the acquire count, wait times in seconds, start counts and ready processes.
+        """
+
+        with self.__condition:
+            metrics = dict(self.__metrics)
+            metrics["ready"] = len(self.__ready)
+
+        metrics["wait_mean"] = (
+            metrics["wait_total"] / metrics["acquired"] if metrics["acquired"] else 0.0
+        )
+
+        return metrics
+
+    def close(self):
+        """
+        Stop all processes.
+        """
+
+        with self.__condition:
+            self.__closed = True
+            endpoints = list(self.__endpoints)
+            self.__endpoints.clear()
+            self.__ready.clear()
+            self.__condition.notify_all()
+
+        for endpoint in endpoints:
+            _terminate(endpoint.process)
+
+    def __spawn(self):
+        """
+        Start a process and make it available once it reports ready.
+        """
+
+        port = _free_port()
+        try:
+            process = subprocess.Popen(
+                [self.__executable_path, f"--port={port}", *self.__args],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                stdin=subprocess.DEVNULL,
+            )
+        except OSError as err:
+            with self.__condition:
+                self.__error = f"Could not start {self.__executable_path}: {err}"
+                self.__condition.notify_all()
+            return
+
+        endpoint = Endpoint(process, port)
+        with self.__condition:
+            if self.__closed:
+                _terminate(process)
+                return
+            self.__endpoints.add(endpoint)
+            self.__metrics["started"] += 1
+
+        threading.Thread(target=self.__warm_up, args=(endpoint,), daemon=True).start()
+
+    def __warm_up(self, endpoint: Endpoint):
+        """
+        Wait until a process reports ready, then add it to the pool.
+        A process that does not is replaced.
+
+        :param endpoint: New endpoint.
+        """
+
+        deadline = time.monotonic() + self.__startup_timeout
+        while time.monotonic() < deadline and endpoint.is_running():
+            if self.__closed:
+                return
+
+            if is_ready(endpoint, self.__transport):
+                with self.__condition:
+                    if self.__closed:
+                        break
+                    self.__failed_starts = 0
+                    self.__ready.append(endpoint)
+                    self.__condition.notify()
+                    return
+
+            time.sleep(constants.POOL_POLL_INTERVAL)
+
+        with self.__condition:
+            self.__endpoints.discard(endpoint)
+            if not self.__closed:
+                self.__failed_starts += 1
+                self.__metrics["failed_starts"] += 1
+                if (
+                    self.__failed_starts
+                    >= constants.POOL_MAX_FAILED_STARTS * self.__size
+                ):
+                    self.__error = (
+                        f"{self.__executable_path} did not report ready "
+                        f"within {self.__startup_timeout} seconds."
+                    )
+                    self.__condition.notify_all()
+            retry = not self.__closed and not self.__error
+        _terminate(endpoint.process)
+
+        if retry:
+            self.__spawn()
+
+    def __restart(self, endpoint: Endpoint):
+        """
+        Stop the process of an endpoint and start a new one in its place.
+
+        :param endpoint: Endpoint to replace.
+        """
+
+        with self.__condition:
+            self.__endpoints.discard(endpoint)
+            closed = self.__closed
+            if not closed:
+                self.__metrics["restarted"] += 1
+        _terminate(endpoint.process)
+
+        if not closed:
+            self.__spawn()
+
+
+def is_ready(endpoint: Endpoint, transport: Transport = None) -> bool:
+    """
+    Return True if a chromedriver process reports ready for new sessions.
+
+    :param endpoint: Endpoint.
+    :param transport: Transport to send the request with, requests if not set.
+    """
+
+    transport = transport or RequestsTransport()
+    try:
+        response = transport.request(
+            "GET", f"{endpoint.url}/status", timeout=constants.POOL_HEALTH_TIMEOUT
+        )
+        return bool(response.json()["value"]["ready"])
+    except (RequestException, GetChromeDriverError, ValueError, KeyError, TypeError):
+        return False
+
+
+def _free_port() -> int:
+    """
+    Return a local port that is free now.
+    """
+
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((constants.POOL_HOST, 0))
+        return sock.getsockname()[1]
+
+
+def _terminate(process: subprocess.Popen):
+    """
+    Stop a process, kill it if it does not stop in time.
+
+    :param process: Process.
+    """
+
+    if process.poll() is not None:
+        return
+
+    process.terminate()
+    try:
+        process.wait(timeout=constants.POOL_STOP_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
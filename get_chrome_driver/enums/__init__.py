@@ -1,3 +1,4 @@
 from .os_platform import OsPlatform
 from .phase import Phase
 from .platform import Platform
+from .stage import Stage
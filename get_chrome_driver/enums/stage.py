@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class Stage(Enum):
+    metadata = "metadata"
+    probe = "probe"
+    download = "download"
+    detect = "detect"
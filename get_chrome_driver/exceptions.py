@@ -18,5 +18,45 @@ class DownloadError(GetChromeDriverError):
     pass
 
 
+class InsufficientSpaceError(DownloadError):
+    pass
+
+
 class VersionError(GetChromeDriverError):
     pass
+
+
+class DaemonUnavailableError(GetChromeDriverError):
+    pass
+
+
+class DriverPoolError(GetChromeDriverError):
+    pass
+
+
+class DeadlineExceededError(GetChromeDriverError):
+    def __init__(self, stage: str = None, timeout: float = None):
+        """
+        :param stage: Stage that ran out of time, e.g. metadata, None for the whole call.
+        :param timeout: Seconds the stage or call had, None if not known.
+        """
+
+        message = f"The {stage} stage" if stage else "The call"
+        message += " ran out of time"
+        if timeout is not None:
+            message += f" after {timeout:g} seconds"
+        super().__init__(f"{message}.")
+        self.stage = stage
+        self.timeout = timeout
+
+
+class BundleError(GetChromeDriverError):
+    pass
+
+
+class DeltaError(GetChromeDriverError):
+    pass
+
+
+class OfflineError(GetChromeDriverError):
+    pass
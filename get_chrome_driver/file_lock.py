@@ -0,0 +1,84 @@
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """
+    Exclusive lock on a lock file, held across processes.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Lock file path, created if it does not exist.
+        """
+
+        self.__path = path
+        self.__fd = None
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """
+        Acquire the lock. Return False if not blocking and the lock is held elsewhere.
+
+        :param blocking: Wait until the lock is free.
+        """
+
+        os.makedirs(os.path.dirname(self.__path) or ".", exist_ok=True)
+        fd = os.open(self.__path, os.O_RDWR | os.O_CREAT, 0o644)
+
+        try:
+            if fcntl:
+                flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+                fcntl.flock(fd, flags)
+            else:
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                        break
+                    except OSError:
+                        if not blocking:
+                            raise
+                        time.sleep(0.05)
+        except OSError:
+            os.close(fd)
+            if blocking:
+                raise
+            return False
+
+        self.__fd = fd
+
+        return True
+
+    def release(self):
+        """
+        Release the lock.
+        """
+
+        if self.__fd is None:
+            return
+
+        try:
+            if fcntl:
+                fcntl.flock(self.__fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self.__fd, 0, os.SEEK_SET)
+                msvcrt.locking(self.__fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self.__fd)
+            self.__fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
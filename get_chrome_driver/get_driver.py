@@ -1,18 +1,49 @@
+import contextlib
+import contextvars
+import hashlib
+import json
 import os
 import platform as pl
 import shutil
 import struct
 import subprocess
-import xml.etree.ElementTree as ElTree
+import tarfile
+import tempfile
+import threading
+import time
 import zipfile
-from urllib.request import urlopen
+from concurrent.futures import Future, ThreadPoolExecutor
 
-import requests
 from requests.exceptions import HTTPError
 from requests.exceptions import RequestException
 
-from get_chrome_driver import downloader, constants
-from get_chrome_driver.enums import Platform, Phase, OsPlatform
+from get_chrome_driver import (
+    downloader,
+    constants,
+    daemon,
+    store,
+    catalog,
+    browsers,
+    rate_limit,
+    tracing,
+    manifest_sync,
+    legacy_listing,
+    deadline,
+    bundle,
+    watch,
+    delta,
+)
+from get_chrome_driver.hedging import Hedger
+from get_chrome_driver.negative_cache import NegativeCache
+from get_chrome_driver.single_flight import SingleFlight
+from get_chrome_driver.transport import (
+    Transport,
+    RequestsTransport,
+    Http2Transport,
+    OfflineTransport,
+    FileTransport,
+)
+from get_chrome_driver.enums import Platform, Phase, OsPlatform, Stage
 from get_chrome_driver.exceptions import (
     GetChromeDriverError,
     UnknownPlatformError,
@@ -20,11 +51,74 @@ from get_chrome_driver.exceptions import (
     DownloadError,
     VersionError,
     VersionUrlError,
+    DaemonUnavailableError,
+    BundleError,
+    DeltaError,
+    OfflineError,
 )
 
+# Concurrent identical resolutions and downloads of all instances are coalesced
+_flights = SingleFlight()
+_path_lock = threading.Lock()
+# Manifest fetches started ahead of time in the running call
+_ahead = contextvars.ContextVar("ahead", default=None)
+
 
 class GetChromeDriver:
-    def __init__(self, os_platform: OsPlatform = None):
+    """
+    Resolve, download and install ChromeDriver.
+
+    Instances are thread-safe and can be shared between threads. Concurrent
+    identical resolutions and downloads in a process run once and share their
+    result, and install() adds a directory to PATH only once.
+    """
+
+    def __init__(
+        self,
+        os_platform: OsPlatform = None,
+        use_daemon: bool = True,
+        manifest_ttl: float = 0,
+        hedger: Hedger = None,
+        manifest_cache: dict = None,
+        use_catalog: bool = True,
+        rate_limiter: rate_limit.RateLimiter = None,
+        tracer: tracing.Tracer = None,
+        negative_ttl: float = constants.NEGATIVE_CACHE_TTL,
+        timeout: float = None,
+        stage_timeouts: dict = None,
+        transport: Transport = None,
+        use_deltas: bool = False,
+        offline: bool = None,
+        catalog_max_age: float = constants.CATALOG_MAX_AGE,
+    ):
+        """
+        :param os_platform: OS to get the driver for, defaults to the current OS.
+        :param use_daemon: Ask the resolver daemon first when one is running.
+        :param manifest_ttl: Seconds to keep fetched manifests in memory, 0 disables.
+        :param hedger: Hedge slow metadata and archive requests.
+        :param manifest_cache: Dict to keep fetched manifests in, share it between
+            instances to share their fetches.
+        :param use_catalog: Look up versions and URLs in the catalog file first when one is built.
+        :param rate_limiter: Limit the request rate per host.
+        :param tracer: Record the spans of fetches, downloads and installs.
+        :param negative_ttl: Seconds to remember versions without a download,
+            shared by all processes through the cache directory, 0 disables.
+        :param timeout: Seconds a call, e.g. install(), may take, None for no limit.
+        :param stage_timeouts: Seconds each metadata fetch, url probe, download and
+            browser detection may take, by Stage or stage name.
+        :param transport: Send all requests with this transport, e.g. a PooledTransport
+            or a FileTransport of a local mirror, defaults to requests.
+        :param use_deltas: Install a version by patching an older driver in the local
+            store with a delta from the mirror when there is one, needs zstandard. Only a
+            FileTransport of a mirror is asked for deltas.
+        :param offline: Resolve and install only from the local caches: the catalog,
+            the manifests kept in memory, the sync index and the local store. Nothing is
+            requested, the daemon is not asked and missing data fails at once with
+            OfflineError. Defaults to the GET_CHROME_DRIVER_OFFLINE environment variable.
+        :param catalog_max_age: Seconds after its build a catalog is no longer used online,
+            so that new releases are found. None uses it at any age, offline it always is.
+        """
+
         self.__os_platforms_list = [os_platform for os_platform in OsPlatform]
 
         if not os_platform:
@@ -43,6 +137,48 @@ class GetChromeDriver:
         self.__arch = struct.calcsize("P") * 8
         self.__chromedriver_str = "chromedriver"
         self.__zip_ext = ".zip"
+        self.__use_daemon = use_daemon
+        self.__manifest_ttl = manifest_ttl
+        self.__manifest_cache = manifest_cache if manifest_cache is not None else {}
+        self.__hedger = hedger
+        self.__lock = threading.Lock()
+        self.__use_catalog = use_catalog
+        self.__catalog_max_age = catalog_max_age
+        self.__rate_limiter = rate_limiter
+        self.__tracer = tracer
+        self.__negative_cache = (
+            NegativeCache(negative_ttl) if negative_ttl > 0 else None
+        )
+        self.__timeout = timeout
+        self.__stage_timeouts = stage_timeouts
+        self.__transport = transport or RequestsTransport()
+        # Deltas are only served by a mirror, other sources are not asked on every install
+        self.__use_deltas = use_deltas and isinstance(self.__transport, FileTransport)
+
+        # No socket is opened offline, not even to the daemon
+        self.__offline = is_offline() if offline is None else offline
+        if self.__offline:
+            self.__use_daemon = False
+            self.__hedger = None
+            self.__rate_limiter = None
+            self.__transport = OfflineTransport()
+
+        # Instances share in-flight calls only if they would resolve the same way,
+        # every network transport fetches the same documents
+        self.__configuration = (
+            self.__os_platform,
+            self.__arch,
+            self.__offline,
+            (
+                "network"
+                if isinstance(self.__transport, (RequestsTransport, Http2Transport))
+                else id(self.__transport)
+            ),
+            self.__use_catalog,
+            self.__catalog_max_age,
+            self.__negative_cache is not None,
+            self.__use_daemon,
+        )
 
     def driver_filename(self) -> str:
         """
@@ -63,14 +199,20 @@ class GetChromeDriver:
         Return the latest stable version.
         """
 
-        return self.__latest_version_by_phase(Phase.stable)
+        with self.__deadline():
+            return self.__daemon_call(
+                "stable_version"
+            ) or self.__latest_version_by_phase(Phase.stable)
 
     def beta_version(self) -> str:
         """
         Return the latest beta version.
         """
 
-        return self.__latest_version_by_phase(Phase.beta)
+        with self.__deadline():
+            return self.__daemon_call("beta_version") or self.__latest_version_by_phase(
+                Phase.beta
+            )
 
     def __latest_version_by_phase(self, phase: Phase) -> str:
         """
@@ -79,17 +221,15 @@ class GetChromeDriver:
         :param phase: Stable or beta.
         """
 
-        response = requests.get(constants.LAST_KNOWN_GOOD_VERSIONS_URL)
-        if not response.ok:
-            raise GetChromeDriverError(
-                f"Could not fetch from {constants.LAST_KNOWN_GOOD_VERSIONS_URL}."
-            )
+        last_known_good_versions = self.__get_json(
+            constants.LAST_KNOWN_GOOD_VERSIONS_URL
+        )
 
         try:
             if phase == Phase.stable:
-                return response.json()["channels"]["Stable"]["version"]
+                return last_known_good_versions["channels"]["Stable"]["version"]
             if phase == Phase.beta:
-                return response.json()["channels"]["Beta"]["version"]
+                return last_known_good_versions["channels"]["Beta"]["version"]
         except KeyError:
             raise UnknownVersionError("Could not find version.")
 
@@ -100,14 +240,14 @@ class GetChromeDriver:
         Return the latest stable version URL.
         """
 
-        return self.version_url(self.__latest_version_by_phase(Phase.stable))
+        return self.version_url(self.stable_version())
 
     def beta_version_url(self) -> str:
         """
         Return the latest beta version URL.
         """
 
-        return self.version_url(self.__latest_version_by_phase(Phase.beta))
+        return self.version_url(self.beta_version())
 
     def __version_url_for_platform(
         self,
@@ -155,19 +295,38 @@ class GetChromeDriver:
                             if url and self.__check_if_url_is_valid(url):
                                 return url
 
-        # Old chromedriver storage
-        # 64
+        # Old chromedriver storage, looked up in its listing
+        platforms = []
         if self.__arch == 64:
-            url = f"{constants.CHROMEDRIVER_STORAGE_URL}/{version}/{self.__chromedriver_str}_{platform_64}{self.__zip_ext}"
-            if self.__check_if_url_is_valid(url):
-                return url
-
-        # 32
+            platforms.append(platform_64)
         if platform_32:
-            url = f"{constants.CHROMEDRIVER_STORAGE_URL}/{version}/{self.__chromedriver_str}_{platform_32}{self.__zip_ext}"
+            platforms.append(platform_32)
+
+        listing_error = None
+        try:
+            listing = self.__get_legacy_listing()
+        except OfflineError:
+            # Probing the storage instead is not possible either
+            raise
+        except (GetChromeDriverError, RequestException) as err:
+            listing, listing_error = None, err
+
+        for platform in platforms:
+            if listing is not None:
+                archive = listing.archive(version, platform)
+                if archive:
+                    return archive.url
+                continue
+
+            # Without the listing, probe the storage
+            url = f"{constants.CHROMEDRIVER_STORAGE_URL}/{version}/{self.__chromedriver_str}_{platform}{self.__zip_ext}"
             if self.__check_if_url_is_valid(url):
                 return url
 
+        # Without the listing the version is not known to be missing
+        if listing_error is not None:
+            raise listing_error
+
         raise VersionUrlError(f"Could not find download URL for version {version}.")
 
     def version_url(self, version: str) -> str:
@@ -177,16 +336,52 @@ class GetChromeDriver:
         :param version: Chromedriver version.
         """
 
-        if not self.__check_if_version_format_is_valid(version):
-            raise UnknownVersionError("Invalid version format.")
+        with self.__deadline():
+            if not self.__check_if_version_format_is_valid(version):
+                raise UnknownVersionError("Invalid version format.")
 
-        # Get driver URLs from the new api
-        response = requests.get(constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL)
-        if not response.ok:
-            raise GetChromeDriverError(
-                f"Could not get {constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL}."
+            return _flights.do(
+                ("version_url", self.__configuration, version),
+                lambda: self.__version_url(version),
             )
-        new_api_known_good_versions = response.json()["versions"]
+
+    def __version_url(self, version: str) -> str:
+        """
+        Return the version download URL, without coalescing.
+        Versions without a download are remembered in the negative cache.
+
+        :param version: Chromedriver version.
+        """
+
+        return self.__unless_known_miss(
+            f"version_url/{self.__os_platform.value}/{self.__arch}/{version}",
+            version,
+            VersionUrlError,
+            lambda: self.__find_version_url(version),
+        )
+
+    def __find_version_url(self, version: str) -> str:
+        """
+        Return the version download URL from the daemon, the catalog or the manifests.
+
+        :param version: Chromedriver version.
+        """
+
+        url = self.__daemon_call("version_url", version=version) or self.__catalog_url(
+            version
+        )
+        if url:
+            return url
+
+        if self.__offline:
+            url = self.__indexed_url(version)
+            if url:
+                return url
+
+        # Get driver URLs from the new api
+        new_api_known_good_versions = self.__get_json(
+            constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL
+        )["versions"]
 
         if self.__os_platform == OsPlatform.win:
             url = self.__version_url_for_platform(
@@ -220,6 +415,330 @@ class GetChromeDriver:
 
         raise VersionUrlError("Could not find version URL.")
 
+    def version_matrix(
+        self,
+        min_milestone: int = None,
+        max_milestone: int = None,
+        platforms: list = None,
+    ):
+        """
+        Yield the download URL of every version and platform as dicts with the keys
+        version, platform, url, source and api. The manifest and the old storage
+        listing are fetched once, the OS platform of this instance does not apply.
+
+        :param min_milestone: Lowest major version to include.
+        :param max_milestone: Highest major version to include.
+        :param platforms: Platforms to include, e.g. Platform.linux64 or "mac-arm64".
+        """
+
+        if platforms is not None:
+            platforms = [
+                platform.value if isinstance(platform, Platform) else platform
+                for platform in platforms
+            ]
+
+        def included(version: str, platform: str) -> bool:
+            milestone = int(version.split(".")[0])
+            if min_milestone is not None and milestone < min_milestone:
+                return False
+            if max_milestone is not None and milestone > max_milestone:
+                return False
+            return platforms is None or platform in platforms
+
+        for row in self.__legacy_rows(self.__get_legacy_storage_keys()):
+            if included(row["version"], row["platform"]):
+                yield row
+
+        known_good_versions = self.__get_json(
+            constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL
+        )
+        for row in self.__new_api_rows(known_good_versions["versions"]):
+            if included(row["version"], row["platform"]):
+                yield row
+
+    def __legacy_rows(self, keys: list):
+        """
+        Yield the version matrix rows of old storage keys.
+
+        :param keys: Object keys, e.g. 2.9/chromedriver_linux64.zip.
+        """
+
+        prefix = f"{self.__chromedriver_str}_"
+        for key in keys:
+            version, _, filename = key.partition("/")
+            if not filename.startswith(prefix) or not filename.endswith(self.__zip_ext):
+                continue
+            if not self.__check_if_version_format_is_valid(version):
+                continue
+
+            yield {
+                "version": version,
+                "platform": filename[len(prefix) : -len(self.__zip_ext)],
+                "url": f"{constants.CHROMEDRIVER_STORAGE_URL}/{key}",
+                "source": constants.CHROMEDRIVER_STORAGE_URL,
+                "api": "legacy",
+            }
+
+    def __new_api_rows(self, driver_versions: list):
+        """
+        Yield the version matrix rows of new api manifest entries.
+
+        :param driver_versions: Entries of the known good versions manifest.
+        """
+
+        for driver_version in driver_versions:
+            version = driver_version.get("version")
+            drivers = (driver_version.get("downloads") or {}).get("chromedriver")
+            for driver in drivers or []:
+                yield {
+                    "version": version,
+                    "platform": driver.get("platform"),
+                    "url": driver.get("url"),
+                    "source": constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL,
+                    "api": "new",
+                }
+
+    def sync_manifests(self, root: str = None) -> list:
+        """
+        Append the versions published since the last sync to the local index.
+        Manifests are fetched conditionally, so unchanged manifests are not
+        downloaded again, and only the entries after the ones seen before are
+        processed. Return the new version matrix rows, which are also kept as
+        the delta of the sync for the prefetcher and notifications.
+
+        :param root: Sync directory, defaults to the sync directory in the cache directory.
+        """
+
+        with self.__deadline():
+            with manifest_sync.lock(root):
+                state = manifest_sync.load_state(root)
+                new_rows = []
+
+                for source in [
+                    constants.CHROMEDRIVER_STORAGE_URL,
+                    constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL,
+                ]:
+                    new_rows.extend(self.__sync_source(source, state, root))
+
+                if new_rows:
+                    manifest_sync.append_index(new_rows, root)
+                    manifest_sync.write_delta(new_rows, root)
+                manifest_sync.save_state(state, root)
+
+            # Versions that have been published since are no longer misses
+            if new_rows and self.__negative_cache:
+                self.__negative_cache.discard_versions(
+                    manifest_sync.new_versions(new_rows)
+                )
+
+            return new_rows
+
+    def __sync_source(self, source: str, state: dict, root: str) -> list:
+        """
+        Fetch a manifest if it changed and return its new rows. Updates the state of the source.
+
+        :param source: Manifest URL.
+        :param state: Sync state by source URL.
+        :param root: Sync directory.
+        """
+
+        source_state = state.get(source, {})
+        headers = {}
+        if source_state.get("etag"):
+            headers["If-None-Match"] = source_state["etag"]
+        if source_state.get("last_modified"):
+            headers["If-Modified-Since"] = source_state["last_modified"]
+
+        with self.__span("sync manifest", "manifest", url=source) as args:
+            response = self.__request("GET", source, headers=headers)
+            args["status"] = response.status_code
+            if response.status_code == 304:
+                return []
+            if not response.ok:
+                raise GetChromeDriverError(f"Could not fetch from {source}.")
+
+            # Entries are identified by their key or version
+            if source == constants.CHROMEDRIVER_STORAGE_URL:
+                entries = self.__read_legacy_listing(response).keys
+                entry_ids = entries
+                rows_of = self.__legacy_rows
+            else:
+                entries = response.json()["versions"]
+                entry_ids = [entry.get("version") for entry in entries]
+                rows_of = self.__new_api_rows
+
+            # The manifests only grow, so the entries seen before are a prefix
+            count = source_state.get("count", 0)
+            if 0 < count <= len(entries) and entry_ids[count - 1] == source_state.get(
+                "last"
+            ):
+                new_rows = list(rows_of(entries[count:]))
+            else:
+                indexed = {
+                    (row["version"], row["platform"], row["url"])
+                    for row in manifest_sync.read_index(root)
+                    if row["source"] == source
+                }
+                new_rows = [
+                    row
+                    for row in rows_of(entries)
+                    if (row["version"], row["platform"], row["url"]) not in indexed
+                ]
+            args["new_rows"] = len(new_rows)
+
+        state[source] = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "count": len(entries),
+            "last": entry_ids[-1] if entry_ids else None,
+        }
+
+        return new_rows
+
+    def build_catalog(self, path: str = None) -> int:
+        """
+        Build the catalog file from the manifests. Return the number of versions.
+
+        :param path: Catalog path, defaults to the catalog in the cache directory.
+        """
+
+        return catalog.build(self.version_matrix(), path)
+
+    def export_bundle(self, path: str, versions: list, platforms: list = None) -> dict:
+        """
+        Write an offline bundle for hosts without internet access: one tar file with
+        the manifests, the old storage listing and the driver archives of versions.
+        Return the bundle index.
+
+        :param path: Bundle path.
+        :param versions: Chromedriver versions to include the archives of.
+        :param platforms: Platforms to include, e.g. Platform.linux64 or "mac-arm64",
+            defaults to the platform of this instance.
+        """
+
+        with self.__deadline():
+            with self.__span("export bundle", "api", path=path):
+                listing = self.__get_legacy_listing()
+                known_good_versions = self.__get_json(
+                    constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL
+                )
+                documents = {
+                    constants.CHROMEDRIVER_STORAGE_URL: listing,
+                    constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL: known_good_versions,
+                }
+
+                # The archives are looked up in the manifests that are bundled
+                with self.__serving(documents):
+                    if platforms is None:
+                        urls = [
+                            (version, self.version_url(version)) for version in versions
+                        ]
+                    else:
+                        urls = [
+                            (row["version"], row["url"])
+                            for row in self.version_matrix(platforms=platforms)
+                            if row["version"] in versions
+                        ]
+
+                manifests = {
+                    constants.CHROMEDRIVER_STORAGE_URL: (
+                        "legacy-listing.json",
+                        json.dumps(listing.objects).encode("UTF-8"),
+                    ),
+                    constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL: (
+                        "known-good-versions-with-downloads.json",
+                        json.dumps(known_good_versions).encode("UTF-8"),
+                    ),
+                }
+
+                with tempfile.TemporaryDirectory() as tmp_dir:
+                    archives = []
+                    for version, url in urls:
+                        file_path, _ = self.__download_archive(
+                            url, os.path.join(tmp_dir, version)
+                        )
+                        archives.append(
+                            {"version": version, "url": url, "file": file_path}
+                        )
+
+                    return bundle.write(path, manifests, archives)
+
+    def import_bundle(self, path: str) -> dict:
+        """
+        Load an offline bundle: the catalog is built from its manifests and the
+        archives for the platform of this instance are extracted into the local store,
+        so that lookups and installs of the bundled versions need no network.
+        Return the number of versions in the catalog and the imported versions.
+
+        :param path: Bundle path, from export_bundle().
+        """
+
+        with self.__deadline():
+            with self.__span("import bundle", "api", path=path), bundle.Bundle(
+                path
+            ) as opened:
+                documents = {}
+                for url in [
+                    constants.CHROMEDRIVER_STORAGE_URL,
+                    constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL,
+                ]:
+                    content = opened.manifest(url)
+                    if content is None:
+                        raise BundleError(f"The bundle has no manifest of {url}.")
+                    documents[url] = json.loads(content)
+                documents[constants.CHROMEDRIVER_STORAGE_URL] = (
+                    legacy_listing.LegacyListing(
+                        documents[constants.CHROMEDRIVER_STORAGE_URL]
+                    )
+                )
+
+                # Bundled versions are no longer misses
+                if self.__negative_cache:
+                    self.__negative_cache.discard_versions(
+                        [entry["version"] for entry in opened.index["archives"]]
+                    )
+
+                with self.__serving(documents):
+                    # The catalog is as old as the bundled manifests
+                    catalog_versions = catalog.build(
+                        self.version_matrix(), built_at=opened.index.get("created")
+                    )
+
+                    versions = []
+                    for entry in opened.index["archives"]:
+                        try:
+                            if self.version_url(entry["version"]) != entry["url"]:
+                                continue
+                        except (UnknownVersionError, VersionUrlError):
+                            continue
+
+                        self.__import_archive(opened, entry)
+                        versions.append(entry["version"])
+
+            return {"catalog_versions": catalog_versions, "versions": versions}
+
+    def __import_archive(self, opened: bundle.Bundle, entry: dict):
+        """
+        Extract a bundled archive into the local store, unless the version is in it already.
+
+        :param opened: Opened bundle.
+        :param entry: Archive entry of the bundle index.
+        """
+
+        version = entry["version"]
+        output_path = self._output_path(version)
+
+        with store.lock(version):
+            try:
+                if self.is_downloaded(version):
+                    return
+
+                with self.__span("unbundle", "extract", file=entry["name"]):
+                    file_path = opened.extract_archive(entry, output_path)
+                self.__extract(file_path, os.path.basename(file_path), output_path)
+            finally:
+                store.touch(version)
+
     def download_stable_version(
         self, output_path: str = None, extract: bool = False
     ) -> str:
@@ -230,7 +749,7 @@ class GetChromeDriver:
         :param extract: Extract the downloaded driver or not.
         """
 
-        version = self.__latest_version_by_phase(Phase.stable)
+        version = self.stable_version()
         output_path = self.download_version(
             version=version, output_path=output_path, extract=extract
         )
@@ -247,7 +766,7 @@ class GetChromeDriver:
         :param extract: Extract the downloaded driver or not.
         """
 
-        version = self.__latest_version_by_phase(Phase.beta)
+        version = self.beta_version()
         output_path = self.download_version(
             version=version, output_path=output_path, extract=extract
         )
@@ -265,47 +784,260 @@ class GetChromeDriver:
         :param extract: Extract the downloaded driver or not.
         """
 
-        if not self.__check_if_version_format_is_valid(version):
-            raise UnknownVersionError("Invalid version format.")
+        with self.__deadline():
+            if not self.__check_if_version_format_is_valid(version):
+                raise UnknownVersionError("Invalid version format.")
+
+            return _flights.do(
+                (
+                    "download_version",
+                    self.__configuration,
+                    version,
+                    os.path.abspath(output_path or self._output_path(version)),
+                    extract,
+                ),
+                lambda: self.__download_version_to_store(version, output_path, extract),
+            )
 
-        if not output_path:
-            # On path is None, the driver will be downloaded at e.g. chromedriver/88.0.4324.96/bin/chromedriver.exe
-            output_path = self._output_path(version)
+    def __download_version_to_store(
+        self, version, output_path: str, extract: bool
+    ) -> str:
+        """
+        Download a chromedriver version to output path, or to the local store if not set.
 
-        # e.g. if path == 'webdriver/bin', the driver will be downloaded at 'webdriver/bin/chromedriver.exe'
-        def download(download_url: str):
-            # Download
+        :param version: Chromedriver version.
+        :param output_path: Path to download the driver to.
+        :param extract: Extract the downloaded driver or not.
+        """
+
+        if output_path:
+            return self.__download_version(version, output_path, extract)
+
+        # On path is None, the driver will be downloaded at e.g. chromedriver/88.0.4324.96/bin/chromedriver.exe
+        output_path = self._output_path(version)
+
+        # Hold the store lock so that garbage collection does not evict the version meanwhile
+        with store.lock(version):
             try:
-                file_path, file_name = downloader.download(
-                    url=download_url, output_path=output_path
-                )
-            except (OSError, HTTPError, RequestException) as err:
-                raise DownloadError(err)
+                # Already downloaded and extracted into the local store, e.g. by prefetch
+                if extract and self.is_downloaded(version):
+                    return output_path
 
-            # Extract
-            if extract:
-                with zipfile.ZipFile(file_path, "r") as zip_ref:
-                    zip_ref.extractall(path=output_path)
+                # Kept compressed in the local store since it was last used
+                if extract and self.__decompress(version):
+                    return output_path
 
-                # Remove downloaded zip file
-                os.remove(file_path)
+                return self.__download_version(version, output_path, extract)
+            finally:
+                store.touch(version)
 
-                # Move driver to output dir
-                self.__move_driver_file_to_output_dir(
-                    os_platform=self.__os_platform, output_path=output_path
-                )
+    def __download_version(self, version, output_path: str, extract: bool) -> str:
+        """
+        Download a chromedriver version to output path.
 
-                if (
-                    self.__os_platform == OsPlatform.linux
-                    or self.__os_platform == OsPlatform.mac
-                ):
-                    os.chmod(f"{output_path}/chromedriver", 0o755)
+        :param version: Chromedriver version.
+        :param output_path: Path to download the driver to.
+        :param extract: Extract the downloaded driver or not.
+        """
+
+        if self.__daemon_call(
+            "ensure",
+            version=version,
+            output_path=os.path.abspath(output_path),
+            extract=extract,
+        ):
+            return output_path
 
+        # e.g. if path == 'webdriver/bin', the driver will be downloaded at 'webdriver/bin/chromedriver.exe'
         url = self.version_url(version)
-        download(download_url=url)
+        if extract and self.__use_deltas and self.__install_delta(url, output_path):
+            return output_path
+
+        file_path, file_name = self.__download_archive(url, output_path)
+
+        if extract:
+            self.__extract(file_path, file_name, output_path)
 
         return output_path
 
+    def __download_archive(self, download_url: str, output_path: str) -> tuple:
+        """
+        Download a driver archive. Return its file path and file name.
+
+        :param download_url: Archive URL.
+        :param output_path: Path to download the archive to.
+        """
+
+        try:
+            with self.__span("download", "download", url=download_url), deadline.stage(
+                Stage.download
+            ) as time_left:
+                return downloader.download(
+                    url=download_url,
+                    output_path=output_path,
+                    hedger=self.__hedger,
+                    rate_limiter=self.__rate_limiter,
+                    time_left=time_left,
+                    transport=self.__transport,
+                )
+        except (OSError, HTTPError, RequestException) as err:
+            raise DownloadError(err)
+
+    def __install_delta(self, url: str, output_path: str) -> bool:
+        """
+        Install the driver of an archive by patching the driver of an older version in
+        the local store with a delta from the mirror, the newest older version first.
+        Return False if there is no delta for a stored driver or it fails to apply or
+        verify, the archive is downloaded then.
+
+        :param url: Archive URL.
+        :param output_path: Path to install the driver to.
+        """
+
+        if not delta.is_available():
+            return False
+
+        try:
+            response = self.__request("GET", delta.index_url(url))
+            if not response.ok:
+                return False
+            index = response.json()
+            if index.get("format") != constants.DELTA_FORMAT:
+                return False
+            sources = sorted(
+                (
+                    source_version
+                    for source_version in index.get("deltas", {})
+                    if catalog.pack_version(source_version) is not None
+                    and self.is_downloaded(source_version)
+                ),
+                key=catalog.pack_version,
+                reverse=True,
+            )
+        except (RequestException, ValueError, AttributeError):
+            return False
+
+        for source_version in sources:
+            try:
+                self.__apply_delta(url, output_path, index, source_version)
+                return True
+            except (DownloadError, DeltaError, OSError, KeyError):
+                continue
+
+        return False
+
+    def __apply_delta(self, url: str, output_path: str, index: dict, source_version):
+        """
+        Patch the driver of an older version in the local store with its delta and
+        install the result once its SHA-256 and size match the index.
+
+        :param url: Archive URL.
+        :param output_path: Path to install the driver to.
+        :param index: Delta index of the archive.
+        :param source_version: Older version.
+        """
+
+        driver_filename = self.driver_filename()
+        with open(
+            os.path.join(self._output_path(source_version), driver_filename), "rb"
+        ) as file:
+            source = file.read()
+        if (
+            hashlib.sha256(source).hexdigest()
+            != index["deltas"][source_version]["sha256"]
+        ):
+            raise DeltaError(f"The stored driver of {source_version} was changed.")
+
+        file_path, _ = self.__download_archive(
+            delta.delta_url(url, source_version), output_path
+        )
+        try:
+            with self.__span("patch", "extract", source_version=source_version):
+                with open(file_path, "rb") as file:
+                    driver = delta.patch(source, file.read())
+        finally:
+            os.remove(file_path)
+
+        if (
+            len(driver) != index["size"]
+            or hashlib.sha256(driver).hexdigest() != index["sha256"]
+        ):
+            raise DeltaError(f"The patched driver does not match {url}.")
+
+        with self.__span("move and chmod", "install", path=output_path):
+            driver_path = os.path.join(output_path, driver_filename)
+            tmp_path = f"{driver_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as file:
+                file.write(driver)
+            if (
+                self.__os_platform == OsPlatform.linux
+                or self.__os_platform == OsPlatform.mac
+            ):
+                os.chmod(tmp_path, 0o755)
+            os.replace(tmp_path, driver_path)
+
+    def __extract(self, file_path: str, file_name: str, output_path: str):
+        """
+        Extract a driver archive and remove it, the driver ends up in output path.
+
+        :param file_path: Archive path.
+        :param file_name: Archive file name.
+        :param output_path: Path to extract the driver to.
+        """
+
+        with self.__span("unzip", "extract", file=file_name):
+            with zipfile.ZipFile(file_path, "r") as zip_ref:
+                zip_ref.extractall(path=output_path)
+
+            # Remove downloaded zip file
+            os.remove(file_path)
+
+        with self.__span("move and chmod", "install", path=output_path):
+            # Move driver to output dir
+            self.__move_driver_file_to_output_dir(
+                os_platform=self.__os_platform, output_path=output_path
+            )
+
+            if (
+                self.__os_platform == OsPlatform.linux
+                or self.__os_platform == OsPlatform.mac
+            ):
+                os.chmod(f"{output_path}/chromedriver", 0o755)
+
+    def __decompress(self, version: str) -> bool:
+        """
+        Extract a version kept compressed in the local store. Return False if it is
+        not compressed or does not extract, it is downloaded again then.
+
+        :param version: Chromedriver version.
+        """
+
+        path = store.compressed_path(version)
+        if not path:
+            return False
+
+        with self.__span(
+            "decompress", "extract", file=path, size=os.path.getsize(path)
+        ) as args:
+            try:
+                args["seconds"] = store.decompress(version)
+            except (OSError, tarfile.TarError) as err:
+                args["error"] = str(err)
+                return False
+
+        return self.is_downloaded(version)
+
+    def is_downloaded(self, version: str) -> bool:
+        """
+        Return True if the extracted driver of a version is in the local store.
+
+        :param version: Chromedriver version.
+        """
+
+        return os.path.isfile(
+            os.path.join(self._output_path(version), self.driver_filename())
+        )
+
     def __move_driver_file_to_output_dir(
         self, os_platform: OsPlatform, output_path: str
     ):
@@ -391,7 +1123,17 @@ class GetChromeDriver:
         :param url: The driver download URL.
         """
 
-        if requests.head(url).status_code != 200:
+        # Offline, the URLs of the cached manifests are trusted
+        if self.__offline:
+            return True
+
+        with self.__span("probe url", "probe", url=url):
+            status_code = self.__request("HEAD", url, stage=Stage.probe).status_code
+
+        # An unavailable server does not tell whether the URL exists
+        if status_code in constants.RETRY_STATUSES or status_code >= 500:
+            raise GetChromeDriverError(f"Could not probe {url}.")
+        if status_code != 200:
             return False
 
         return True
@@ -425,11 +1167,93 @@ class GetChromeDriver:
     def matching_version(self, chromium: bool = False) -> str:
         """
         Return a matching ChromeDriver version.
+
+        :param chromium: Match the installed Chromium version instead of Chrome.
+        """
+
+        with self.__deadline():
+            return _flights.do(
+                ("matching_version", self.__configuration, chromium),
+                lambda: self.__matching_version(chromium),
+            )
+
+    def __matching_version(self, chromium: bool) -> str:
+        """
+        Return a matching ChromeDriver version, without coalescing.
+
+        :param chromium: Match the installed Chromium version instead of Chrome.
+        """
+
+        version = self.__daemon_call("matching_version", chromium=chromium)
+        if version:
+            return version
+
+        with self.__manifests_ahead():
+            # The manifests are fetched while the browser version is detected
+            self.__fetch_manifests_ahead()
+
+            with self.__span(
+                "detect browser version", "subprocess", chromium=chromium
+            ), deadline.stage(Stage.detect) as time_left:
+                installed_chrome_version = self.__get_installed_chrome_version(
+                    chromium=chromium, timeout=time_left()
+                )
+
+            return _flights.do(
+                ("version_matching", self.__configuration, installed_chrome_version),
+                lambda: self.__version_matching(installed_chrome_version),
+            )
+
+    def __version_matching(self, installed_chrome_version: str) -> str:
+        """
+        Return the ChromeDriver version matching a browser version.
+        Browser versions without a match are remembered in the negative cache.
+
+        :param installed_chrome_version: Chrome or Chromium version.
         """
 
-        all_chromedriver_versions = self.__get_all_chromedriver_versions()
-        installed_chrome_version = self.__get_installed_chrome_version(
-            chromium=chromium
+        return self.__unless_known_miss(
+            f"matching_version/{installed_chrome_version}",
+            installed_chrome_version,
+            UnknownVersionError,
+            lambda: self.__find_version_matching(installed_chrome_version),
+        )
+
+    def __find_version_matching(self, installed_chrome_version: str) -> str:
+        """
+        Return the ChromeDriver version matching a browser version from the catalog or the manifests.
+
+        :param installed_chrome_version: Chrome or Chromium version.
+        """
+
+        # Offline, a stored version installs even when the catalog knows a newer one
+        if self.__offline:
+            version = self.__stored_version_matching(installed_chrome_version)
+            if version:
+                return version
+
+        driver_catalog = self.__catalog()
+        if driver_catalog:
+            version = driver_catalog.latest_matching(installed_chrome_version)
+            if version:
+                return version
+
+        if self.__offline:
+            version = self.__indexed_version_matching(installed_chrome_version)
+            if version:
+                return version
+
+        known_good_error = None
+        try:
+            known_good_versions = self.__get_json(
+                constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL
+            )
+        except GetChromeDriverError as err:
+            # The old storage can still have a match
+            known_good_versions, known_good_error = {"versions": []}, err
+
+        all_chromedriver_versions = self.__get_all_chromedriver_versions(
+            known_good_versions
         )
 
         for chromedriver_version in reversed(all_chromedriver_versions):
@@ -438,6 +1262,10 @@ class GetChromeDriver:
             ):
                 return chromedriver_version
 
+        # Without the known good versions the version is not known to be missing
+        if known_good_error is not None:
+            raise known_good_error
+
         raise UnknownVersionError("Could not find matching version.")
 
     def auto_download(
@@ -451,78 +1279,531 @@ class GetChromeDriver:
         :param chromium: Look for the installed Chromium version instead of Chrome.
         """
 
-        version = self.matching_version(chromium=chromium)
-        if not version:
-            name = "Chrome" if not chromium else "Chromium"
-            raise VersionError(
-                f"Unable to find a ChromeDriver version for the installed {name} version."
+        with self.__deadline():
+            with self.__span("auto_download", "api"), self.__manifests_ahead():
+                version = self.matching_version(chromium=chromium)
+                if not version:
+                    name = "Chrome" if not chromium else "Chromium"
+                    raise VersionError(
+                        f"Unable to find a ChromeDriver version for the installed {name} version."
+                    )
+
+                output_path = self.download_version(version, output_path, extract)
+
+            return output_path
+
+    def installed_browsers(self) -> list:
+        """
+        Return every installed Chrome and Chromium variant with its version.
+        Supported on Linux and macOS.
+        """
+
+        with self.__span("discover browsers", "subprocess"):
+            return browsers.discover(self.__os_platform)
+
+    def download_for_browsers(
+        self, installed_browsers: list = None, extract: bool = True
+    ) -> dict:
+        """
+        Download the matching driver of every installed browser in parallel.
+        Return the driver output path by browser executable path under "paths" and the
+        error by browser executable path under "errors", a failed browser does not stop
+        the others.
+
+        :param installed_browsers: Browsers from installed_browsers(), discovered if not set.
+        :param extract: Extract the downloaded drivers or not.
+        """
+
+        downloads = {"paths": {}, "errors": {}}
+        if installed_browsers is None:
+            installed_browsers = self.installed_browsers()
+        if not installed_browsers:
+            return downloads
+
+        def download(browser) -> str:
+            version = _flights.do(
+                ("version_matching", self.__configuration, browser.version),
+                lambda: self.__version_matching(browser.version),
             )
+            return self.download_version(version, extract=extract)
 
-        output_path = self.download_version(version, output_path, extract)
+        # The downloads share the deadline of the caller
+        with ThreadPoolExecutor(max_workers=len(installed_browsers)) as executor:
+            futures = {
+                browser.path: executor.submit(
+                    contextvars.copy_context().run, download, browser
+                )
+                for browser in installed_browsers
+            }
 
-        return output_path
+        for path, future in futures.items():
+            try:
+                downloads["paths"][path] = future.result()
+            except GetChromeDriverError as err:
+                downloads["errors"][path] = str(err)
+
+        return downloads
 
-    def install(self, output_path: str = None) -> str:
+    def install(self, output_path: str = None, chromium: bool = False) -> str:
         """Install ChromeDriver for the installed Chrome version on machine"""
 
-        if output_path:
-            self.auto_download(output_path=output_path, extract=True)
-        else:
-            output_path = self.auto_download(extract=True)
+        with self.__deadline():
+            with self.__span("install", "api"):
+                # A driver installed by the watcher for the installed browser needs no resolution
+                watched = (
+                    None
+                    if output_path
+                    else watch.current(self.__os_platform, chromium, self.__arch)
+                )
+                if watched:
+                    output_path = watched
+
+                    # The watched version is in use, keep it from being collected
+                    version_dir = os.path.dirname(watched)
+                    store.touch(
+                        os.path.basename(version_dir), os.path.dirname(version_dir)
+                    )
+                elif output_path:
+                    self.auto_download(
+                        output_path=output_path, extract=True, chromium=chromium
+                    )
+                else:
+                    output_path = self.auto_download(extract=True, chromium=chromium)
 
-        os.environ["PATH"] += os.pathsep + output_path
+            if not os.path.isabs(output_path):
+                output_path = os.path.join(os.path.abspath(os.getcwd()), output_path)
 
-        if not os.path.isabs(output_path):
-            output_path = os.path.join(os.path.abspath(os.getcwd()), output_path)
+            add_to_path(output_path)
 
-        output_path = output_path.replace(os.sep, "/")
+            # Keep the store within the budget set through the environment, if any
+            store.collect_garbage_from_env()
+            store.compress_idle_from_env()
 
-        return output_path
+            output_path = output_path.replace(os.sep, "/")
 
-    @staticmethod
-    def __get_all_chromedriver_versions() -> list:
-        """Return a list with all ChromeDriver versions"""
+            return output_path
 
-        # Get versions from old storage
-        key_texts = []
-        old_storage_versions = []
+    def __unless_known_miss(self, key: str, version: str, error_class, find):
+        """
+        Return the result of find, or fail at once if the lookup is a known miss.
+        A lookup that fails with error_class is recorded as a miss. Lookups only raise
+        it once every manifest was fetched, failed fetches are not misses.
+
+        :param key: Lookup key.
+        :param version: Version the lookup is for.
+        :param error_class: Exception raised when there is nothing to find.
+        :param find: Function doing the lookup.
+        """
 
-        with urlopen(constants.CHROMEDRIVER_STORAGE_URL) as xml_file:
-            tree = ElTree.parse(xml_file)
-            root = tree.getroot()
+        if not self.__negative_cache:
+            return find()
 
-            for root_item in root:
-                # Remove namespace
-                root_item.tag = root_item.tag.split("}", 1)[1]
+        message = self.__negative_cache.get(key)
+        if message:
+            raise error_class(message)
 
-            for content in root.findall("Contents"):
-                for content_item in content:
-                    # Remove namespace
-                    content_item.tag = content_item.tag.split("}", 1)[1]
+        try:
+            return find()
+        except error_class as err:
+            self.__negative_cache.add(key, version, str(err))
+            raise
 
-                    key_texts.append(content.find("Key").text)
+    def __cached(self, url: str, fetch):
+        """
+        Return a fetched document. Documents are kept in memory for manifest_ttl
+        seconds, concurrent fetches of the same document are coalesced.
 
-        for text in key_texts:
-            version = ""
-            for char in text:
-                if char.isnumeric() or char == ".":
-                    version += char
-                else:
-                    break
+        :param url: Document URL.
+        :param fetch: Function fetching the document.
+        """
 
-            if len(version) < 1:
-                continue
+        ahead = _ahead.get()
+        if ahead is not None and url in ahead.futures:
+            return ahead.futures[url].result()
+
+        with self.__lock:
+            cached = self.__manifest_cache.get(url)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        def fetch_and_keep():
+            document = fetch()
+            if self.__manifest_ttl > 0:
+                with self.__lock:
+                    self.__manifest_cache[url] = (
+                        time.monotonic() + self.__manifest_ttl,
+                        document,
+                    )
+            return document
+
+        return _flights.do(
+            ("manifest", self.__configuration, id(self.__manifest_cache), url),
+            fetch_and_keep,
+        )
+
+    @contextlib.contextmanager
+    def __manifests_ahead(self):
+        """
+        Share the manifests fetched ahead of time in the with block with all its steps.
+        Inside a block that already shares them, that block's fetches are used.
+        """
+
+        if _ahead.get() is not None:
+            yield
+            return
+
+        ahead = _Ahead()
+        token = _ahead.set(ahead)
+        try:
+            yield
+        finally:
+            _ahead.reset(token)
+            ahead.cancel()
+
+    @contextlib.contextmanager
+    def __serving(self, documents: dict):
+        """
+        Serve documents instead of fetching them in the with block.
+
+        :param documents: Documents by URL.
+        """
+
+        served = _Ahead()
+        for url, document in documents.items():
+            served.futures[url] = Future()
+            served.futures[url].set_result(document)
+
+        token = _ahead.set(served)
+        try:
+            yield
+        finally:
+            _ahead.reset(token)
+
+    def __fetch_manifests_ahead(self):
+        """
+        Start fetching the manifests a version lookup needs in the background,
+        unless the catalog answers lookups or they are fetched already.
+        """
+
+        ahead = _ahead.get()
+        if ahead is None or ahead.futures or self.__offline or self.__catalog():
+            return
+
+        fetches = {
+            constants.CHROMEDRIVER_STORAGE_URL: self.__get_legacy_listing,
+            constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL: lambda: self.__get_json(
+                constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL
+            ),
+        }
+
+        # The fetches stop once the call no longer needs them, e.g. when it failed
+        ahead.deadline = (deadline.current() or deadline.Deadline()).fork()
+
+        executor = ThreadPoolExecutor(max_workers=len(fetches))
+        for url, fetch in fetches.items():
+            # Each fetch runs in its own copy of the context
+            ahead.futures[url] = executor.submit(
+                contextvars.copy_context().run, _behind, ahead.deadline, fetch
+            )
+        executor.shutdown(wait=False)
+
+    def __get_json(self, url: str):
+        """
+        Fetch and parse a JSON document.
+
+        :param url: Document URL.
+        """
+
+        def fetch():
+            with self.__span("fetch manifest", "manifest", url=url):
+                response = self.__request("GET", url)
+                if not response.ok:
+                    raise GetChromeDriverError(f"Could not fetch from {url}.")
+                return response.json()
+
+        return self.__cached(url, fetch)
+
+    def __request(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        stage: Stage = Stage.metadata,
+    ):
+        """
+        Send a metadata request, hedged if a hedger is set.
+        Throttled and failed requests are retried with backoff, within the time of the stage.
+
+        :param method: HTTP method.
+        :param url: URL.
+        :param headers: Request headers.
+        :param stage: Stage the request belongs to.
+        """
+
+        with deadline.stage(stage) as time_left:
+
+            def request():
+                timeout = time_left()
+                if self.__hedger:
+                    return self.__hedger.request(
+                        method,
+                        url,
+                        session=self.__transport,
+                        headers=headers,
+                        timeout=timeout,
+                    )
+                return self.__transport.request(
+                    method, url, headers=headers, timeout=timeout
+                )
+
+            with self.__span(method, "http", url=url) as args:
+                response = rate_limit.send(
+                    request,
+                    url,
+                    rate_limiter=self.__rate_limiter,
+                    time_left=time_left,
+                )
+                args["status"] = response.status_code
+
+        return response
+
+    def __deadline(self):
+        """
+        Return the deadline scope of a call. Calls made inside another call share its deadline.
+        """
+
+        return deadline.scope(self.__timeout, self.__stage_timeouts)
+
+    def __span(self, name: str, category: str, **args):
+        """
+        Return a span of the tracer, which records nothing if there is no tracer.
+
+        :param name: Span name.
+        :param category: Span category.
+        :param args: Arguments shown with the span.
+        """
+
+        return tracing.span(self.__tracer, name, category, **args)
+
+    def __get_legacy_storage_keys(self) -> list:
+        """
+        Return the object keys of the old chromedriver storage.
+        """
+
+        return self.__get_legacy_listing().keys
+
+    def __get_legacy_listing(self) -> legacy_listing.LegacyListing:
+        """
+        Return the listing of the old chromedriver storage.
+        """
+
+        return self.__cached(
+            constants.CHROMEDRIVER_STORAGE_URL, self.__fetch_legacy_listing
+        )
+
+    def __fetch_legacy_listing(self) -> legacy_listing.LegacyListing:
+        """
+        Fetch the listing of the old chromedriver storage.
+        """
+
+        url = constants.CHROMEDRIVER_STORAGE_URL
+
+        with self.__span("fetch legacy listing", "manifest", url=url):
+            response = self.__request("GET", url)
+        if not response.ok:
+            raise GetChromeDriverError(f"Could not fetch from {url}.")
+
+        return self.__read_legacy_listing(response)
+
+    def __read_legacy_listing(self, response) -> legacy_listing.LegacyListing:
+        """
+        Parse the listing of the old chromedriver storage. The listing is paginated,
+        the pages after the first are fetched until the last one.
+
+        :param response: Response with the first page of the listing.
+        """
+
+        objects = []
+        marker = None
+        while True:
+            with self.__span("parse legacy listing", "parse") as args:
+                page, next_marker = legacy_listing.parse_page(response.content)
+                args["keys"] = len(page)
+            objects.extend(page)
+
+            if next_marker is None:
+                return legacy_listing.LegacyListing(objects)
+
+            # A marker that does not advance would fetch the same page forever
+            if next_marker == marker:
+                raise GetChromeDriverError(
+                    f"The listing of {constants.CHROMEDRIVER_STORAGE_URL} does not advance."
+                )
+            marker = next_marker
+
+            url = legacy_listing.page_url(marker)
+            with self.__span("fetch legacy listing", "manifest", url=url):
+                response = self.__request("GET", url)
+            if not response.ok:
+                raise GetChromeDriverError(f"Could not fetch from {url}.")
+
+    def __catalog(self):
+        """
+        Return the opened catalog, or None if not used, not built or stale while online.
+        """
+
+        if not self.__use_catalog:
+            return None
+
+        driver_catalog = catalog.load()
+        if (
+            driver_catalog
+            and not self.__offline
+            and self.__catalog_max_age is not None
+            and driver_catalog.age() > self.__catalog_max_age
+        ):
+            return None
+
+        return driver_catalog
+
+    def __catalog_url(self, version: str) -> str:
+        """
+        Return the version download URL from the catalog, or None.
+
+        :param version: Chromedriver version.
+        """
+
+        driver_catalog = self.__catalog()
+        if not driver_catalog:
+            return None
+
+        for platform in self.__platforms():
+            url = driver_catalog.url(version, platform.value)
+            if url:
+                return url
+
+        return None
+
+    def __indexed_url(self, version: str) -> str:
+        """
+        Return the version download URL from the sync index, or None.
+
+        :param version: Chromedriver version.
+        """
+
+        platforms = [platform.value for platform in self.__platforms()]
+        urls = {
+            row["platform"]: row["url"]
+            for row in manifest_sync.read_index()
+            if row.get("version") == version and row.get("platform") in platforms
+        }
+
+        for platform in platforms:
+            if urls.get(platform):
+                return urls[platform]
+
+        return None
+
+    def __stored_version_matching(self, installed_chrome_version: str) -> str:
+        """
+        Return the newest version matching a browser version in the local store, or None.
+
+        :param installed_chrome_version: Chrome or Chromium version.
+        """
+
+        return _newest_matching(
+            installed_chrome_version,
+            (stored_version.version for stored_version in store.versions(sizes=False)),
+        )
+
+    def __indexed_version_matching(self, installed_chrome_version: str) -> str:
+        """
+        Return the newest version matching a browser version in the sync index, or None.
+
+        :param installed_chrome_version: Chrome or Chromium version.
+        """
+
+        platforms = [platform.value for platform in self.__platforms()]
+
+        return _newest_matching(
+            installed_chrome_version,
+            (
+                row["version"]
+                for row in manifest_sync.read_index()
+                if row.get("platform") in platforms
+            ),
+        )
+
+    def __platforms(self) -> list:
+        """
+        Return the platforms of the OS platform and architecture, preferred first.
+        """
+
+        if self.__os_platform == OsPlatform.win:
+            if self.__arch == 64:
+                return [Platform.win64, Platform.win32]
+            return [Platform.win32]
+
+        if self.__os_platform == OsPlatform.linux:
+            if self.__arch == 64:
+                return [Platform.linux64, Platform.linux32]
+            return [Platform.linux32]
+
+        if self.__os_platform == OsPlatform.mac:
+            if pl.processor() == "arm":
+                return [Platform.mac_arm64, Platform.mac64]
+            return [Platform.mac_x64, Platform.mac64]
 
-            old_storage_versions.append(version)
+        return []
 
-        old_storage_versions = list(dict.fromkeys(old_storage_versions))
+    def __daemon_call(self, action: str, **params):
+        """
+        Return the result of an action from the resolver daemon.
+        Return None if the daemon is not used or not running.
+
+        :param action: Action name.
+        :param params: Action parameters.
+        """
+
+        if not self.__use_daemon:
+            return None
+
+        try:
+            return daemon.call(action, os_platform=self.__os_platform.value, **params)
+        except DaemonUnavailableError:
+            return None
+
+    def __get_all_chromedriver_versions(self, known_good_versions: dict) -> list:
+        """
+        Return a list with all ChromeDriver versions.
+
+        :param known_good_versions: The known good versions manifest.
+        """
+
+        # Get versions from old storage
+        old_storage_versions = []
+
+        legacy_storage_keys = self.__get_legacy_storage_keys()
+        with self.__span("parse legacy versions", "parse"):
+            for text in legacy_storage_keys:
+                version = ""
+                for char in text:
+                    if char.isnumeric() or char == ".":
+                        version += char
+                    else:
+                        break
+
+                if len(version) < 1:
+                    continue
+
+                old_storage_versions.append(version)
+
+            old_storage_versions = list(dict.fromkeys(old_storage_versions))
 
         # Get versions from new storage
         new_storage_versions = []
-        response = requests.get(constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL)
-        if response.ok:
-            for version in response.json()["versions"]:
-                new_storage_versions.append(version["version"])
+        for version in known_good_versions["versions"]:
+            new_storage_versions.append(version["version"])
 
         new_storage_versions = list(dict.fromkeys(new_storage_versions))
 
@@ -533,11 +1814,14 @@ class GetChromeDriver:
 
         return sorted_versions
 
-    def __get_installed_chrome_version(self, chromium: bool = False) -> str:
+    def __get_installed_chrome_version(
+        self, chromium: bool = False, timeout: float = None
+    ) -> str:
         """
         Return the installed Chrome version on the machine.
 
         :param chromium: Return the installed Chromium version instead.
+        :param timeout: Seconds the browser may take to report its version.
         """
 
         if self.__os_platform == OsPlatform.win:
@@ -563,7 +1847,7 @@ class GetChromeDriver:
                 stderr=subprocess.DEVNULL,
                 stdin=subprocess.DEVNULL,
             )
-            version = process.communicate()[0].decode("UTF-8").split()[-1]
+            version = _communicate(process, timeout).decode("UTF-8").split()[-1]
 
             return version
 
@@ -576,7 +1860,7 @@ class GetChromeDriver:
                     stdin=subprocess.DEVNULL,
                 )
 
-                return process.communicate()[0].decode("UTF-8").split()[1]
+                return _communicate(process, timeout).decode("UTF-8").split()[1]
             else:
                 process = subprocess.Popen(
                     args=["google-chrome", "--version"],
@@ -585,7 +1869,7 @@ class GetChromeDriver:
                     stdin=subprocess.DEVNULL,
                 )
 
-                return process.communicate()[0].decode("UTF-8").split()[-1]
+                return _communicate(process, timeout).decode("UTF-8").split()[-1]
 
         elif self.__os_platform == OsPlatform.mac:
             if chromium:
@@ -605,7 +1889,7 @@ class GetChromeDriver:
                 stdin=subprocess.DEVNULL,
             )
 
-            return process.communicate()[0].decode("UTF-8").split()[-1]
+            return _communicate(process, timeout).decode("UTF-8").split()[-1]
 
         raise UnknownVersionError("Could not find installed version.")
 
@@ -616,4 +1900,97 @@ class GetChromeDriver:
         :param version: Chromedriver version.
         """
 
-        return f"chromedriver/{version}/bin"
+        return f"{store.version_dir(version)}/bin"
+
+
+def add_to_path(path: str):
+    """
+    Add a directory to PATH unless it is already on it.
+
+    :param path: Directory path.
+    """
+
+    with _path_lock:
+        current = os.environ.get("PATH", "")
+        if path in current.split(os.pathsep):
+            return
+        os.environ["PATH"] = f"{current}{os.pathsep}{path}" if current else path
+
+
+def is_offline() -> bool:
+    """
+    Return True if offline mode has been set through the environment.
+    """
+
+    value = os.getenv(constants.OFFLINE_ENV, "0").strip().lower()
+
+    return value not in ("", "0", "false", "no", "off")
+
+
+def _newest_matching(installed_chrome_version: str, versions) -> str:
+    """
+    Return the newest of the versions with the build of a browser version, or None.
+
+    :param installed_chrome_version: Chrome or Chromium version.
+    :param versions: ChromeDriver versions.
+    """
+
+    build = ".".join(installed_chrome_version.split(".")[:-1])
+    matching = [
+        version
+        for version in versions
+        if ".".join(version.split(".")[:-1]) == build
+        and catalog.pack_version(version) is not None
+    ]
+
+    return max(matching, key=catalog.pack_version, default=None)
+
+
+def _communicate(process: subprocess.Popen, timeout: float = None) -> bytes:
+    """
+    Return the output of a process. The process is killed if it does not finish in time.
+
+    :param process: Process.
+    :param timeout: Seconds to wait, None waits until it finishes.
+    """
+
+    try:
+        return process.communicate(timeout=timeout)[0]
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.communicate()
+        raise
+
+
+class _Ahead:
+    """
+    Manifest fetches started ahead of time in a call, by URL, and their deadline.
+    """
+
+    def __init__(self):
+        self.futures = {}
+        self.deadline = None
+
+    def cancel(self):
+        """
+        Stop the fetches, those that already started stop at their next request.
+        """
+
+        for future in self.futures.values():
+            future.cancel()
+        if self.deadline:
+            self.deadline.cancel()
+
+
+def _behind(fetch_deadline: deadline.Deadline, fetch):
+    """
+    Return the result of a fetch started ahead of time. The fetch does its own
+    lookups instead of waiting for the fetches started ahead, its own included.
+
+    :param fetch_deadline: Deadline of the fetch.
+    :param fetch: Function fetching a document.
+    """
+
+    _ahead.set(None)
+    with deadline.use(fetch_deadline):
+        return fetch()
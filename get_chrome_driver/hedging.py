@@ -0,0 +1,227 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+from requests.exceptions import RequestException
+
+from get_chrome_driver import constants
+
+
+class Hedger:
+    """
+    Send a second, hedged request when the first one is slow to respond.
+    The first final response wins and the other response is closed.
+    """
+
+    def __init__(
+        self,
+        delay: float = None,
+        percentile: float = constants.HEDGE_PERCENTILE,
+        max_hedge_rate: float = constants.HEDGE_MAX_RATE,
+        mirrors: dict = None,
+    ):
+        """
+        :param delay: Seconds to wait before hedging, None adapts it to the observed latencies.
+        :param percentile: Latency percentile used as adaptive delay.
+        :param max_hedge_rate: Maximum fraction of requests that may be hedged.
+        :param mirrors: URL prefixes mapped to mirror prefixes, hedged requests go to the mirror.
+        """
+
+        self.__delay = delay
+        self.__percentile = percentile
+        self.__max_hedge_rate = max_hedge_rate
+        self.__mirrors = mirrors or {}
+        self.__latencies = deque(maxlen=constants.HEDGE_LATENCY_WINDOW)
+        self.__lock = threading.Lock()
+        self.__metrics = {
+            "requests": 0,
+            "hedged": 0,
+            "primary_wins": 0,
+            "hedge_wins": 0,
+            "failures": 0,
+        }
+
+    def get(self, url: str, session: requests.Session = None, **kwargs):
+        """
+        Send a hedged GET request.
+
+        :param url: URL.
+        :param session: Session or transport to send the requests with.
+        :param kwargs: Arguments passed on to requests.
+        """
+
+        return self.request("GET", url, session=session, **kwargs)
+
+    def head(self, url: str, session: requests.Session = None, **kwargs):
+        """
+        Send a hedged HEAD request.
+
+        :param url: URL.
+        :param session: Session or transport to send the requests with.
+        :param kwargs: Arguments passed on to requests.
+        """
+
+        return self.request("HEAD", url, session=session, **kwargs)
+
+    def request(
+        self, method: str, url: str, session: requests.Session = None, **kwargs
+    ):
+        """
+        Send a hedged request. Responses are streamed, so that the losing
+        request can be dropped before its body is transferred.
+
+        :param method: HTTP method.
+        :param url: URL.
+        :param session: Session or transport to send the requests with.
+        :param kwargs: Arguments passed on to requests.
+        """
+
+        kwargs["stream"] = True
+        sender = session or requests
+        executor = ThreadPoolExecutor(max_workers=2)
+        start = time.monotonic()
+
+        primary = executor.submit(sender.request, method, url, **kwargs)
+        attempts = {primary: False}
+        with self.__lock:
+            self.__metrics["requests"] += 1
+
+        done, _ = wait([primary], timeout=self.delay())
+        if not done and self.__take_hedge():
+            hedge = executor.submit(
+                sender.request, method, self.__hedge_url(url), **kwargs
+            )
+            attempts[hedge] = True
+
+        executor.shutdown(wait=False)
+
+        winner = None
+        last_response = None
+        last_error = None
+        pending = set(attempts)
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except RequestException as err:
+                    last_error = err
+                    continue
+
+                if winner is None and _is_final(response):
+                    winner = future
+                    self.__record(time.monotonic() - start, hedged=attempts[future])
+                else:
+                    if last_response is not None:
+                        last_response.close()
+                    last_response = response
+
+        # Cancel the losing request
+        for future in pending:
+            if not future.cancel():
+                future.add_done_callback(_close_response)
+
+        if winner is not None:
+            if last_response is not None:
+                last_response.close()
+            return winner.result()
+
+        with self.__lock:
+            self.__metrics["failures"] += 1
+
+        if last_response is not None:
+            return last_response
+        raise last_error
+
+    def delay(self) -> float:
+        """
+        Return the seconds to wait before hedging.
+        """
+
+        if self.__delay is not None:
+            return self.__delay
+
+        with self.__lock:
+            latencies = sorted(self.__latencies)
+
+        if len(latencies) < constants.HEDGE_MIN_SAMPLES:
+            return constants.HEDGE_INITIAL_DELAY
+
+        index = min(len(latencies) - 1, int(len(latencies) * self.__percentile / 100))
+
+        return max(constants.HEDGE_MIN_DELAY, latencies[index])
+
+    def metrics(self) -> dict:
+        """
+        Return the request, hedge and win counts and the current hedge delay.
+        """
+
+        with self.__lock:
+            metrics = dict(self.__metrics)
+        metrics["delay"] = self.delay()
+
+        return metrics
+
+    def __take_hedge(self) -> bool:
+        """
+        Return True and count a hedge if the hedge rate allows one more,
+        counting the hedge itself, so that a low rate never hedges the first request.
+        """
+
+        with self.__lock:
+            hedged = self.__metrics["hedged"]
+            if hedged + 1 > self.__max_hedge_rate * self.__metrics["requests"]:
+                return False
+            self.__metrics["hedged"] = hedged + 1
+
+        return True
+
+    def __hedge_url(self, url: str) -> str:
+        """
+        Return the URL of the hedged request, on a mirror if one is configured.
+
+        :param url: URL of the first request.
+        """
+
+        for prefix, mirror in self.__mirrors.items():
+            if url.startswith(prefix):
+                return mirror + url[len(prefix) :]
+
+        return url
+
+    def __record(self, latency: float, hedged: bool):
+        """
+        Record the latency and winner of a request.
+
+        :param latency: Seconds until the winning response.
+        :param hedged: The hedged request won.
+        """
+
+        with self.__lock:
+            self.__latencies.append(latency)
+            self.__metrics["hedge_wins" if hedged else "primary_wins"] += 1
+
+
+def _is_final(response) -> bool:
+    """
+    Return True if the response is an answer worth returning, not a server error.
+
+    :param response: Response.
+    """
+
+    return response.status_code < 500 and response.status_code != 429
+
+
+def _close_response(future):
+    """
+    Close the response of a request that lost.
+
+    :param future: Finished request.
+    """
+
+    try:
+        future.result().close()
+    except RequestException:
+        pass
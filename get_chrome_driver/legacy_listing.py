@@ -0,0 +1,154 @@
+import xml.etree.ElementTree as ElTree
+from typing import NamedTuple
+from urllib.parse import quote
+
+from get_chrome_driver import constants
+
+
+class Archive(NamedTuple):
+    key: str
+    version: str
+    platform: str
+    url: str
+    size: int
+    etag: str
+
+
+class LegacyListing:
+    """
+    Objects of the old chromedriver storage listing, indexed by version and platform.
+    Archives are looked up in the listing, without requests to the storage.
+    """
+
+    def __init__(self, objects: list):
+        """
+        :param objects: (key, size, etag) tuples of the listing, in listing order.
+        """
+
+        self.__objects = [tuple(item) for item in objects]
+        self.__keys = [key for key, _, _ in self.__objects]
+        self.__archives = {}
+
+        # Keys of archives look like 2.9/chromedriver_linux64.zip
+        prefix = "chromedriver_"
+        suffix = ".zip"
+        for key, size, etag in self.__objects:
+            version, _, filename = key.partition("/")
+            if not filename.startswith(prefix) or not filename.endswith(suffix):
+                continue
+
+            platform = filename[len(prefix) : -len(suffix)]
+            self.__archives.setdefault(version, {})[platform] = Archive(
+                key=key,
+                version=version,
+                platform=platform,
+                url=f"{constants.CHROMEDRIVER_STORAGE_URL}/{key}",
+                size=size,
+                etag=etag,
+            )
+
+    def __len__(self) -> int:
+        return len(self.__keys)
+
+    @property
+    def keys(self) -> list:
+        return list(self.__keys)
+
+    @property
+    def objects(self) -> list:
+        return list(self.__objects)
+
+    def archive(self, version: str, platform: str) -> Archive:
+        """
+        Return the archive of a version for a platform, or None if the storage has none.
+
+        :param version: Chromedriver version.
+        :param platform: Platform, e.g. linux64.
+        """
+
+        return self.__archives.get(version, {}).get(platform)
+
+    def archives(self, version: str) -> dict:
+        """
+        Return the archives of a version by platform.
+
+        :param version: Chromedriver version.
+        """
+
+        return dict(self.__archives.get(version, {}))
+
+
+def parse(content: bytes) -> LegacyListing:
+    """
+    Parse an old chromedriver storage listing, which is an S3 ListBucketResult.
+    Only the objects of the given page are in the listing, see parse_page().
+
+    :param content: XML listing.
+    """
+
+    return LegacyListing(parse_page(content)[0])
+
+
+def parse_page(content: bytes) -> tuple:
+    """
+    Parse a page of an old chromedriver storage listing. Return the (key, size, etag)
+    tuples of its objects and the marker of the next page, None on the last page.
+
+    :param content: XML listing page.
+    """
+
+    root = ElTree.fromstring(content)
+
+    objects = []
+    truncated = False
+    next_marker = None
+    for item in root:
+        name = __local_name(item.tag)
+        if name == "IsTruncated":
+            truncated = (item.text or "").strip().lower() == "true"
+        elif name == "NextMarker":
+            next_marker = item.text or None
+        if name != "Contents":
+            continue
+
+        fields = {__local_name(field.tag): field.text for field in item}
+        if not fields.get("Key"):
+            continue
+
+        size = fields.get("Size")
+        objects.append(
+            (
+                fields["Key"],
+                int(size) if size and size.isnumeric() else None,
+                (fields.get("ETag") or "").strip('"') or None,
+            )
+        )
+
+    if not truncated:
+        return objects, None
+
+    # Without a delimiter S3 leaves out NextMarker, the next page starts after the last key
+    if next_marker is None and objects:
+        next_marker = objects[-1][0]
+
+    return objects, next_marker
+
+
+def page_url(marker: str) -> str:
+    """
+    Return the URL of the listing page after a marker.
+
+    :param marker: Key the page starts after.
+    """
+
+    return f"{constants.CHROMEDRIVER_STORAGE_URL}?marker={quote(marker, safe='')}"
+
+
+def __local_name(tag: str) -> str:
+    """
+    Return a tag without its namespace.
+
+    :param tag: Tag, e.g. {http://doc.s3.amazonaws.com/2006-03-01}Key.
+    """
+
+    return tag.rsplit("}", 1)[-1]
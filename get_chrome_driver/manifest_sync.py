@@ -0,0 +1,145 @@
+import json
+import os
+import time
+
+from get_chrome_driver import constants, matrix
+from get_chrome_driver.file_lock import FileLock
+
+# Sync files in the sync directory:
+#   state   validators (ETag, Last-Modified) and the number of entries seen per source
+#   index   every version matrix row seen so far, as JSON Lines, only ever appended to
+#   delta   the rows that were new in the last sync that found any
+
+
+def sync_dir(root: str = None) -> str:
+    """
+    Return the sync directory.
+
+    :param root: Sync directory, defaults to the sync directory in the cache directory.
+    """
+
+    return root or os.path.join(constants.CACHE_DIR, constants.SYNC_DIRNAME)
+
+
+def lock(root: str = None) -> FileLock:
+    """
+    Return the lock of the sync files. Hold it while syncing.
+
+    :param root: Sync directory, defaults to the sync directory in the cache directory.
+    """
+
+    return FileLock(os.path.join(sync_dir(root), constants.SYNC_LOCK_FILENAME))
+
+
+def load_state(root: str = None) -> dict:
+    """
+    Return the sync state by source URL, empty if never synced.
+
+    :param root: Sync directory, defaults to the sync directory in the cache directory.
+    """
+
+    try:
+        with open(os.path.join(sync_dir(root), constants.SYNC_STATE_FILENAME)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state: dict, root: str = None):
+    """
+    Replace the sync state.
+
+    :param state: Sync state by source URL.
+    :param root: Sync directory, defaults to the sync directory in the cache directory.
+    """
+
+    __write(constants.SYNC_STATE_FILENAME, json.dumps(state, indent=2), root)
+
+
+def read_index(root: str = None):
+    """
+    Yield the indexed version matrix rows, oldest first.
+
+    :param root: Sync directory, defaults to the sync directory in the cache directory.
+    """
+
+    try:
+        file = open(os.path.join(sync_dir(root), constants.SYNC_INDEX_FILENAME))
+    except FileNotFoundError:
+        return
+
+    with file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def append_index(rows: list, root: str = None):
+    """
+    Append version matrix rows to the index.
+
+    :param rows: Version matrix rows.
+    :param root: Sync directory, defaults to the sync directory in the cache directory.
+    """
+
+    path = os.path.join(sync_dir(root), constants.SYNC_INDEX_FILENAME)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as file:
+        matrix.write_jsonl(rows, file)
+
+
+def write_delta(rows: list, root: str = None):
+    """
+    Replace the delta with the rows that were new in a sync.
+
+    :param rows: New version matrix rows.
+    :param root: Sync directory, defaults to the sync directory in the cache directory.
+    """
+
+    __write(
+        constants.SYNC_DELTA_FILENAME,
+        json.dumps({"synced_at": time.time(), "rows": rows}, indent=2),
+        root,
+    )
+
+
+def read_delta(root: str = None) -> dict:
+    """
+    Return the delta of the last sync that found new rows, as a dict with the
+    keys synced_at and rows. Empty rows if there is none.
+
+    :param root: Sync directory, defaults to the sync directory in the cache directory.
+    """
+
+    try:
+        with open(os.path.join(sync_dir(root), constants.SYNC_DELTA_FILENAME)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {"synced_at": None, "rows": []}
+
+
+def new_versions(rows: list) -> list:
+    """
+    Return the distinct versions of rows, in order.
+
+    :param rows: Version matrix rows.
+    """
+
+    return list(dict.fromkeys(row["version"] for row in rows))
+
+
+def __write(filename: str, text: str, root: str):
+    """
+    Replace a sync file atomically.
+
+    :param filename: Sync file name.
+    :param text: File content.
+    :param root: Sync directory.
+    """
+
+    path = os.path.join(sync_dir(root), filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as file:
+        file.write(text)
+    os.replace(tmp_path, path)
@@ -0,0 +1,39 @@
+import csv
+import json
+
+FIELDS = ["version", "platform", "url", "source", "api"]
+
+
+def write_jsonl(rows, file) -> int:
+    """
+    Write version matrix rows as JSON Lines. Return the number of rows written.
+
+    :param rows: Rows from GetChromeDriver.version_matrix().
+    :param file: Text file to write to.
+    """
+
+    count = 0
+    for row in rows:
+        file.write(json.dumps(row) + "\n")
+        count += 1
+
+    return count
+
+
+def write_csv(rows, file) -> int:
+    """
+    Write version matrix rows as CSV with a header. Return the number of rows written.
+
+    :param rows: Rows from GetChromeDriver.version_matrix().
+    :param file: Text file to write to.
+    """
+
+    writer = csv.DictWriter(file, fieldnames=FIELDS, lineterminator="\n")
+    writer.writeheader()
+
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+
+    return count
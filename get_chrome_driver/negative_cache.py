@@ -0,0 +1,167 @@
+import json
+import os
+import threading
+import time
+
+from get_chrome_driver import constants
+from get_chrome_driver.file_lock import FileLock
+
+
+class NegativeCache:
+    """
+    Lookups known to find nothing, e.g. versions without a download for a platform.
+    Entries expire after a TTL and are kept in a file in the cache directory,
+    next to the catalog, so that all processes share them. The file is only
+    read again when it changed, so known misses cost a stat call.
+    """
+
+    def __init__(self, ttl: float = constants.NEGATIVE_CACHE_TTL, path: str = None):
+        """
+        :param ttl: Seconds to keep a miss.
+        :param path: Cache file, defaults to the negative cache in the cache directory.
+        """
+
+        self.__ttl = ttl
+        self.__path = path
+        self.__lock = threading.Lock()
+        self.__identity = None
+        self.__entries = {}
+
+    @property
+    def path(self) -> str:
+        return self.__path or os.path.join(
+            constants.CACHE_DIR, constants.NEGATIVE_CACHE_FILENAME
+        )
+
+    def get(self, key: str) -> str:
+        """
+        Return the error message of a known miss, or None.
+
+        :param key: Lookup key.
+        """
+
+        with self.__lock:
+            self.__reload()
+            entry = self.__entries.get(key)
+
+        if not entry or entry["expires"] <= time.time():
+            return None
+
+        return entry["message"]
+
+    def add(self, key: str, version: str, message: str):
+        """
+        Record a miss.
+
+        :param key: Lookup key.
+        :param version: Version the lookup was for.
+        :param message: Error message to fail with.
+        """
+
+        def add_entry(entries: dict):
+            entries[key] = {
+                "expires": time.time() + self.__ttl,
+                "version": version,
+                "message": message,
+            }
+
+        self.__update(add_entry)
+
+    def discard_versions(self, versions: list):
+        """
+        Forget the misses of versions, e.g. when they have been published since.
+        Misses of versions that share the build, e.g. browser versions, are forgotten as well.
+
+        :param versions: Versions.
+        """
+
+        builds = {_build(version) for version in versions}
+
+        def discard(entries: dict):
+            for key in [
+                key
+                for key, entry in entries.items()
+                if _build(entry["version"]) in builds
+            ]:
+                del entries[key]
+
+        self.__update(discard)
+
+    def clear(self):
+        """
+        Forget all misses.
+        """
+
+        self.__update(lambda entries: entries.clear())
+
+    def __update(self, func):
+        """
+        Apply func to the entries while holding the file lock, then write them.
+        Expired entries are dropped.
+
+        :param func: Function of the entries dict.
+        """
+
+        path = self.path
+        with self.__lock, FileLock(f"{path}.lock"):
+            self.__reload(force=True)
+
+            now = time.time()
+            entries = {
+                key: entry
+                for key, entry in self.__entries.items()
+                if entry["expires"] > now
+            }
+            func(entries)
+
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as file:
+                json.dump(entries, file)
+            os.replace(tmp_path, path)
+
+            self.__entries = entries
+            self.__identity = self.__stat(path)
+
+    def __reload(self, force: bool = False):
+        """
+        Read the file again if it changed since it was last read.
+
+        :param force: Read the file even if it did not change.
+        """
+
+        path = self.path
+        identity = self.__stat(path)
+        if identity == self.__identity and not force:
+            return
+
+        try:
+            with open(path) as file:
+                self.__entries = json.load(file)
+        except (OSError, ValueError):
+            self.__entries = {}
+        self.__identity = identity
+
+    @staticmethod
+    def __stat(path: str) -> tuple:
+        """
+        Return what identifies a version of a file, None if there is no file.
+
+        :param path: File path.
+        """
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _build(version: str) -> str:
+    """
+    Return the first three numbers of a version, e.g. 114.0.5735.
+
+    :param version: Version.
+    """
+
+    return ".".join(version.split(".")[:3])
@@ -0,0 +1,150 @@
+import os
+import random
+import time
+
+from get_chrome_driver import constants, store
+from get_chrome_driver.enums import Phase, OsPlatform
+from get_chrome_driver.exceptions import GetChromeDriverError
+from get_chrome_driver.get_driver import GetChromeDriver
+from get_chrome_driver.hedging import Hedger
+from get_chrome_driver.rate_limit import RateLimiter
+from get_chrome_driver.transport import Transport
+
+
+def prefetch(
+    os_platform: OsPlatform = None,
+    phases: list = None,
+    root: str = None,
+    transport: Transport = None,
+    hedger: Hedger = None,
+    rate_limiter: RateLimiter = None,
+    timeout: float = None,
+) -> list:
+    """
+    Download and extract the latest drivers of phases into the local store.
+    Versions that are already in the store are skipped. Return the downloaded versions.
+
+    :param os_platform: OS to prefetch for, defaults to the current OS.
+    :param phases: Phases to prefetch, defaults to stable and beta.
+    :param root: Store root, defaults to the store in the current directory.
+    :param transport: Send the requests with this transport.
+    :param hedger: Hedge slow requests.
+    :param rate_limiter: Limit the request rate per host.
+    :param timeout: Seconds each lookup and download may take.
+    """
+
+    # One manifest fetch is shared by all phases of a run
+    get_driver = GetChromeDriver(
+        os_platform=os_platform,
+        use_daemon=False,
+        manifest_ttl=constants.PREFETCH_MANIFEST_TTL,
+        hedger=hedger,
+        rate_limiter=rate_limiter,
+        timeout=timeout,
+        transport=transport,
+    )
+
+    downloaded = []
+    for phase in phases or [Phase.stable, Phase.beta]:
+        if phase == Phase.stable:
+            version = get_driver.stable_version()
+        else:
+            version = get_driver.beta_version()
+
+        if version in downloaded:
+            continue
+
+        output_path = f"{store.version_dir(version, root)}/bin"
+        driver_path = os.path.join(output_path, get_driver.driver_filename())
+
+        # Hold the store lock so that garbage collection does not evict the version meanwhile
+        with store.lock(version, root):
+            # Compressed versions are extracted again on use
+            if os.path.isfile(driver_path) or store.compressed_path(version, root):
+                continue
+
+            get_driver.download_version(
+                version=version, output_path=output_path, extract=True
+            )
+            store.touch(version, root)
+        downloaded.append(version)
+
+    return downloaded
+
+
+def run(
+    interval: float,
+    jitter: float = constants.PREFETCH_JITTER,
+    os_platform: OsPlatform = None,
+    phases: list = None,
+    on_prefetch=None,
+    on_sync=None,
+    root: str = None,
+    transport: Transport = None,
+    hedger: Hedger = None,
+    rate_limiter: RateLimiter = None,
+    timeout: float = None,
+):
+    """
+    Prefetch in a loop until interrupted.
+    Runs are spaced interval seconds apart, give or take a random jitter fraction,
+    so that hosts started together do not poll at the same moment.
+
+    :param interval: Seconds between runs.
+    :param jitter: Random fraction of the interval added or subtracted.
+    :param os_platform: OS to prefetch for, defaults to the current OS.
+    :param phases: Phases to prefetch, defaults to stable and beta.
+    :param on_prefetch: Called with the list of downloaded versions after each run.
+    :param on_sync: If set, the manifests are synced before each run and
+        on_sync is called with the rows published since the last sync.
+    :param root: Store root, defaults to the store in the current directory.
+    :param transport: Send the requests with this transport.
+    :param hedger: Hedge slow requests.
+    :param rate_limiter: Limit the request rate per host.
+    :param timeout: Seconds each lookup and download may take.
+    """
+
+    while True:
+        if on_sync:
+            try:
+                on_sync(
+                    GetChromeDriver(
+                        use_daemon=False,
+                        hedger=hedger,
+                        rate_limiter=rate_limiter,
+                        timeout=timeout,
+                        transport=transport,
+                    ).sync_manifests()
+                )
+            except GetChromeDriverError:
+                pass
+
+        try:
+            downloaded = prefetch(
+                os_platform=os_platform,
+                phases=phases,
+                root=root,
+                transport=transport,
+                hedger=hedger,
+                rate_limiter=rate_limiter,
+                timeout=timeout,
+            )
+        except GetChromeDriverError:
+            # Try again on the next run
+            downloaded = []
+
+        if on_prefetch:
+            on_prefetch(downloaded)
+
+        time.sleep(jittered_interval(interval, jitter))
+
+
+def jittered_interval(interval: float, jitter: float) -> float:
+    """
+    Return interval with a random jitter fraction added or subtracted.
+
+    :param interval: Seconds.
+    :param jitter: Random fraction of the interval.
+    """
+
+    return max(0.0, interval * (1 + random.uniform(-jitter, jitter)))
@@ -0,0 +1,152 @@
+import os
+import time
+
+import pytest
+
+PLUGIN_NAME = "get_chrome_driver"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("chromedriver")
+    group.addoption(
+        "--chromedriver",
+        action="store_true",
+        default=False,
+        help="Install ChromeDriver at the start of the session, "
+        "with pytest-xdist the controller installs it for all workers. "
+        "Without it, each worker installs it when a test uses the fixture.",
+    )
+    group.addoption(
+        "--chromedriver-chromium",
+        action="store_true",
+        default=False,
+        help="Install ChromeDriver for the installed Chromium version instead of Chrome.",
+    )
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(ChromeDriverPlugin(config), PLUGIN_NAME)
+
+
+@pytest.fixture(scope="session")
+def chromedriver_path(pytestconfig) -> str:
+    """
+    Path of the ChromeDriver executable matching the installed browser.
+    Installed once per test session, its directory is added to PATH.
+    """
+
+    return pytestconfig.pluginmanager.get_plugin(PLUGIN_NAME).chromedriver_path()
+
+
+class ChromeDriverPlugin:
+    """
+    Install ChromeDriver once per test session. With pytest-xdist, the controller
+    installs it when started with --chromedriver and passes the path to the workers.
+    Sharing is opt-in, the controller does not collect the tests and cannot tell if
+    the fixture is used. Workers without a path from the controller install it
+    themselves, the local store makes sure it is downloaded only once.
+
+    The package is imported in the hooks, not when pytest loads the plugin.
+    """
+
+    def __init__(self, config):
+        """
+        :param config: Pytest config.
+        """
+
+        self.__config = config
+        self.__resolved = False
+        self.__path = None
+        self.__error = None
+        self.__seconds = None
+        self.__worker_seconds = []
+
+        # Installed by the controller
+        workerinput = getattr(config, "workerinput", None)
+        if workerinput and workerinput.get("chromedriver_resolved"):
+            self.__resolved = True
+            self.__path = workerinput.get("chromedriver_path")
+            self.__error = workerinput.get("chromedriver_error")
+
+    def chromedriver_path(self) -> str:
+        """
+        Return the path of the ChromeDriver executable, install it if not installed yet.
+        """
+
+        from get_chrome_driver.exceptions import GetChromeDriverError
+        from get_chrome_driver.get_driver import add_to_path
+
+        self.__resolve()
+        if self.__error:
+            raise GetChromeDriverError(self.__error)
+
+        add_to_path(os.path.dirname(self.__path))
+
+        return self.__path
+
+    def pytest_sessionstart(self, session):
+        if self.__config.getoption("chromedriver") and not self.__is_worker():
+            self.__resolve()
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_configure_node(self, node):
+        if not self.__config.getoption("chromedriver"):
+            return
+
+        self.__resolve()
+        node.workerinput["chromedriver_resolved"] = True
+        node.workerinput["chromedriver_path"] = self.__path
+        node.workerinput["chromedriver_error"] = self.__error
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        seconds = getattr(node, "workeroutput", {}).get("chromedriver_seconds")
+        if seconds is not None:
+            self.__worker_seconds.append(seconds)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.__seconds is not None:
+            if self.__error:
+                text = f"failed after {self.__seconds:.2f}s: {self.__error}"
+            else:
+                text = f"installed {self.__path} in {self.__seconds:.2f}s"
+            terminalreporter.write_line(f"chromedriver: {text}")
+
+        if self.__worker_seconds:
+            terminalreporter.write_line(
+                f"chromedriver: installed by {len(self.__worker_seconds)} workers "
+                f"in {max(self.__worker_seconds):.2f}s at most"
+            )
+
+    def __resolve(self):
+        """
+        Install ChromeDriver and record the path or error and the time it took, once.
+        """
+
+        if self.__resolved:
+            return
+        self.__resolved = True
+
+        from get_chrome_driver.get_driver import GetChromeDriver
+
+        start = time.perf_counter()
+        try:
+            get_driver = GetChromeDriver()
+            output_path = get_driver.install(
+                chromium=self.__config.getoption("chromedriver_chromium")
+            )
+            self.__path = os.path.join(output_path, get_driver.driver_filename())
+        except Exception as err:
+            # Reported by the fixture, the tests that do not need a driver still run
+            self.__error = str(err) or repr(err)
+        self.__seconds = time.perf_counter() - start
+
+        if self.__is_worker():
+            self.__config.workeroutput["chromedriver_seconds"] = self.__seconds
+
+    def __is_worker(self) -> bool:
+        """
+        Return True if this is a pytest-xdist worker.
+        """
+
+        return hasattr(self.__config, "workerinput")
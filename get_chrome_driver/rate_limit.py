@@ -0,0 +1,215 @@
+import email.utils
+import json
+import os
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+from requests.exceptions import ConnectionError, Timeout
+
+from get_chrome_driver import constants
+from get_chrome_driver.file_lock import FileLock
+
+
+class RateLimiter:
+    """
+    Token bucket per host that also waits out Retry-After periods.
+    A shared limiter keeps its buckets in files in the cache directory,
+    so that all processes of a host draw from the same buckets.
+    """
+
+    def __init__(
+        self,
+        rate: float = constants.RATE_LIMIT_RATE,
+        burst: float = constants.RATE_LIMIT_BURST,
+        shared: bool = False,
+    ):
+        """
+        :param rate: Requests per second per host.
+        :param burst: Requests that may be sent at once after an idle period.
+        :param shared: Share the buckets with other processes through lock files.
+        """
+
+        self.__rate = rate
+        self.__burst = burst
+        self.__shared = shared
+        self.__lock = threading.Lock()
+        self.__buckets = {}
+
+    def acquire(self, url: str, time_left=None):
+        """
+        Wait until a request to the host of url may be sent.
+
+        :param url: Request URL.
+        :param time_left: Function of a deadline stage, raises DeadlineExceededError
+            instead of waiting past the seconds left.
+        """
+
+        host = urlparse(url).netloc
+        while True:
+            wait = self.__update(host, self.__take)
+            if wait <= 0:
+                return
+            if time_left:
+                time_left(wait)
+            time.sleep(wait)
+
+    def retry_after(self, url: str, seconds: float):
+        """
+        Hold all requests to the host of url for a number of seconds.
+
+        :param url: Request URL.
+        :param seconds: Seconds from the Retry-After header.
+        """
+
+        host = urlparse(url).netloc
+
+        def block(bucket: dict, now: float) -> float:
+            bucket["blocked_until"] = max(bucket["blocked_until"], now + seconds)
+            return 0
+
+        self.__update(host, block)
+
+    def __take(self, bucket: dict, now: float) -> float:
+        """
+        Take a token from a bucket. Return 0 if taken, or the seconds to wait.
+
+        :param bucket: Bucket state.
+        :param now: Current time.
+        """
+
+        if bucket["blocked_until"] > now:
+            return bucket["blocked_until"] - now
+
+        elapsed = max(0.0, now - bucket["updated"])
+        bucket["tokens"] = min(self.__burst, bucket["tokens"] + elapsed * self.__rate)
+        bucket["updated"] = now
+        if bucket["tokens"] >= 1:
+            bucket["tokens"] -= 1
+            return 0
+
+        return (1 - bucket["tokens"]) / self.__rate
+
+    def __update(self, host: str, func) -> float:
+        """
+        Apply func to the bucket of a host while holding its lock.
+
+        :param host: Host.
+        :param func: Function of the bucket state and the current time.
+        """
+
+        if not self.__shared:
+            with self.__lock:
+                bucket = self.__buckets.setdefault(host, self.__new_bucket())
+                return func(bucket, time.time())
+
+        path = os.path.join(
+            constants.CACHE_DIR, constants.RATE_LIMIT_DIRNAME, f"{host}.json"
+        )
+        with self.__lock, FileLock(f"{path}.lock"):
+            try:
+                with open(path) as file:
+                    bucket = json.load(file)
+            except (OSError, ValueError):
+                bucket = self.__new_bucket()
+
+            result = func(bucket, time.time())
+
+            with open(path, "w") as file:
+                json.dump(bucket, file)
+
+        return result
+
+    def __new_bucket(self) -> dict:
+        """
+        Return the state of a full bucket.
+        """
+
+        return {"tokens": self.__burst, "updated": time.time(), "blocked_until": 0}
+
+
+def send(
+    request,
+    url: str,
+    rate_limiter: RateLimiter = None,
+    retries: int = constants.RETRIES,
+    backoff_factor: float = constants.RETRY_BACKOFF_FACTOR,
+    backoff_max: float = constants.RETRY_BACKOFF_MAX,
+    time_left=None,
+):
+    """
+    Send a request, retrying throttled, failed and unavailable responses.
+    Retry-After headers are honoured, otherwise retries back off exponentially
+    with full jitter so that clients do not retry in lockstep.
+    If time_left is set, it returns the seconds the request may still take, and
+    waiting past them for a retry or for the rate limiter raises DeadlineExceededError.
+
+    :param request: Function sending the request and returning the response.
+    :param url: Request URL.
+    :param rate_limiter: Rate limiter to acquire before every attempt.
+    :param retries: Retries after the first attempt.
+    :param backoff_factor: Backoff of the first retry in seconds.
+    :param backoff_max: Maximum backoff in seconds.
+    :param time_left: Function of a deadline stage, see deadline.stage.
+    """
+
+    attempt = 0
+    while True:
+        if rate_limiter:
+            rate_limiter.acquire(url, time_left=time_left)
+
+        try:
+            response = request()
+        except (ConnectionError, Timeout):
+            if attempt >= retries:
+                raise
+            response = None
+
+        if response is not None and (
+            response.status_code not in constants.RETRY_STATUSES or attempt >= retries
+        ):
+            return response
+
+        delay = retry_after(response) if response is not None else None
+        if response is not None:
+            response.close()
+
+        throttled = delay is not None
+        if throttled:
+            delay = min(delay, constants.RETRY_AFTER_MAX)
+        else:
+            delay = random.uniform(0, min(backoff_max, backoff_factor * 2**attempt))
+
+        if time_left:
+            time_left(delay)
+
+        if throttled and rate_limiter:
+            rate_limiter.retry_after(url, delay)
+            delay = 0
+
+        time.sleep(delay)
+        attempt += 1
+
+
+def retry_after(response) -> float:
+    """
+    Return the seconds from the Retry-After header of a response, or None.
+
+    :param response: Response.
+    """
+
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isnumeric():
+        return float(value)
+
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, date.timestamp() - time.time())
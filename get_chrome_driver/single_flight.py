@@ -0,0 +1,62 @@
+import threading
+
+from get_chrome_driver import deadline
+from get_chrome_driver.exceptions import DeadlineExceededError
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into one call.
+    Callers that arrive while a call is in flight wait for it and share its result or error.
+    A waiting caller inside a deadline waits at most until its own call runs out of time.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__calls = {}
+
+    def do(self, key, func):
+        """
+        Call func, or wait for the in-flight call with the same key. Return its result.
+
+        :param key: Hashable key identifying the call.
+        :param func: Function without arguments.
+        """
+
+        with self.__lock:
+            call = self.__calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self.__calls[key] = call
+
+        if not leader:
+            current = deadline.current()
+            if not call.done.wait(current.remaining() if current else None):
+                raise DeadlineExceededError(timeout=current.timeout)
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+            call.done.set()
+
+        return call.result
+
+
+class _Call:
+    """
+    A call in flight.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
@@ -0,0 +1,442 @@
+import contextlib
+import os
+import shutil
+import tarfile
+import time
+from typing import NamedTuple, Optional
+
+from get_chrome_driver import constants
+from get_chrome_driver.file_lock import FileLock
+
+
+class StoredVersion(NamedTuple):
+    version: str
+    path: str
+    last_used: float
+    size: Optional[int]
+
+
+class CompressedVersion(NamedTuple):
+    version: str
+    size: int
+    compressed_size: int
+
+
+def version_dir(version: str, root: str = None) -> str:
+    """
+    Return the store directory of a version, e.g. chromedriver/88.0.4324.96.
+
+    :param version: Chromedriver version.
+    :param root: Store root, defaults to the store in the current directory.
+    """
+
+    return f"{root or constants.STORE_DIR}/{version}"
+
+
+def lock(version: str, root: str = None) -> FileLock:
+    """
+    Return the lock of a version. Hold it while writing or evicting the version.
+    Lock files live outside the version directory so eviction can remove it.
+
+    :param version: Chromedriver version.
+    :param root: Store root, defaults to the store in the current directory.
+    """
+
+    return FileLock(
+        os.path.join(
+            root or constants.STORE_DIR,
+            constants.STORE_LOCKS_DIRNAME,
+            f"{version}.lock",
+        )
+    )
+
+
+def touch(version: str, root: str = None):
+    """
+    Record that a version has been used now.
+
+    :param version: Chromedriver version.
+    :param root: Store root, defaults to the store in the current directory.
+    """
+
+    path = version_dir(version, root)
+    if not os.path.isdir(path):
+        return
+
+    marker = os.path.join(path, constants.STORE_LAST_USED_FILENAME)
+    try:
+        os.utime(marker)
+    except FileNotFoundError:
+        open(marker, "a").close()
+
+
+def versions(root: str = None, sizes: bool = True) -> list:
+    """
+    Return the stored versions, least recently used first.
+
+    :param root: Store root, defaults to the store in the current directory.
+    :param sizes: Walk the versions for their size in bytes, else their size is None.
+    """
+
+    root = root or constants.STORE_DIR
+    stored = []
+
+    try:
+        entries = list(os.scandir(root))
+    except FileNotFoundError:
+        return stored
+
+    for entry in entries:
+        if not entry.is_dir() or entry.name == constants.STORE_LOCKS_DIRNAME:
+            continue
+
+        marker = os.path.join(entry.path, constants.STORE_LAST_USED_FILENAME)
+        try:
+            last_used = os.stat(marker).st_mtime
+        except FileNotFoundError:
+            last_used = entry.stat().st_mtime
+
+        stored.append(
+            StoredVersion(
+                version=entry.name,
+                path=entry.path,
+                last_used=last_used,
+                size=__dir_size(entry.path) if sizes else None,
+            )
+        )
+
+    return sorted(stored, key=lambda stored_version: stored_version.last_used)
+
+
+def collect_garbage(
+    root: str = None,
+    max_bytes: int = None,
+    max_versions_per_milestone: int = None,
+    min_idle: float = constants.STORE_MIN_IDLE,
+) -> list:
+    """
+    Evict least recently used versions until the store fits the policy.
+    Versions that are locked, run by a process or used less than min_idle
+    seconds ago are never evicted. The processes are listed once per pass, and
+    again under the lock of a version about to be evicted, so that it cannot be
+    started from the store in between. Return the evicted versions.
+
+    :param root: Store root, defaults to the store in the current directory.
+    :param max_bytes: Disk budget of the store.
+    :param max_versions_per_milestone: Versions to keep per major version.
+    :param min_idle: Seconds a version must be unused before it can be evicted.
+    """
+
+    root = root or constants.STORE_DIR
+    stored = versions(root, sizes=max_bytes is not None)
+    if not stored:
+        return []
+
+    # Versions beyond the number to keep of their milestone, most recently used are kept
+    over_limit = set()
+    if max_versions_per_milestone is not None:
+        kept_per_milestone = {}
+        for stored_version in reversed(stored):
+            milestone = stored_version.version.split(".")[0]
+            kept = kept_per_milestone.get(milestone, 0)
+            if kept < max_versions_per_milestone:
+                kept_per_milestone[milestone] = kept + 1
+            else:
+                over_limit.add(stored_version.version)
+
+    total_size = sum(stored_version.size or 0 for stored_version in stored)
+    in_use = None
+    now = time.time()
+
+    evicted = []
+    for stored_version in stored:
+        over_budget = max_bytes is not None and total_size > max_bytes
+        if stored_version.version not in over_limit and not over_budget:
+            continue
+        if now - stored_version.last_used < min_idle:
+            continue
+
+        # Listed once, before any lock is taken
+        if in_use is None:
+            in_use = __paths_in_use(root)
+
+        version_lock = lock(stored_version.version, root)
+        if not version_lock.acquire(blocking=False):
+            continue
+        try:
+            if __in_use(stored_version.path, in_use) or __in_use(
+                stored_version.path, __paths_in_use(root)
+            ):
+                continue
+            shutil.rmtree(stored_version.path, ignore_errors=True)
+        finally:
+            version_lock.release()
+
+        total_size -= stored_version.size or 0
+        evicted.append(stored_version.version)
+
+    return evicted
+
+
+def collect_garbage_from_env(root: str = None) -> list:
+    """
+    Run collect_garbage with the policy set through the environment, if any.
+
+    :param root: Store root, defaults to the store in the current directory.
+    """
+
+    max_bytes = os.getenv(constants.STORE_MAX_BYTES_ENV)
+    max_versions = os.getenv(constants.STORE_MAX_VERSIONS_PER_MILESTONE_ENV)
+    if not max_bytes and not max_versions:
+        return []
+
+    return collect_garbage(
+        root=root,
+        max_bytes=int(max_bytes) if max_bytes else None,
+        max_versions_per_milestone=int(max_versions) if max_versions else None,
+    )
+
+
+def compressed_path(version: str, root: str = None) -> str:
+    """
+    Return the compressed file of a version, or None if it is not compressed.
+
+    :param version: Chromedriver version.
+    :param root: Store root, defaults to the store in the current directory.
+    """
+
+    for filename in constants.STORE_COMPRESSED_FILENAMES.values():
+        path = os.path.join(version_dir(version, root), filename)
+        if os.path.isfile(path):
+            return path
+
+    return None
+
+
+def compress(version: str, root: str = None) -> CompressedVersion:
+    """
+    Replace the extracted files of a version with one compressed file, zstd if
+    zstandard is installed, else xz. Hold the lock of the version while compressing.
+    Return the size before and after.
+
+    :param version: Chromedriver version.
+    :param root: Store root, defaults to the store in the current directory.
+    """
+
+    bin_path = os.path.join(version_dir(version, root), "bin")
+    size = __dir_size(bin_path)
+
+    codec = "zstd" if __zstandard() else "xz"
+    path = os.path.join(
+        version_dir(version, root), constants.STORE_COMPRESSED_FILENAMES[codec]
+    )
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with __open_tar(tmp_path, "w", codec) as tar:
+            tar.add(bin_path, arcname="bin")
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    shutil.rmtree(bin_path)
+
+    return CompressedVersion(
+        version=version, size=size, compressed_size=os.path.getsize(path)
+    )
+
+
+def decompress(version: str, root: str = None) -> float:
+    """
+    Extract the compressed files of a version back into its bin directory and
+    remove the compressed file. Hold the lock of the version while decompressing.
+    Return the seconds it took, or None if the version is not compressed.
+
+    :param version: Chromedriver version.
+    :param root: Store root, defaults to the store in the current directory.
+    """
+
+    path = compressed_path(version, root)
+    if not path:
+        return None
+
+    start = time.perf_counter()
+    codec = next(
+        codec
+        for codec, filename in constants.STORE_COMPRESSED_FILENAMES.items()
+        if path.endswith(filename)
+    )
+    tmp_path = os.path.join(version_dir(version, root), f"bin.{os.getpid()}.tmp")
+    try:
+        with __open_tar(path, "r", codec) as tar:
+            if hasattr(tarfile, "data_filter"):
+                tar.extractall(tmp_path, filter="data")
+            else:
+                tar.extractall(tmp_path)
+        os.replace(
+            os.path.join(tmp_path, "bin"),
+            os.path.join(version_dir(version, root), "bin"),
+        )
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    os.remove(path)
+
+    return time.perf_counter() - start
+
+
+def compress_idle(
+    root: str = None, min_idle: float = constants.STORE_COMPRESS_MIN_IDLE
+) -> list:
+    """
+    Compress the versions used less recently than min_idle seconds ago, so that
+    recently used versions stay extracted. Versions that are locked or run by a
+    process are skipped, the processes are listed as in collect_garbage.
+    Return the compressed versions with their sizes.
+
+    :param root: Store root, defaults to the store in the current directory.
+    :param min_idle: Seconds a version must be unused before it is compressed.
+    """
+
+    root = root or constants.STORE_DIR
+    in_use = None
+    now = time.time()
+
+    compressed = []
+    for stored_version in versions(root, sizes=False):
+        if now - stored_version.last_used < min_idle:
+            continue
+        if not os.path.isdir(os.path.join(stored_version.path, "bin")):
+            continue
+
+        # Listed once, before any lock is taken
+        if in_use is None:
+            in_use = __paths_in_use(root)
+
+        version_lock = lock(stored_version.version, root)
+        if not version_lock.acquire(blocking=False):
+            continue
+        try:
+            # Listed again under the lock, so the version is not started in between
+            if __in_use(stored_version.path, in_use) or __in_use(
+                stored_version.path, __paths_in_use(root)
+            ):
+                continue
+            compressed.append(compress(stored_version.version, root))
+        finally:
+            version_lock.release()
+
+    return compressed
+
+
+def compress_idle_from_env(root: str = None) -> list:
+    """
+    Run compress_idle with the idle time set through the environment, if any.
+
+    :param root: Store root, defaults to the store in the current directory.
+    """
+
+    min_idle = os.getenv(constants.STORE_COMPRESS_MIN_IDLE_ENV)
+    if not min_idle:
+        return []
+
+    return compress_idle(root=root, min_idle=float(min_idle))
+
+
+@contextlib.contextmanager
+def __open_tar(path: str, mode: str, codec: str):
+    """
+    Open a compressed tar file for streaming.
+
+    :param path: File path.
+    :param mode: r or w.
+    :param codec: zstd or xz.
+    """
+
+    if codec == "xz":
+        with tarfile.open(path, f"{mode}|xz") as tar:
+            yield tar
+        return
+
+    zstandard = __zstandard()
+    with open(path, f"{mode}b") as file:
+        if mode == "w":
+            compressor = zstandard.ZstdCompressor(
+                level=constants.STORE_COMPRESSION_LEVEL
+            )
+            stream = compressor.stream_writer(file)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(file)
+        with stream, tarfile.open(fileobj=stream, mode=f"{mode}|") as tar:
+            yield tar
+
+
+def __zstandard():
+    """
+    Return the zstandard module, or None if it is not installed.
+    """
+
+    try:
+        import zstandard
+    except ImportError:
+        return None
+
+    return zstandard
+
+
+def __dir_size(path: str) -> int:
+    """
+    Return the size in bytes of the files in a directory.
+
+    :param path: Directory path.
+    """
+
+    size = 0
+    for dir_path, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                size += os.path.getsize(os.path.join(dir_path, filename))
+            except OSError:
+                pass
+
+    return size
+
+
+def __in_use(path: str, paths_in_use: list) -> bool:
+    """
+    Return True if an executable run by a process is inside a version directory.
+
+    :param path: Version directory.
+    :param paths_in_use: Executables from __paths_in_use.
+    """
+
+    prefix = os.path.abspath(path) + os.sep
+
+    return any(exe.startswith(prefix) for exe in paths_in_use)
+
+
+def __paths_in_use(root: str) -> list:
+    """
+    Return the executables inside the store run by a process.
+    Only available on systems with /proc, empty elsewhere.
+
+    :param root: Store root.
+    """
+
+    root = os.path.abspath(root) + os.sep
+    paths = []
+
+    try:
+        pids = [name for name in os.listdir("/proc") if name.isnumeric()]
+    except OSError:
+        return paths
+
+    for pid in pids:
+        try:
+            exe = os.readlink(f"/proc/{pid}/exe")
+        except OSError:
+            continue
+        if exe.startswith(root):
+            paths.append(exe)
+
+    return paths
@@ -0,0 +1,114 @@
+import contextlib
+import json
+import os
+import threading
+import time
+
+
+class Tracer:
+    """
+    Record spans in the Chrome Trace Event format.
+    Saved traces can be opened in chrome://tracing or https://ui.perfetto.dev.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__events = []
+        self.__thread_names = {}
+        self.__pid = os.getpid()
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str, **args):
+        """
+        Record the time spent in a with block as a complete event.
+        An exception raised in the block is recorded in the event args.
+
+        :param name: Span name.
+        :param category: Span category, e.g. http or download.
+        :param args: Arguments shown with the span.
+        """
+
+        start = time.perf_counter_ns()
+        try:
+            yield args
+        except BaseException as err:
+            args["error"] = repr(err)
+            raise
+        finally:
+            end = time.perf_counter_ns()
+            self.__add(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": start / 1000,
+                    "dur": (end - start) / 1000,
+                    "args": args,
+                }
+            )
+
+    def events(self) -> list:
+        """
+        Return the recorded events, with the thread name metadata events.
+        """
+
+        with self.__lock:
+            events = list(self.__events)
+            thread_names = dict(self.__thread_names)
+
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.__pid,
+                "tid": tid,
+                "args": {"name": thread_name},
+            }
+            for tid, thread_name in thread_names.items()
+        ]
+
+        return metadata + events
+
+    def save(self, path: str):
+        """
+        Write the trace to a JSON file.
+
+        :param path: Trace file path.
+        """
+
+        with open(path, "w") as file:
+            json.dump(
+                {"traceEvents": self.events(), "displayTimeUnit": "ms"},
+                file,
+                default=str,
+            )
+
+    def __add(self, event: dict):
+        """
+        Add an event of the current thread.
+
+        :param event: Trace event.
+        """
+
+        thread = threading.current_thread()
+        event["pid"] = self.__pid
+        event["tid"] = thread.ident
+        with self.__lock:
+            self.__thread_names.setdefault(thread.ident, thread.name)
+            self.__events.append(event)
+
+
+def span(tracer: Tracer, name: str, category: str, **args):
+    """
+    Return a span of a tracer, or a span that records nothing if there is no tracer.
+
+    :param tracer: Tracer or None.
+    :param name: Span name.
+    :param category: Span category.
+    :param args: Arguments shown with the span.
+    """
+
+    if tracer is None:
+        return contextlib.nullcontext(args)
+
+    return tracer.span(name, category, **args)
@@ -0,0 +1,411 @@
+import abc
+import contextlib
+import email.utils
+import hashlib
+import io
+import json
+import os
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, Timeout
+from requests.structures import CaseInsensitiveDict
+
+from get_chrome_driver import constants
+from get_chrome_driver.exceptions import GetChromeDriverError, OfflineError
+
+
+class Transport(abc.ABC):
+    """
+    Sends the HTTP requests of the library. All manifest fetches, probes and
+    downloads go through a transport, so that a faster client, a local mirror or
+    fixtures can be used instead of the network.
+
+    Responses have the part of the requests.Response interface the library uses:
+    status_code, ok, headers, content, json(), iter_content() and close().
+    Failures are raised as requests exceptions, e.g. Timeout and ConnectionError,
+    so that they are retried like those of requests.
+    """
+
+    @abc.abstractmethod
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        timeout: float = None,
+        stream: bool = False,
+    ):
+        """
+        Send a request and return the response.
+
+        :param method: HTTP method.
+        :param url: URL.
+        :param headers: Request headers.
+        :param timeout: Seconds to wait for the server, None waits forever.
+        :param stream: Read the body when it is iterated over instead of at once.
+        """
+
+    def close(self):
+        """
+        Release the connections of the transport.
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class RequestsTransport(Transport):
+    """
+    Send requests with requests, each with a new connection unless a session is given.
+    """
+
+    def __init__(self, session: requests.Session = None):
+        """
+        :param session: Session to send the requests with.
+        """
+
+        self.__session = session
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        timeout: float = None,
+        stream: bool = False,
+    ):
+        sender = self.__session or requests
+        return sender.request(
+            method, url, headers=headers, timeout=timeout, stream=stream
+        )
+
+    def close(self):
+        if self.__session:
+            self.__session.close()
+
+
+class PooledTransport(RequestsTransport):
+    """
+    Send requests with requests over a pool of keep-alive connections per host,
+    shared by all threads, so that requests after the first skip the TCP and TLS handshakes.
+    """
+
+    def __init__(self, pool_size: int = constants.TRANSPORT_POOL_SIZE):
+        """
+        :param pool_size: Connections kept open per host.
+        """
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        super().__init__(session)
+
+
+class Http2Transport(Transport):
+    """
+    Send requests with httpx over HTTP/2, which multiplexes concurrent requests to
+    a host over one connection. Needs httpx with HTTP/2 support:
+    pip install get-chrome-driver[http2]
+    """
+
+    def __init__(self, max_connections: int = constants.TRANSPORT_POOL_SIZE):
+        """
+        :param max_connections: Connections kept open in total.
+        """
+
+        try:
+            import httpx
+        except ImportError as err:
+            raise GetChromeDriverError(
+                "Http2Transport needs httpx, install it with: pip install get-chrome-driver[http2]"
+            ) from err
+
+        self.__httpx = httpx
+        self.__client = httpx.Client(
+            http2=True,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections),
+        )
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        timeout: float = None,
+        stream: bool = False,
+    ):
+        with _httpx_errors(self.__httpx):
+            request = self.__client.build_request(
+                method, url, headers=headers, timeout=timeout
+            )
+            response = self.__client.send(request, stream=stream)
+
+        return _HttpxResponse(response, self.__httpx)
+
+    def close(self):
+        self.__client.close()
+
+
+class FileTransport(Transport):
+    """
+    Serve requests from a local directory that mirrors the hosts, e.g. the file
+    of https://chromedriver.storage.googleapis.com/114.0.5735.90/chromedriver_linux64.zip
+    is <root>/chromedriver.storage.googleapis.com/114.0.5735.90/chromedriver_linux64.zip.
+    A URL without a path, like the old storage listing, is served from the index
+    file of its directory. Missing files are 404 responses. ETag and If-None-Match
+    are supported, so that manifest syncs work against the mirror.
+    """
+
+    def __init__(self, root: str):
+        """
+        :param root: Mirror directory.
+        """
+
+        self.__root = root
+
+    def path(self, url: str) -> str:
+        """
+        Return the mirror file of a URL.
+
+        :param url: URL.
+        """
+
+        parsed = urlparse(url)
+        parts = [part for part in parsed.path.split("/") if part]
+        if not parts or parsed.path.endswith("/"):
+            parts.append(constants.TRANSPORT_INDEX_FILENAME)
+
+        if any(part in (".", "..") for part in parts):
+            return None
+
+        return os.path.join(self.__root, parsed.netloc, *parts)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        timeout: float = None,
+        stream: bool = False,
+    ):
+        path = self.path(url)
+        try:
+            stat = os.stat(path) if path else None
+        except OSError:
+            stat = None
+        if stat is None or not os.path.isfile(path):
+            return Response(url, 404)
+
+        etag = f'"{stat.st_ino:x}-{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        response_headers = {
+            "Content-Length": str(stat.st_size),
+            "ETag": etag,
+            "Last-Modified": email.utils.formatdate(stat.st_mtime, usegmt=True),
+        }
+        if CaseInsensitiveDict(headers or {}).get("If-None-Match") == etag:
+            return Response(url, 304, headers=response_headers)
+
+        if method == "HEAD":
+            return Response(url, 200, headers=response_headers)
+
+        return Response(url, 200, headers=response_headers, file=open(path, "rb"))
+
+
+class MemoryTransport(Transport):
+    """
+    Serve requests from documents in memory, e.g. fixtures in tests.
+    Unknown URLs are 404 responses. The requests sent are recorded.
+    """
+
+    def __init__(self, documents: dict = None):
+        """
+        :param documents: Documents by URL, as bytes, or as dict or list sent as JSON.
+        """
+
+        self.__lock = threading.Lock()
+        self.__documents = {}
+        self.requests = []
+        for url, document in (documents or {}).items():
+            self.add(url, document)
+
+    def add(self, url: str, document, status_code: int = 200, headers: dict = None):
+        """
+        Serve a document.
+
+        :param url: URL.
+        :param document: Document as bytes, or as dict or list sent as JSON.
+        :param status_code: Status code of the response.
+        :param headers: Response headers.
+        """
+
+        if not isinstance(document, bytes):
+            document = json.dumps(document).encode("UTF-8")
+
+        headers = dict(headers or {})
+        headers.setdefault("ETag", f'"{hashlib.sha256(document).hexdigest()[:16]}"')
+        headers.setdefault("Content-Length", str(len(document)))
+
+        with self.__lock:
+            self.__documents[url] = (status_code, document, headers)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        timeout: float = None,
+        stream: bool = False,
+    ):
+        with self.__lock:
+            self.requests.append((method, url))
+            served = self.__documents.get(url)
+
+        if served is None:
+            return Response(url, 404)
+
+        status_code, document, response_headers = served
+        if (
+            status_code == 200
+            and CaseInsensitiveDict(headers or {}).get("If-None-Match")
+            == response_headers["ETag"]
+        ):
+            return Response(url, 304, headers=response_headers)
+
+        if method == "HEAD":
+            return Response(url, status_code, headers=response_headers)
+
+        return Response(
+            url, status_code, headers=response_headers, file=io.BytesIO(document)
+        )
+
+
+class OfflineTransport(Transport):
+    """
+    Refuse every request at once without opening a connection, for offline mode.
+    """
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        timeout: float = None,
+        stream: bool = False,
+    ):
+        raise OfflineError(
+            f"Offline, {url} is not in the local caches. Build the catalog, sync "
+            "or download the driver while online first."
+        )
+
+
+class Response:
+    """
+    Response of the file and memory transports.
+    """
+
+    def __init__(self, url: str, status_code: int, headers: dict = None, file=None):
+        """
+        :param url: URL.
+        :param status_code: Status code.
+        :param headers: Response headers.
+        :param file: Binary file object of the body, None for no body.
+        """
+
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.__file = file
+        self.__content = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def content(self) -> bytes:
+        if self.__content is None:
+            self.__content = self.__file.read() if self.__file else b""
+            self.close()
+        return self.__content
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size: int = 1):
+        if self.__content is not None:
+            for start in range(0, len(self.__content), chunk_size):
+                yield self.__content[start : start + chunk_size]
+            return
+
+        if not self.__file:
+            return
+        try:
+            for chunk in iter(lambda: self.__file.read(chunk_size), b""):
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self):
+        if self.__file:
+            self.__file.close()
+
+
+class _HttpxResponse:
+    """
+    Response of the HTTP/2 transport.
+    """
+
+    def __init__(self, response, httpx):
+        """
+        :param response: Httpx response.
+        :param httpx: Httpx module.
+        """
+
+        self.__response = response
+        self.__httpx = httpx
+        self.url = str(response.url)
+        self.status_code = response.status_code
+        self.headers = response.headers
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def content(self) -> bytes:
+        with _httpx_errors(self.__httpx):
+            return self.__response.read()
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size: int = 1):
+        with _httpx_errors(self.__httpx):
+            yield from self.__response.iter_bytes(chunk_size)
+
+    def close(self):
+        self.__response.close()
+
+
+@contextlib.contextmanager
+def _httpx_errors(httpx):
+    """
+    Raise httpx timeouts and transport errors as the requests exceptions.
+
+    :param httpx: Httpx module.
+    """
+
+    try:
+        yield
+    except httpx.TimeoutException as err:
+        raise Timeout(err) from err
+    except httpx.TransportError as err:
+        raise ConnectionError(err) from err
@@ -0,0 +1,339 @@
+import ctypes
+import ctypes.util
+import json
+import os
+import platform as pl
+import select
+import shutil
+import struct
+import time
+
+from get_chrome_driver import constants, browsers
+from get_chrome_driver.enums import OsPlatform
+from get_chrome_driver.exceptions import GetChromeDriverError
+
+# Executables that GetChromeDriver asks for their version
+LINUX_EXECUTABLES = {False: "google-chrome", True: "chromium-browser"}
+MAC_EXECUTABLES = {
+    False: "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    True: "/Applications/Chromium.app/Contents/MacOS/Chromium",
+}
+
+# inotify(7) flags and events that can mean the browser was updated
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+IN_EVENTS = (
+    0x00000002  # IN_MODIFY
+    | 0x00000004  # IN_ATTRIB
+    | 0x00000008  # IN_CLOSE_WRITE
+    | 0x00000040  # IN_MOVED_FROM
+    | 0x00000080  # IN_MOVED_TO
+    | 0x00000100  # IN_CREATE
+    | 0x00000200  # IN_DELETE
+    | 0x00000400  # IN_DELETE_SELF
+    | 0x00000800  # IN_MOVE_SELF
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+# Driver executable in the directories installed on Linux and macOS
+DRIVER_FILENAME = "chromedriver"
+
+
+def browser_executable(os_platform: OsPlatform = None, chromium: bool = False) -> str:
+    """
+    Return the real path of the browser executable, or None if it is not installed
+    or the OS is not supported.
+
+    :param os_platform: OS, defaults to the current OS.
+    :param chromium: Chromium instead of Chrome.
+    """
+
+    os_platform = os_platform or _current_os_platform()
+    if os_platform == OsPlatform.linux:
+        path = shutil.which(LINUX_EXECUTABLES[chromium])
+    elif os_platform == OsPlatform.mac:
+        path = MAC_EXECUTABLES[chromium]
+    else:
+        return None
+
+    if not path or not os.path.isfile(path):
+        return None
+
+    return os.path.realpath(path)
+
+
+def watched_paths(executable: str) -> list:
+    """
+    Return the files and directories to watch for updates of a browser:
+    the executable, its directory and, on macOS, the version metadata of the app.
+
+    :param executable: Browser executable.
+    """
+
+    paths = [executable, os.path.dirname(executable)]
+
+    # e.g. /Applications/Google Chrome.app/Contents/MacOS/Google Chrome
+    contents = os.path.dirname(os.path.dirname(executable))
+    info = os.path.join(contents, "Info.plist")
+    if os.path.basename(contents) == "Contents" and os.path.isfile(info):
+        paths += [info, contents]
+
+    return paths
+
+
+def identity(paths: list) -> tuple:
+    """
+    Return what identifies the installed version of files, which changes when
+    any of them is replaced or modified. None for files that do not exist.
+
+    :param paths: Files.
+    """
+
+    identities = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            identities.append(None)
+            continue
+        identities.append([stat.st_ino, stat.st_mtime_ns, stat.st_size])
+
+    return tuple(identities)
+
+
+def state_path(
+    chromium: bool = False, os_platform: OsPlatform = None, arch: int = None
+) -> str:
+    """
+    Return the file with the driver installed for the browser, one per OS and architecture.
+
+    :param chromium: Chromium instead of Chrome.
+    :param os_platform: OS, defaults to the current OS.
+    :param arch: Architecture, 64 or 32, defaults to the one of Python.
+    """
+
+    os_platform = os_platform or _current_os_platform()
+    arch = arch or struct.calcsize("P") * 8
+    name = "chromium" if chromium else "chrome"
+
+    return os.path.join(
+        constants.CACHE_DIR,
+        constants.WATCH_DIRNAME,
+        f"{os_platform.value}-{arch}-{name}.json",
+    )
+
+
+def current(
+    os_platform: OsPlatform = None, chromium: bool = False, arch: int = None
+) -> str:
+    """
+    Return the driver directory installed by the watcher for the installed browser,
+    or None if the browser changed since, the driver is gone or no watcher installed one.
+    Costs a few stat calls and one file read.
+
+    :param os_platform: OS, defaults to the current OS.
+    :param chromium: Chromium instead of Chrome.
+    :param arch: Architecture, 64 or 32, defaults to the one of Python.
+    """
+
+    executable = browser_executable(os_platform, chromium)
+    if not executable:
+        return None
+
+    try:
+        with open(state_path(chromium, os_platform, arch)) as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    if state.get("executable") != executable:
+        return None
+    if list(identity(watched_paths(executable))) != state.get("identity"):
+        return None
+
+    driver_path = state.get("driver_path") or ""
+    if not os.path.isfile(os.path.join(driver_path, DRIVER_FILENAME)):
+        return None
+
+    return driver_path
+
+
+def refresh(get_driver, chromium: bool = False) -> dict:
+    """
+    Install the driver matching the installed browser and record it for current().
+    Return the recorded state, or None if the browser is not installed.
+
+    :param get_driver: GetChromeDriver of the current OS.
+    :param chromium: Chromium instead of Chrome.
+    """
+
+    executable = browser_executable(chromium=chromium)
+    if not executable:
+        return None
+
+    # Taken before installing, so that an update meanwhile is picked up by the next refresh
+    installed = list(identity(watched_paths(executable)))
+    browser = browsers.probe(executable)
+
+    driver_path = os.path.abspath(
+        get_driver.auto_download(extract=True, chromium=chromium)
+    )
+
+    state = {
+        "executable": executable,
+        "identity": installed,
+        "browser_version": browser.version if browser else None,
+        "driver_path": driver_path.replace(os.sep, "/"),
+        "refreshed_at": time.time(),
+    }
+
+    path = state_path(chromium)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(state, file, indent=2)
+    os.replace(tmp_path, path)
+
+    return state
+
+
+def run(
+    get_driver,
+    chromium: bool = False,
+    poll_interval: float = constants.WATCH_POLL_INTERVAL,
+    settle: float = constants.WATCH_SETTLE,
+    on_refresh=None,
+):
+    """
+    Install the driver matching the installed browser, then watch the browser and
+    install the matching driver again as soon as it is updated, until interrupted.
+    Changes are watched with inotify on Linux and by polling elsewhere.
+
+    :param get_driver: GetChromeDriver of the current OS.
+    :param chromium: Chromium instead of Chrome.
+    :param poll_interval: Seconds between checks without inotify, and between
+        checks for a browser that is not installed yet.
+    :param settle: Seconds without changes after which an update is done writing files.
+    :param on_refresh: Called with the state after each install.
+    """
+
+    try:
+        inotify = Inotify()
+    except OSError:
+        inotify = None
+
+    recorded = None
+    try:
+        while True:
+            executable = browser_executable(chromium=chromium)
+            paths = watched_paths(executable) if executable else []
+
+            # Watched before comparing, so that no change goes unnoticed.
+            # Replaced files are new inodes, which are watched from here on.
+            if inotify:
+                for path in paths:
+                    inotify.add_watch(path)
+
+            if paths and list(identity(paths)) != recorded:
+                try:
+                    state = refresh(get_driver, chromium=chromium)
+                except GetChromeDriverError:
+                    # Try again on the next change or check
+                    state = None
+                if state:
+                    recorded = state["identity"]
+                    if on_refresh:
+                        on_refresh(state)
+
+            if not inotify:
+                time.sleep(poll_interval)
+            elif inotify.wait(poll_interval):
+                # An update writes many files, act once it is done
+                while inotify.wait(settle):
+                    pass
+    finally:
+        if inotify:
+            inotify.close()
+
+
+class Inotify:
+    """
+    Linux inotify instance, through ctypes.
+    """
+
+    def __init__(self):
+        if not hasattr(select, "poll"):
+            raise OSError("inotify is not supported on this platform.")
+
+        library = ctypes.util.find_library("c")
+        try:
+            self.__libc = ctypes.CDLL(library, use_errno=True)
+            init = self.__libc.inotify_init1
+        except (OSError, AttributeError):
+            raise OSError("inotify is not supported on this platform.")
+
+        self.__fd = init(IN_NONBLOCK | IN_CLOEXEC)
+        if self.__fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add_watch(self, path: str) -> bool:
+        """
+        Watch a file or directory. Return False if it does not exist.
+
+        :param path: File or directory.
+        """
+
+        watch = self.__libc.inotify_add_watch(
+            self.__fd, os.fsencode(path), ctypes.c_uint32(IN_EVENTS)
+        )
+        return watch >= 0
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Wait for events. Return True if there were any, False on timeout.
+        The events are read and discarded.
+
+        :param timeout: Seconds to wait.
+        """
+
+        poll = select.poll()
+        poll.register(self.__fd, select.POLLIN)
+        if not poll.poll(timeout * 1000):
+            return False
+
+        events = 0
+        while True:
+            try:
+                data = os.read(self.__fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                _, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size + length
+                events += 1
+
+        return events > 0
+
+    def close(self):
+        os.close(self.__fd)
+
+
+def _current_os_platform() -> OsPlatform:
+    """
+    Return the current OS.
+    """
+
+    system = pl.system()
+    if system == "Windows":
+        return OsPlatform.win
+    if system == "Darwin":
+        return OsPlatform.mac
+    return OsPlatform.linux
@@ -14,6 +14,11 @@ requires = [
     "typer==0.17.4",
 ]
 
+extras = {
+    "http2": ["httpx[http2]==0.28.1"],
+    "delta": ["zstandard==0.25.0"],
+}
+
 setup(
     name=name,
     version=version,
@@ -27,8 +32,10 @@ setup(
     packages=find_packages(),
     entry_points={
         "console_scripts": [f"{name}=get_chrome_driver.app:app"],
+        "pytest11": ["get_chrome_driver = get_chrome_driver.pytest_plugin"],
     },
     install_requires=requires,
+    extras_require=extras,
     license="MIT",
     classifiers=[
         "Development Status :: 5 - Production/Stable",
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from get_chrome_driver import constants
+
+
+class FakeResponse:
+    """
+    Response of a fake requests.request or session, with the part of the
+    requests.Response interface the library uses.
+    """
+
+    def __init__(
+        self,
+        content: bytes = b"",
+        status_code: int = 200,
+        headers: dict = None,
+        url: str = None,
+    ):
+        self.content = content
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.headers = headers or {}
+        self.url = url
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakePopen:
+    """
+    Stands in for subprocess.Popen of a browser that reports its version.
+    Subclass it to report another version.
+    """
+
+    version = "114.0.5735.45"
+
+    def __init__(self, args, **kwargs):
+        pass
+
+    def communicate(self, timeout=None):
+        return f"Google Chrome {self.version}\n".encode(), b""
+
+    def kill(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path_factory, monkeypatch):
+    """Give every test its own cache directory."""
+
+    path = str(tmp_path_factory.mktemp("cache"))
+    monkeypatch.setattr(constants, "CACHE_DIR", path)
+    monkeypatch.setenv("GET_CHROME_DRIVER_CACHE_DIR", path)
+    return path
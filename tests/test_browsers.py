@@ -0,0 +1,121 @@
+import os
+import stat
+
+import pytest
+
+from get_chrome_driver import GetChromeDriver, browsers, catalog
+from get_chrome_driver.enums import OsPlatform
+from get_chrome_driver.transport import MemoryTransport
+
+
+def add_executable(directory, name: str, output: str):
+    path = directory / name
+    path.write_text(f"#!/bin/sh\necho '{output}'\n")
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+@pytest.fixture
+def bin_dir(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    add_executable(bin_dir, "google-chrome", "Google Chrome 120.0.6099.109")
+    add_executable(bin_dir, "google-chrome-beta", "Google Chrome 121.0.6167.16 beta")
+    add_executable(bin_dir, "chromium", "Chromium 119.0.6045.159 built on Debian")
+    os.symlink(bin_dir / "google-chrome", bin_dir / "google-chrome-stable")
+    monkeypatch.setenv("PATH", str(bin_dir))
+    monkeypatch.setattr(browsers, "LINUX_PATHS", [])
+    return bin_dir
+
+
+@pytest.mark.skipif(os.name != "posix", reason="Uses shell scripts")
+class TestBrowsers:
+    def test_discover(self, bin_dir):
+        found = browsers.discover(OsPlatform.linux)
+
+        assert sorted((browser.name, browser.version) for browser in found) == [
+            ("Chromium", "119.0.6045.159"),
+            ("Google Chrome", "120.0.6099.109"),
+            ("Google Chrome", "121.0.6167.16"),
+        ]
+
+    def test_probe_without_version(self, tmp_path):
+        path = add_executable(tmp_path, "broken", "no version here")
+
+        assert browsers.probe(path) is None
+        assert browsers.probe(str(tmp_path / "missing")) is None
+
+    def test_download_for_browsers(self, bin_dir, monkeypatch):
+        monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+        catalog.build(
+            {
+                "version": version,
+                "platform": "linux64",
+                "url": f"https://cft/{version}/chromedriver-linux64.zip",
+                "source": "new",
+                "api": "new",
+            }
+            for version in ["119.0.6045.105", "120.0.6099.109", "121.0.6167.16"]
+        )
+        get_driver = GetChromeDriver(OsPlatform.linux)
+        monkeypatch.setattr(
+            get_driver,
+            "download_version",
+            lambda version, extract: f"chromedriver/{version}/bin",
+        )
+
+        paths = get_driver.download_for_browsers()
+
+        assert paths == {
+            "paths": {
+                str(bin_dir / "google-chrome"): "chromedriver/120.0.6099.109/bin",
+                str(bin_dir / "google-chrome-beta"): "chromedriver/121.0.6167.16/bin",
+                str(bin_dir / "chromium"): "chromedriver/119.0.6045.105/bin",
+            },
+            "errors": {},
+        }
+
+    def test_failed_browser_does_not_stop_the_others(self, bin_dir, monkeypatch):
+        monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+        catalog.build(
+            {
+                "version": version,
+                "platform": "linux64",
+                "url": f"https://cft/{version}/chromedriver-linux64.zip",
+                "source": "new",
+                "api": "new",
+            }
+            for version in ["120.0.6099.109", "121.0.6167.16"]
+        )
+        get_driver = GetChromeDriver(OsPlatform.linux, transport=MemoryTransport())
+        monkeypatch.setattr(
+            get_driver,
+            "download_version",
+            lambda version, extract: f"chromedriver/{version}/bin",
+        )
+
+        downloads = get_driver.download_for_browsers()
+
+        assert downloads["paths"] == {
+            str(bin_dir / "google-chrome"): "chromedriver/120.0.6099.109/bin",
+            str(bin_dir / "google-chrome-beta"): "chromedriver/121.0.6167.16/bin",
+        }
+        # No version of the catalog matches Chromium 119
+        assert list(downloads["errors"]) == [str(bin_dir / "chromium")]
+
+    def test_discover_chrome_for_testing(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PATH", "")
+        monkeypatch.setenv("HOME", str(tmp_path))
+        install_dir = tmp_path / ".cache/puppeteer/chrome/linux-121.0.6167.85"
+        (install_dir / "chrome-linux64").mkdir(parents=True)
+        add_executable(
+            install_dir / "chrome-linux64",
+            "chrome",
+            "Google Chrome for Testing 121.0.6167.85",
+        )
+
+        found = browsers.discover(OsPlatform.linux)
+
+        assert ("Google Chrome for Testing", "121.0.6167.85") in [
+            (browser.name, browser.version) for browser in found
+        ]
@@ -0,0 +1,130 @@
+import json
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from get_chrome_driver import GetChromeDriver, bundle, constants, get_driver
+from get_chrome_driver.enums import OsPlatform
+from get_chrome_driver.exceptions import BundleError
+from tests.conftest import FakePopen, FakeResponse
+
+LEGACY_LISTING = b"""<?xml version='1.0' encoding='UTF-8'?>
+<ListBucketResult xmlns="http://doc.s3.amazonaws.com/2006-03-01">
+<Contents><Key>114.0.5735.90/chromedriver_linux64.zip</Key><Size>10</Size></Contents>
+<Contents><Key>114.0.5735.90/chromedriver_mac64.zip</Key><Size>10</Size></Contents>
+</ListBucketResult>"""
+
+NEW_URL = "https://storage.googleapis.com/chrome-for-testing-public/120.0.6099.109/linux64/chromedriver-linux64.zip"
+KNOWN_GOOD_VERSIONS = {
+    "versions": [
+        {
+            "version": "120.0.6099.109",
+            "downloads": {"chromedriver": [{"platform": "linux64", "url": NEW_URL}]},
+        }
+    ]
+}
+
+
+def fake_download(url, output_path, **kwargs):
+    """Write a driver archive like the one at url."""
+
+    file_name = url.rsplit("/", 1)[-1]
+    os.makedirs(output_path, exist_ok=True)
+    file_path = os.path.join(output_path, file_name)
+    member = "chromedriver" if "_" in file_name else "chromedriver-linux64/chromedriver"
+    with zipfile.ZipFile(file_path, "w") as zip_file:
+        zip_file.writestr(member, "#!/bin/sh\n")
+    return file_path, file_name
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    """Fail every request, as on a host without internet access."""
+
+    def request(method, url, **kwargs):
+        raise AssertionError(f"Requested {url}")
+
+    monkeypatch.setattr("requests.request", request)
+    monkeypatch.setattr(get_driver.downloader, "download", request)
+
+
+@pytest.fixture
+def exported(monkeypatch, tmp_path):
+    monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+
+    def request(method, url, **kwargs):
+        if url == constants.CHROMEDRIVER_STORAGE_URL:
+            return FakeResponse(LEGACY_LISTING)
+        return FakeResponse(json.dumps(KNOWN_GOOD_VERSIONS).encode())
+
+    with monkeypatch.context() as online:
+        online.setattr("requests.request", request)
+        online.setattr(get_driver.downloader, "download", fake_download)
+
+        path = str(tmp_path / "bundle.tar")
+        GetChromeDriver(OsPlatform.linux, use_catalog=False).export_bundle(
+            path, versions=["114.0.5735.90", "120.0.6099.109"]
+        )
+
+    return path
+
+
+class TestBundle:
+    def test_export_indexes_members(self, exported):
+        with tarfile.open(exported) as tar:
+            names = tar.getnames()
+
+        assert names[0] == bundle.INDEX_NAME
+        with bundle.Bundle(exported) as opened:
+            assert [entry["version"] for entry in opened.index["archives"]] == [
+                "114.0.5735.90",
+                "120.0.6099.109",
+            ]
+            assert opened.index["archives"][1]["url"] == NEW_URL
+            for entry in opened.index["archives"]:
+                assert entry["name"] in names
+
+            listing = json.loads(opened.manifest(constants.CHROMEDRIVER_STORAGE_URL))
+            assert listing[0] == ["114.0.5735.90/chromedriver_linux64.zip", 10, None]
+
+    def test_import_resolves_offline(self, exported, offline, monkeypatch, tmp_path):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("PATH", os.environ.get("PATH", ""))
+        monkeypatch.setattr(FakePopen, "version", "120.0.6099.71")
+        monkeypatch.setattr(get_driver.subprocess, "Popen", FakePopen)
+
+        driver = GetChromeDriver(OsPlatform.linux)
+        result = driver.import_bundle(exported)
+
+        assert result == {
+            "catalog_versions": 2,
+            "versions": ["114.0.5735.90", "120.0.6099.109"],
+        }
+        assert driver.version_url("120.0.6099.109") == NEW_URL
+        assert driver.version_url("114.0.5735.90").endswith(
+            "/114.0.5735.90/chromedriver_linux64.zip"
+        )
+        assert driver.matching_version() == "120.0.6099.109"
+        assert driver.is_downloaded("120.0.6099.109")
+
+        output_path = driver.install()
+        assert output_path.endswith("chromedriver/120.0.6099.109/bin")
+        assert os.access(os.path.join(output_path, "chromedriver"), os.X_OK)
+
+    def test_corrupt_archive_is_rejected(self, exported, offline, tmp_path):
+        with bundle.Bundle(exported) as opened:
+            entry = dict(opened.index["archives"][0], sha256="0" * 64)
+            with pytest.raises(BundleError):
+                opened.extract_archive(entry, str(tmp_path / "out"))
+
+        assert not os.listdir(tmp_path / "out")
+
+    def test_not_a_bundle(self, tmp_path):
+        path = tmp_path / "bundle.tar"
+        with tarfile.open(path, "w"):
+            pass
+
+        with pytest.raises(BundleError):
+            GetChromeDriver(OsPlatform.linux).import_bundle(str(path))
@@ -0,0 +1,165 @@
+import os
+import time
+
+import pytest
+
+from get_chrome_driver import GetChromeDriver, catalog
+from get_chrome_driver.enums import OsPlatform
+from get_chrome_driver.exceptions import GetChromeDriverError
+from get_chrome_driver.transport import MemoryTransport
+
+ROWS = [
+    {
+        "version": "2.9",
+        "platform": "linux64",
+        "url": "https://legacy/2.9/chromedriver_linux64.zip",
+        "source": "legacy",
+        "api": "legacy",
+    },
+    {
+        "version": "114.0.5735.90",
+        "platform": "linux64",
+        "url": "https://legacy/114.0.5735.90/chromedriver_linux64.zip",
+        "source": "legacy",
+        "api": "legacy",
+    },
+    {
+        "version": "114.0.5735.90",
+        "platform": "win32",
+        "url": "https://legacy/114.0.5735.90/chromedriver_win32.zip",
+        "source": "legacy",
+        "api": "legacy",
+    },
+    {
+        "version": "114.0.5735.90",
+        "platform": "linux64",
+        "url": "https://cft/114.0.5735.90/chromedriver-linux64.zip",
+        "source": "new",
+        "api": "new",
+    },
+    {
+        "version": "120.0.6099.71",
+        "platform": "linux64",
+        "url": "https://cft/120.0.6099.71/chromedriver-linux64.zip",
+        "source": "new",
+        "api": "new",
+    },
+    {
+        "version": "120.0.6099.109",
+        "platform": "linux64",
+        "url": "https://cft/120.0.6099.109/chromedriver-linux64.zip",
+        "source": "new",
+        "api": "new",
+    },
+]
+
+
+@pytest.fixture
+def driver_catalog(tmp_path):
+    path = str(tmp_path / "catalog.bin")
+    catalog.build(ROWS, path)
+    driver_catalog = catalog.Catalog(path)
+    yield driver_catalog
+    driver_catalog.close()
+
+
+class TestCatalog:
+    def test_pack_version_sorts_like_version(self):
+        assert catalog.pack_version("2.9") < catalog.pack_version("114.0.5735.90")
+        assert catalog.pack_version("120.0.6099.71") < catalog.pack_version(
+            "120.0.6099.109"
+        )
+        assert catalog.pack_version("1.2.3.4.5") is None
+        assert catalog.pack_version("1.70000") is None
+
+    def test_versions(self, driver_catalog):
+        assert driver_catalog.versions() == [
+            "2.9",
+            "114.0.5735.90",
+            "120.0.6099.71",
+            "120.0.6099.109",
+        ]
+
+    def test_url_prefers_new_api(self, driver_catalog):
+        assert (
+            driver_catalog.url("114.0.5735.90", "linux64")
+            == "https://cft/114.0.5735.90/chromedriver-linux64.zip"
+        )
+        assert (
+            driver_catalog.url("114.0.5735.90", "win32")
+            == "https://legacy/114.0.5735.90/chromedriver_win32.zip"
+        )
+        assert driver_catalog.url("114.0.5735.90", "mac64") is None
+        assert driver_catalog.url("115.0.0.0", "linux64") is None
+
+    def test_version_platforms(self, driver_catalog):
+        assert driver_catalog.version_platforms("114.0.5735.90") == [
+            "linux64",
+            "win32",
+        ]
+
+    def test_latest_matching(self, driver_catalog):
+        assert driver_catalog.latest_matching("120.0.6099.5") == "120.0.6099.109"
+        assert driver_catalog.latest_matching("119.0.6045.105") is None
+
+    def test_load_reopens_rebuilt_catalog(self, cache_dir):
+        assert catalog.load() is None
+
+        catalog.build(ROWS[:1])
+        assert catalog.load().versions() == ["2.9"]
+
+        catalog.build(ROWS)
+        assert len(catalog.load()) == 4
+        assert os.listdir(cache_dir) == ["catalog.bin"]
+
+    def test_version_url_from_catalog(self, monkeypatch):
+        monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+        catalog.build(ROWS)
+
+        def request(method, url, **kwargs):
+            raise AssertionError(url)
+
+        monkeypatch.setattr("requests.request", request)
+        get_driver = GetChromeDriver(OsPlatform.linux)
+
+        assert (
+            get_driver.version_url("120.0.6099.109")
+            == "https://cft/120.0.6099.109/chromedriver-linux64.zip"
+        )
+
+
+class TestCatalogAge:
+    @pytest.fixture
+    def stale(self, monkeypatch):
+        monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+        catalog.build(ROWS, built_at=time.time() - 2 * 86400)
+        return MemoryTransport()
+
+    def test_built_at(self, driver_catalog):
+        assert 0 <= driver_catalog.age() < 60
+
+    def test_stale_catalog_is_skipped_online(self, stale):
+        get_driver = GetChromeDriver(OsPlatform.linux, transport=stale)
+
+        with pytest.raises(GetChromeDriverError):
+            get_driver.version_url("120.0.6099.109")
+        assert stale.requests
+
+    def test_stale_catalog_is_used_offline(self, stale):
+        get_driver = GetChromeDriver(OsPlatform.linux, offline=True)
+
+        assert (
+            get_driver.version_url("120.0.6099.109")
+            == "https://cft/120.0.6099.109/chromedriver-linux64.zip"
+        )
+
+    def test_max_age(self, stale):
+        get_driver = GetChromeDriver(
+            OsPlatform.linux, transport=stale, catalog_max_age=None
+        )
+
+        assert (
+            get_driver.version_url("120.0.6099.109")
+            == "https://cft/120.0.6099.109/chromedriver-linux64.zip"
+        )
+        assert stale.requests == []
@@ -0,0 +1,114 @@
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from get_chrome_driver import __version__, constants, prefetch
+from get_chrome_driver.app import app
+from tests.conftest import FakeResponse
+
+NEW_URL = "https://storage.googleapis.com/chrome-for-testing-public/120.0.6099.109/linux64/chromedriver-linux64.zip"
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+    monkeypatch.setenv(constants.OFFLINE_ENV, "0")
+    monkeypatch.setattr("get_chrome_driver.get_driver.pl.system", lambda: "Linux")
+    monkeypatch.setattr("get_chrome_driver.get_driver.pl.processor", lambda: "x86_64")
+
+    known_good_versions = {
+        "versions": [
+            {
+                "version": "120.0.6099.109",
+                "downloads": {
+                    "chromedriver": [
+                        {"platform": "linux64", "url": NEW_URL},
+                        {"platform": "linux32", "url": NEW_URL},
+                    ]
+                },
+            }
+        ]
+    }
+
+    def request(method, url, **kwargs):
+        if url == constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL:
+            return FakeResponse(content=json.dumps(known_good_versions).encode())
+        if url == NEW_URL:
+            return FakeResponse()
+        return FakeResponse(status_code=404)
+
+    monkeypatch.setattr("requests.request", request)
+    return CliRunner()
+
+
+class TestCli:
+    def test_actions_run_in_order(self, runner):
+        result = runner.invoke(
+            app, ["--version-url", "120.0.6099.109", "--version", "--driver-filename"]
+        )
+
+        assert result.exit_code == 0
+        assert result.output.splitlines() == [
+            NEW_URL,
+            "chromedriver",
+            f"v{__version__}",
+        ]
+
+    def test_failed_action_does_not_stop_the_others(self, runner):
+        result = runner.invoke(app, ["--version-url", "a.b", "--version"])
+
+        assert result.exit_code == 0
+        assert result.output.splitlines() == [
+            "Could not find version url",
+            f"v{__version__}",
+        ]
+
+    def test_json_output(self, runner):
+        result = runner.invoke(
+            app,
+            ["--json", "--version-url", "120.0.6099.109", "--download-version", "a.b"],
+        )
+
+        assert result.exit_code == 0
+        output = json.loads(result.output)
+        assert output["results"] == {"version_url": NEW_URL}
+        assert list(output["errors"]) == ["download_version"]
+        assert set(output["timings"]) == {"version_url", "download_version", "total"}
+
+    def test_failed_export_is_kept_out_of_the_rows(self, runner):
+        # The old storage listing is missing
+        result = runner.invoke(app, ["--export-matrix", "csv"])
+
+        assert result.exit_code == 1
+        assert "Could not export" not in result.stdout
+        assert "Could not export version matrix" in result.stderr
+
+    def test_prefetch_uses_the_run_options(self, runner, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            prefetch, "prefetch", lambda **kwargs: calls.append(kwargs) or []
+        )
+
+        result = runner.invoke(
+            app, ["--prefetch", "--hedge", "--rate-limit", "5", "--timeout", "30"]
+        )
+
+        assert result.exit_code == 0
+        assert calls[0]["timeout"] == 30
+        assert calls[0]["hedger"] is not None
+        assert calls[0]["rate_limiter"] is not None
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            ["--watch", "--version"],
+            ["--export-matrix", "csv", "--stable-version"],
+            ["--daemon", "--prefetch-interval", "60"],
+        ],
+    )
+    def test_modes_run_alone(self, runner, args):
+        result = runner.invoke(app, args)
+
+        assert result.exit_code == 2
+        assert "cannot be combined with" in result.output
@@ -0,0 +1,156 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from get_chrome_driver import GetChromeDriver, constants, daemon, deadline
+from get_chrome_driver.enums import OsPlatform
+from get_chrome_driver.exceptions import (
+    DaemonUnavailableError,
+    DeadlineExceededError,
+    VersionUrlError,
+)
+
+
+class FakeResolverDaemon(daemon.ResolverDaemon):
+    def handle(self, action: str, params: dict):
+        if action == "version_url":
+            if params["version"] == "1.0.0.0":
+                raise VersionUrlError("No URL.")
+            return f"https://example.com/{params['os_platform']}/{params['version']}"
+        if action == "stable_version":
+            return "120.0.0.0"
+        if action == "remaining":
+            return deadline.current().remaining()
+        if action == "beta_version":
+            raise DeadlineExceededError("metadata", 5)
+        return super().handle(action, params)
+
+
+@pytest.fixture
+def socket_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "d.sock")
+    monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON_SOCKET", path)
+    monkeypatch.delenv("GET_CHROME_DRIVER_DAEMON", raising=False)
+    return path
+
+
+@pytest.fixture
+def running_daemon(socket_path):
+    resolver = FakeResolverDaemon()
+    thread = threading.Thread(target=resolver.serve, daemon=True)
+    thread.start()
+    for _ in range(100):
+        try:
+            daemon.call("stable_version", os_platform="linux")
+            break
+        except DaemonUnavailableError:
+            time.sleep(0.01)
+    yield resolver
+    resolver.shutdown()
+    thread.join()
+
+
+@pytest.fixture
+def raw_daemon(socket_path):
+    """A socket that accepts connections and replies with the given bytes, if any."""
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen()
+    connections = []
+    replies = []
+
+    def accept():
+        while True:
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return
+            connections.append(connection)
+            connection.recv(4096)
+            if replies:
+                connection.sendall(replies[0])
+
+    threading.Thread(target=accept, daemon=True).start()
+    yield replies
+    server.close()
+    for connection in connections:
+        connection.close()
+
+
+class TestDaemon:
+    def test_call_without_daemon(self, socket_path):
+        with pytest.raises(DaemonUnavailableError):
+            daemon.call("stable_version", os_platform="linux")
+
+    def test_call_disabled(self, running_daemon, monkeypatch):
+        monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+
+        with pytest.raises(DaemonUnavailableError):
+            daemon.call("stable_version", os_platform="linux")
+
+    def test_library_uses_daemon(self, running_daemon):
+        get_driver = GetChromeDriver(OsPlatform.linux)
+
+        assert get_driver.stable_version() == "120.0.0.0"
+        assert (
+            get_driver.version_url("120.0.0.0") == "https://example.com/linux/120.0.0.0"
+        )
+
+    def test_daemon_error_type(self, running_daemon):
+        get_driver = GetChromeDriver(OsPlatform.linux)
+
+        with pytest.raises(VersionUrlError):
+            get_driver.version_url("1.0.0.0")
+
+    def test_daemon_deadline_error(self, running_daemon):
+        get_driver = GetChromeDriver(OsPlatform.linux)
+
+        with pytest.raises(DeadlineExceededError) as err:
+            get_driver.beta_version()
+        assert (err.value.stage, err.value.timeout) == ("metadata", 5)
+        assert str(err.value) == "The metadata stage ran out of time after 5 seconds."
+
+    def test_socket_removed_on_shutdown(self, socket_path):
+        resolver = FakeResolverDaemon()
+        thread = threading.Thread(target=resolver.serve, daemon=True)
+        thread.start()
+        time.sleep(0.1)
+        resolver.shutdown()
+        thread.join()
+
+        with pytest.raises(DaemonUnavailableError):
+            daemon.call("stable_version", os_platform="linux")
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets only")
+    def test_hung_daemon_times_out(self, raw_daemon, monkeypatch):
+        monkeypatch.setattr(constants, "DAEMON_CALL_TIMEOUT", 0.1)
+
+        with pytest.raises(DaemonUnavailableError, match="did not reply"):
+            daemon.call("stable_version", os_platform="linux")
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets only")
+    def test_hung_daemon_within_a_deadline(self, raw_daemon):
+        start = time.monotonic()
+
+        with deadline.scope(timeout=0.2):
+            with pytest.raises(DeadlineExceededError):
+                daemon.call("stable_version", os_platform="linux")
+
+        assert time.monotonic() - start < 5
+
+    def test_daemon_gets_the_time_left(self, running_daemon):
+        with deadline.scope(timeout=30):
+            remaining = daemon.call("remaining", os_platform="linux")
+
+        assert 0 < remaining <= 30
+        assert daemon.call("remaining", os_platform="linux") is None
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets only")
+    def test_invalid_reply(self, raw_daemon):
+        raw_daemon.append(b"not json\n")
+
+        with pytest.raises(DaemonUnavailableError, match="invalid reply"):
+            daemon.call("stable_version", os_platform="linux")
@@ -0,0 +1,151 @@
+import subprocess
+import time
+
+import pytest
+from requests.exceptions import ReadTimeout
+
+from get_chrome_driver import GetChromeDriver, deadline, downloader, get_driver
+from get_chrome_driver.enums import OsPlatform, Stage
+from get_chrome_driver.exceptions import DeadlineExceededError
+from tests.conftest import FakeResponse
+
+
+class TestDeadline:
+    def test_stage_timeout(self):
+        with deadline.scope(stage_timeouts={"metadata": 0.05}):
+            with deadline.stage(Stage.metadata) as time_left:
+                assert 0 < time_left() <= 0.05
+                time.sleep(0.1)
+
+                with pytest.raises(DeadlineExceededError) as info:
+                    time_left()
+
+        assert info.value.stage == "metadata"
+        assert info.value.timeout == 0.05
+
+    def test_overall_timeout_limits_stages(self):
+        with deadline.scope(timeout=0.05, stage_timeouts={Stage.download: 10}):
+            with deadline.stage(Stage.download) as time_left:
+                assert time_left() <= 0.05
+                time.sleep(0.1)
+
+                with pytest.raises(DeadlineExceededError) as info:
+                    time_left()
+
+        assert info.value.stage == "download"
+        assert info.value.timeout == 0.05
+
+    def test_nested_scopes_share_the_deadline(self):
+        with deadline.scope(timeout=5) as outer:
+            with deadline.scope(timeout=60) as inner:
+                assert inner is outer
+        assert deadline.current() is None
+
+    def test_cancelled_fork(self):
+        with deadline.scope(timeout=5) as call:
+            forked = call.fork()
+            forked.cancel()
+
+            with deadline.use(forked):
+                with pytest.raises(DeadlineExceededError):
+                    with deadline.stage(Stage.metadata):
+                        pass
+
+            with deadline.stage(Stage.metadata) as time_left:
+                assert 0 < time_left() <= 5
+
+    def test_timeouts_become_deadline_errors(self):
+        with pytest.raises(DeadlineExceededError) as info:
+            with deadline.stage(Stage.detect):
+                raise subprocess.TimeoutExpired("google-chrome", 1)
+
+        assert info.value.stage == "detect"
+
+
+class TestGetChromeDriverDeadlines:
+    @pytest.fixture(autouse=True)
+    def no_daemon(self, monkeypatch):
+        monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+
+    def test_metadata_timeout_is_passed_and_reported(self, monkeypatch):
+        timeouts = []
+
+        def request(method, url, timeout=None, **kwargs):
+            timeouts.append(timeout)
+            raise ReadTimeout(url)
+
+        monkeypatch.setattr("requests.request", request)
+        monkeypatch.setattr("get_chrome_driver.rate_limit.time.sleep", lambda _: None)
+
+        get_driver = GetChromeDriver(OsPlatform.linux, stage_timeouts={"metadata": 0.5})
+        with pytest.raises(DeadlineExceededError) as info:
+            get_driver.stable_version()
+
+        assert info.value.stage == "metadata"
+        assert 0 < timeouts[0] <= 0.5
+
+    def test_overall_timeout_stops_retries(self, monkeypatch):
+        def request(method, url, **kwargs):
+            time.sleep(0.1)
+            return FakeResponse(status_code=503)
+
+        monkeypatch.setattr("requests.request", request)
+
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceededError) as info:
+            GetChromeDriver(OsPlatform.linux, timeout=0.25).stable_version()
+
+        assert time.monotonic() - start < 2
+        assert info.value.timeout == 0.25
+
+    def test_detection_is_killed(self, monkeypatch):
+        class SlowPopen:
+            killed = False
+
+            def __init__(self, args, **kwargs):
+                pass
+
+            def communicate(self, timeout=None):
+                if timeout is not None and not SlowPopen.killed:
+                    raise subprocess.TimeoutExpired("google-chrome", timeout)
+                return b"", b""
+
+            def kill(self):
+                SlowPopen.killed = True
+
+        monkeypatch.setattr(get_driver.subprocess, "Popen", SlowPopen)
+
+        with pytest.raises(DeadlineExceededError) as info:
+            GetChromeDriver(OsPlatform.linux).matching_version()
+
+        assert info.value.stage == "detect"
+        assert SlowPopen.killed
+
+
+class TestDownload:
+    def test_partial_file_is_removed(self, monkeypatch, tmp_path):
+        class SlowResponse:
+            status_code = 200
+
+            def iter_content(self, chunk_size):
+                for _ in range(10):
+                    time.sleep(0.05)
+                    yield b"x" * 10
+
+            def close(self):
+                pass
+
+        monkeypatch.setattr(
+            "requests.request", lambda method, url, **kwargs: SlowResponse()
+        )
+
+        with deadline.scope(stage_timeouts={"download": 0.1}):
+            with pytest.raises(DeadlineExceededError):
+                with deadline.stage(Stage.download) as time_left:
+                    downloader.download(
+                        "https://a/chromedriver.zip",
+                        output_path=str(tmp_path),
+                        time_left=time_left,
+                    )
+
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,180 @@
+import json
+import os
+import random
+import zipfile
+
+import pytest
+
+from get_chrome_driver import GetChromeDriver, constants, delta
+from get_chrome_driver.enums import OsPlatform
+from get_chrome_driver.transport import FileTransport, MemoryTransport
+
+needs_zstandard = pytest.mark.skipif(
+    not delta.is_available(), reason="zstandard is not installed"
+)
+
+VERSIONS = ["120.0.6099.71", "120.0.6099.109", "121.0.6167.85"]
+
+
+def url(version: str) -> str:
+    return f"https://storage.googleapis.com/chrome-for-testing-public/{version}/linux64/chromedriver-linux64.zip"
+
+
+def driver(version: str) -> bytes:
+    """A driver of 256 KB of which each version changes a few bytes."""
+
+    content = bytearray(random.Random(0).randbytes(256 * 1024))
+    for position in range(VERSIONS.index(version) + 1):
+        content[position * 1000 : position * 1000 + 8] = version.encode()[:8]
+    return bytes(content)
+
+
+class RecordingTransport(FileTransport):
+    def __init__(self, root: str):
+        super().__init__(root)
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url))
+        return super().request(method, url, **kwargs)
+
+
+@pytest.fixture
+def mirror(tmp_path, monkeypatch):
+    root = tmp_path / "mirror"
+    files = FileTransport(str(root))
+
+    def write(url: str, content: bytes):
+        os.makedirs(os.path.dirname(files.path(url)), exist_ok=True)
+        with open(files.path(url), "wb") as file:
+            file.write(content)
+
+    write(
+        constants.CHROMEDRIVER_STORAGE_URL,
+        b"<ListBucketResult xmlns='http://doc.s3.amazonaws.com/2006-03-01'/>",
+    )
+    manifest = {"versions": []}
+    for version in VERSIONS:
+        manifest["versions"].append(
+            {
+                "version": version,
+                "downloads": {
+                    "chromedriver": [{"platform": "linux64", "url": url(version)}]
+                },
+            }
+        )
+        archive_path = files.path(url(version))
+        os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+        with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("chromedriver-linux64/chromedriver", driver(version))
+            archive.writestr("chromedriver-linux64/LICENSE.chromedriver", "License")
+    write(
+        constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL,
+        json.dumps(manifest).encode(),
+    )
+
+    # The local store is relative to the current directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+
+    return str(root)
+
+
+def store_driver(version: str, content: bytes):
+    path = os.path.join(constants.STORE_DIR, version, "bin")
+    os.makedirs(path)
+    with open(os.path.join(path, "chromedriver"), "wb") as file:
+        file.write(content)
+
+
+def new_get_driver(transport) -> GetChromeDriver:
+    return GetChromeDriver(
+        OsPlatform.linux, use_catalog=False, transport=transport, use_deltas=True
+    )
+
+
+@needs_zstandard
+class TestDelta:
+    def test_build(self, mirror):
+        written = delta.build(mirror)
+
+        assert [(entry["version"], entry["source_version"]) for entry in written] == [
+            ("120.0.6099.109", "120.0.6099.71"),
+            ("121.0.6167.85", "120.0.6099.71"),
+            ("121.0.6167.85", "120.0.6099.109"),
+        ]
+        assert all(entry["size"] < entry["archive_size"] / 10 for entry in written)
+
+        with open(
+            FileTransport(mirror).path(delta.index_url(url(VERSIONS[2])))
+        ) as file:
+            index = json.load(file)
+        assert index["size"] == len(driver(VERSIONS[2]))
+        assert set(index["deltas"]) == set(VERSIONS[:2])
+
+        # Deltas of an earlier build are kept
+        assert delta.build(mirror) == []
+
+    def test_install_patches_the_stored_driver(self, mirror):
+        delta.build(mirror)
+        store_driver(VERSIONS[1], driver(VERSIONS[1]))
+        transport = RecordingTransport(mirror)
+
+        output_path = new_get_driver(transport).download_version(
+            VERSIONS[2], extract=True
+        )
+
+        with open(os.path.join(output_path, "chromedriver"), "rb") as file:
+            assert file.read() == driver(VERSIONS[2])
+        assert os.access(os.path.join(output_path, "chromedriver"), os.X_OK)
+        assert os.listdir(output_path) == ["chromedriver"]
+        # Patched from the newest stored version, the archive is not downloaded
+        assert ("GET", delta.delta_url(url(VERSIONS[2]), VERSIONS[1])) in (
+            transport.requests
+        )
+        assert ("GET", url(VERSIONS[2])) not in transport.requests
+
+    def test_changed_driver_falls_back_to_the_archive(self, mirror):
+        delta.build(mirror)
+        store_driver(VERSIONS[1], b"changed")
+        transport = RecordingTransport(mirror)
+
+        output_path = new_get_driver(transport).download_version(
+            VERSIONS[2], extract=True
+        )
+
+        with open(os.path.join(output_path, "chromedriver"), "rb") as file:
+            assert file.read() == driver(VERSIONS[2])
+        assert ("GET", url(VERSIONS[2])) in transport.requests
+
+
+def test_without_deltas_the_archive_is_downloaded(mirror, monkeypatch):
+    monkeypatch.setattr(delta, "is_available", lambda: False)
+    store_driver(VERSIONS[1], driver(VERSIONS[1]))
+    transport = RecordingTransport(mirror)
+
+    output_path = new_get_driver(transport).download_version(VERSIONS[2], extract=True)
+
+    with open(os.path.join(output_path, "chromedriver"), "rb") as file:
+        assert file.read() == driver(VERSIONS[2])
+    assert ("GET", url(VERSIONS[2])) in transport.requests
+
+
+def test_deltas_are_only_looked_for_in_a_mirror(mirror, monkeypatch):
+    monkeypatch.setattr(delta, "is_available", lambda: True)
+    files = FileTransport(mirror)
+    documents = {}
+    for document_url in [constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL] + [
+        url(version) for version in VERSIONS
+    ]:
+        with open(files.path(document_url), "rb") as file:
+            documents[document_url] = file.read()
+    transport = MemoryTransport(documents)
+    store_driver(VERSIONS[1], driver(VERSIONS[1]))
+
+    new_get_driver(transport).download_version(VERSIONS[2], extract=True)
+
+    assert [
+        request_url for _, request_url in transport.requests if ".deltas" in request_url
+    ] == []
+    assert ("GET", url(VERSIONS[2])) in transport.requests
@@ -0,0 +1,67 @@
+import collections
+import os
+
+import pytest
+
+from get_chrome_driver import downloader
+from get_chrome_driver.exceptions import DownloadError, InsufficientSpaceError
+from get_chrome_driver.transport import MemoryTransport
+
+URL = "https://storage.googleapis.com/chrome-for-testing-public/120.0.6099.109/linux64/chromedriver-linux64.zip"
+ARCHIVE = b"x" * 3000000
+
+DiskUsage = collections.namedtuple("DiskUsage", "total used free")
+
+
+class TestDownload:
+    def test_file_is_preallocated(self, monkeypatch, tmp_path):
+        allocated = []
+        posix_fallocate = getattr(os, "posix_fallocate", None)
+
+        def fallocate(fd, offset, length):
+            allocated.append(length)
+            if posix_fallocate:
+                posix_fallocate(fd, offset, length)
+
+        monkeypatch.setattr(downloader.os, "posix_fallocate", fallocate, raising=False)
+
+        file_path, file_name = downloader.download(
+            URL, output_path=str(tmp_path), transport=MemoryTransport({URL: ARCHIVE})
+        )
+
+        assert file_name == "chromedriver-linux64.zip"
+        assert allocated == [len(ARCHIVE)]
+        with open(file_path, "rb") as file:
+            assert file.read() == ARCHIVE
+
+    def test_full_disk_fails_before_the_transfer(self, monkeypatch, tmp_path):
+        transport = MemoryTransport({URL: ARCHIVE})
+        monkeypatch.setattr(
+            downloader.shutil,
+            "disk_usage",
+            lambda path: DiskUsage(10**9, 10**9 - 1000, 1000),
+        )
+
+        with pytest.raises(InsufficientSpaceError):
+            downloader.download(URL, output_path=str(tmp_path), transport=transport)
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_short_transfer_is_removed(self, tmp_path):
+        transport = MemoryTransport()
+        transport.add(URL, ARCHIVE, headers={"Content-Length": str(len(ARCHIVE) + 1)})
+
+        with pytest.raises(DownloadError, match="Downloaded 3000000 of 3000001 bytes"):
+            downloader.download(URL, output_path=str(tmp_path), transport=transport)
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_unknown_size_is_downloaded(self, tmp_path):
+        transport = MemoryTransport()
+        transport.add(URL, ARCHIVE, headers={"Content-Length": "unknown"})
+
+        file_path, _ = downloader.download(
+            URL, output_path=str(tmp_path), transport=transport
+        )
+
+        assert os.path.getsize(file_path) == len(ARCHIVE)
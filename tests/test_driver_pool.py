@@ -0,0 +1,148 @@
+import os
+import sys
+import threading
+
+import pytest
+import requests
+
+from get_chrome_driver.driver_pool import DriverPool
+from get_chrome_driver.exceptions import DriverPoolError
+from get_chrome_driver.transport import RequestsTransport
+
+# Stands in for chromedriver: serves /status on --port after a short delay
+FAKE_CHROMEDRIVER = """
+import http.server
+import json
+import sys
+import time
+
+port = int([arg for arg in sys.argv if arg.startswith("--port=")][0].split("=")[1])
+time.sleep(float("{delay}"))
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({{"value": {{"ready": {ready}}}}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+http.server.HTTPServer(("127.0.0.1", port), Handler).serve_forever()
+"""
+
+
+def fake_chromedriver(tmp_path, delay: float = 0, ready: bool = True) -> str:
+    path = tmp_path / "chromedriver"
+    path.write_text(
+        f"#!{sys.executable}\n" + FAKE_CHROMEDRIVER.format(delay=delay, ready=ready)
+    )
+    path.chmod(0o755)
+    return str(path)
+
+
+@pytest.fixture
+def executable(tmp_path):
+    return fake_chromedriver(tmp_path)
+
+
+class TestDriverPool:
+    def test_hands_out_ready_endpoints(self, executable):
+        with DriverPool(executable, size=2) as pool:
+            endpoint = pool.acquire(timeout=10)
+
+            response = requests.get(f"{endpoint.url}/status", timeout=5)
+            assert response.json()["value"]["ready"]
+            pool.release(endpoint)
+
+            metrics = pool.metrics()
+            assert metrics["acquired"] == 1
+            assert metrics["started"] == 2
+            assert metrics["wait_max"] >= 0
+
+    def test_readiness_is_checked_through_the_transport(self, executable):
+        class RecordingTransport(RequestsTransport):
+            def __init__(self):
+                super().__init__()
+                self.urls = []
+
+            def request(self, method, url, **kwargs):
+                self.urls.append(url)
+                return super().request(method, url, **kwargs)
+
+        transport = RecordingTransport()
+        with DriverPool(executable, size=1, transport=transport) as pool:
+            endpoint = pool.acquire(timeout=10)
+
+            assert f"{endpoint.url}/status" in transport.urls
+
+    def test_endpoints_on_different_ports(self, executable):
+        with DriverPool(executable, size=2) as pool:
+            first = pool.acquire(timeout=10)
+            second = pool.acquire(timeout=10)
+
+            assert first.port != second.port
+
+    def test_waits_when_all_in_use(self, executable):
+        with DriverPool(executable, size=1) as pool:
+            endpoint = pool.acquire(timeout=10)
+
+            with pytest.raises(DriverPoolError):
+                pool.acquire(timeout=0.1)
+
+            threading.Timer(0.1, pool.release, args=(endpoint,)).start()
+            assert pool.acquire(timeout=10) is endpoint
+
+    def test_recycled_after_max_uses(self, executable):
+        with DriverPool(executable, size=1, max_uses=2) as pool:
+            first = pool.acquire(timeout=10)
+            pool.release(first)
+            assert pool.acquire(timeout=10) is first
+            pool.release(first)
+
+            second = pool.acquire(timeout=10)
+            assert second is not first
+            assert first.process.poll() is not None
+            assert pool.metrics()["restarted"] == 1
+
+    def test_unhealthy_and_exited_processes_are_replaced(self, executable):
+        with DriverPool(executable, size=1) as pool:
+            with pytest.raises(RuntimeError):
+                with pool.endpoint(timeout=10):
+                    raise RuntimeError("session failed")
+
+            endpoint = pool.acquire(timeout=10)
+            endpoint.process.kill()
+            endpoint.process.wait()
+            pool.release(endpoint)
+
+            assert pool.acquire(timeout=10).is_running()
+            assert pool.metrics()["restarted"] == 2
+
+    def test_never_ready(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("get_chrome_driver.constants.POOL_MAX_FAILED_STARTS", 1)
+        executable = fake_chromedriver(tmp_path, ready=False)
+
+        with DriverPool(executable, size=1, startup_timeout=0.5) as pool:
+            with pytest.raises(DriverPoolError):
+                pool.acquire(timeout=10)
+            assert pool.metrics()["failed_starts"] == 1
+
+    def test_missing_executable(self, tmp_path):
+        with DriverPool(os.path.join(tmp_path, "missing"), size=1) as pool:
+            with pytest.raises(DriverPoolError):
+                pool.acquire(timeout=10)
+
+    def test_close_stops_processes(self, executable):
+        pool = DriverPool(executable, size=2).start()
+        endpoint = pool.acquire(timeout=10)
+        pool.close()
+
+        assert endpoint.process.poll() is not None
+        with pytest.raises(DriverPoolError):
+            pool.acquire(timeout=1)
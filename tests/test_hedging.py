@@ -0,0 +1,95 @@
+import time
+
+import pytest
+from requests.exceptions import ConnectionError
+
+from get_chrome_driver.hedging import Hedger
+from tests.conftest import FakeResponse
+
+
+class FakeSession:
+    def __init__(self, latencies: dict, status_codes: dict = None):
+        self.latencies = latencies
+        self.status_codes = status_codes or {}
+        self.urls = []
+
+    def request(self, method: str, url: str, **kwargs):
+        self.urls.append(url)
+        time.sleep(self.latencies.get(url, 0))
+        if self.status_codes.get(url) == "error":
+            raise ConnectionError(url)
+        return FakeResponse(url=url, status_code=self.status_codes.get(url, 200))
+
+
+class TestHedger:
+    def test_fast_primary_is_not_hedged(self):
+        session = FakeSession({})
+        hedger = Hedger(delay=0.5)
+
+        response = hedger.get("https://a/x", session=session)
+
+        assert response.url == "https://a/x"
+        assert session.urls == ["https://a/x"]
+        assert hedger.metrics()["primary_wins"] == 1
+        assert hedger.metrics()["hedged"] == 0
+
+    def test_slow_primary_is_hedged_to_mirror(self):
+        session = FakeSession({"https://a/x": 1.0})
+        hedger = Hedger(
+            delay=0.05, max_hedge_rate=1, mirrors={"https://a": "https://b"}
+        )
+
+        start = time.monotonic()
+        response = hedger.get("https://a/x", session=session)
+
+        assert time.monotonic() - start < 0.5
+        assert response.url == "https://b/x"
+        assert hedger.metrics()["hedge_wins"] == 1
+
+    def test_server_error_waits_for_other_request(self):
+        session = FakeSession(
+            {"https://a/x": 0.1, "https://b/x": 0.2}, {"https://a/x": 503}
+        )
+        hedger = Hedger(
+            delay=0.05, max_hedge_rate=1, mirrors={"https://a": "https://b"}
+        )
+
+        response = hedger.get("https://a/x", session=session)
+
+        assert response.url == "https://b/x"
+
+    def test_hedge_rate_limit(self):
+        session = FakeSession({"https://a/x": 0.1})
+        hedger = Hedger(delay=0.01, max_hedge_rate=0.5)
+
+        for _ in range(4):
+            hedger.get("https://a/x", session=session)
+
+        assert hedger.metrics()["requests"] == 4
+        assert hedger.metrics()["hedged"] == 2
+
+    def test_first_request_is_not_hedged_at_a_low_rate(self):
+        session = FakeSession({"https://a/x": 0.1})
+        hedger = Hedger(delay=0.01, max_hedge_rate=0.1)
+
+        hedger.get("https://a/x", session=session)
+
+        assert session.urls == ["https://a/x"]
+        assert hedger.metrics()["hedged"] == 0
+
+    def test_all_attempts_fail(self):
+        session = FakeSession({}, {"https://a/x": "error"})
+        hedger = Hedger(delay=0.5)
+
+        with pytest.raises(ConnectionError):
+            hedger.get("https://a/x", session=session)
+        assert hedger.metrics()["failures"] == 1
+
+    def test_adaptive_delay(self):
+        session = FakeSession({})
+        hedger = Hedger(percentile=50)
+
+        for _ in range(20):
+            hedger.get("https://a/x", session=session)
+
+        assert hedger.delay() == 0.05
@@ -0,0 +1,142 @@
+import pytest
+
+from get_chrome_driver import GetChromeDriver, constants, legacy_listing
+from get_chrome_driver.enums import OsPlatform
+from get_chrome_driver.exceptions import VersionUrlError
+from tests.conftest import FakeResponse
+
+LEGACY_LISTING = b"""<?xml version='1.0' encoding='UTF-8'?>
+<ListBucketResult xmlns="http://doc.s3.amazonaws.com/2006-03-01">
+<Name>chromedriver</Name>
+<Contents>
+<Key>2.9/chromedriver_linux32.zip</Key>
+<LastModified>2014-01-28T20:00:00.000Z</LastModified>
+<ETag>"a1"</ETag>
+<Size>2048</Size>
+</Contents>
+<Contents>
+<Key>2.9/chromedriver_linux64.zip</Key>
+<ETag>"b2"</ETag>
+<Size>4096</Size>
+</Contents>
+<Contents><Key>2.9/notes.txt</Key><Size>10</Size></Contents>
+<Contents><Key>LATEST_RELEASE</Key><Size>13</Size></Contents>
+</ListBucketResult>"""
+
+
+class TestParse:
+    def test_archives_with_size_and_etag(self):
+        listing = legacy_listing.parse(LEGACY_LISTING)
+
+        archive = listing.archive("2.9", "linux64")
+        assert archive.url == (
+            "https://chromedriver.storage.googleapis.com/2.9/chromedriver_linux64.zip"
+        )
+        assert archive.size == 4096
+        assert archive.etag == "b2"
+        assert sorted(listing.archives("2.9")) == ["linux32", "linux64"]
+
+    def test_keys_once_each(self):
+        listing = legacy_listing.parse(LEGACY_LISTING)
+
+        assert listing.keys == [
+            "2.9/chromedriver_linux32.zip",
+            "2.9/chromedriver_linux64.zip",
+            "2.9/notes.txt",
+            "LATEST_RELEASE",
+        ]
+
+    def test_last_page(self):
+        objects, next_marker = legacy_listing.parse_page(LEGACY_LISTING)
+
+        assert len(objects) == 4
+        assert next_marker is None
+
+    def test_truncated_page(self):
+        page = LEGACY_LISTING.replace(
+            b"<Name>chromedriver</Name>", b"<IsTruncated>true</IsTruncated>"
+        )
+
+        objects, next_marker = legacy_listing.parse_page(page)
+
+        # Without a NextMarker the next page starts after the last key
+        assert next_marker == "LATEST_RELEASE"
+        assert legacy_listing.page_url("2.9/x.zip") == (
+            f"{constants.CHROMEDRIVER_STORAGE_URL}?marker=2.9%2Fx.zip"
+        )
+
+    def test_missing_archive(self):
+        listing = legacy_listing.parse(LEGACY_LISTING)
+
+        assert listing.archive("2.9", "win32") is None
+        assert listing.archive("2.10", "linux64") is None
+
+
+class TestVersionUrl:
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+        calls = []
+
+        def request(method, url, **kwargs):
+            calls.append((method, url))
+            if url == constants.CHROMEDRIVER_STORAGE_URL:
+                return FakeResponse(LEGACY_LISTING)
+            if url == constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL:
+                return FakeResponse(b'{"versions": []}')
+            return FakeResponse(status_code=404)
+
+        monkeypatch.setattr("requests.request", request)
+        return calls
+
+    def test_legacy_url_without_probes(self, calls):
+        url = GetChromeDriver(OsPlatform.linux).version_url("2.9")
+
+        assert url.endswith("/2.9/chromedriver_linux64.zip")
+        assert [method for method, _ in calls] == ["GET", "GET"]
+
+    def test_legacy_miss_without_probes(self, calls):
+        with pytest.raises(VersionUrlError):
+            GetChromeDriver(OsPlatform.win).version_url("2.9")
+
+        assert "HEAD" not in [method for method, _ in calls]
+
+    def test_probes_when_listing_is_unavailable(self, calls, monkeypatch):
+        def request(method, url, **kwargs):
+            calls.append((method, url))
+            if url == constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL:
+                return FakeResponse(b'{"versions": []}')
+            if method == "HEAD" and url.endswith("chromedriver_linux64.zip"):
+                return FakeResponse()
+            return FakeResponse(status_code=404)
+
+        monkeypatch.setattr("requests.request", request)
+
+        url = GetChromeDriver(OsPlatform.linux).version_url("2.9")
+
+        assert url.endswith("/2.9/chromedriver_linux64.zip")
+        assert ("HEAD", url) in calls
+
+    def test_follows_the_pages_of_the_listing(self, calls, monkeypatch):
+        first_page = b"""<?xml version='1.0' encoding='UTF-8'?>
+<ListBucketResult xmlns="http://doc.s3.amazonaws.com/2006-03-01">
+<IsTruncated>true</IsTruncated>
+<Contents><Key>2.8/chromedriver_linux64.zip</Key></Contents>
+</ListBucketResult>"""
+
+        def request(method, url, **kwargs):
+            calls.append((method, url))
+            if url == constants.CHROMEDRIVER_STORAGE_URL:
+                return FakeResponse(first_page)
+            if url == legacy_listing.page_url("2.8/chromedriver_linux64.zip"):
+                return FakeResponse(LEGACY_LISTING)
+            if url == constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL:
+                return FakeResponse(b'{"versions": []}')
+            return FakeResponse(status_code=404)
+
+        monkeypatch.setattr("requests.request", request)
+
+        url = GetChromeDriver(OsPlatform.linux).version_url("2.9")
+
+        assert url.endswith("/2.9/chromedriver_linux64.zip")
+        assert "HEAD" not in [method for method, _ in calls]
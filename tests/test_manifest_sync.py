@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from get_chrome_driver import GetChromeDriver, constants, manifest_sync
+from get_chrome_driver.enums import OsPlatform
+from tests.conftest import FakeResponse
+
+LEGACY_LISTING = b"""<?xml version='1.0' encoding='UTF-8'?>
+<ListBucketResult xmlns="http://doc.s3.amazonaws.com/2006-03-01">
+<Contents><Key>2.9/chromedriver_linux64.zip</Key></Contents>
+<Contents><Key>114.0.5735.90/chromedriver_linux64.zip</Key></Contents>
+</ListBucketResult>"""
+
+
+def driver_version(version: str) -> dict:
+    return {
+        "version": version,
+        "downloads": {
+            "chromedriver": [
+                {"platform": "linux64", "url": f"https://cft/{version}/linux64.zip"}
+            ]
+        },
+    }
+
+
+class FakeServer:
+    def __init__(self):
+        self.versions = [driver_version("115.0.5763.0")]
+        self.requests = []
+
+    def etag(self, url: str) -> str:
+        if url == constants.CHROMEDRIVER_STORAGE_URL:
+            return '"legacy"'
+        return f'"{len(self.versions)}"'
+
+    def request(self, method, url, headers=None, **kwargs):
+        self.requests.append((url, headers))
+        if (headers or {}).get("If-None-Match") == self.etag(url):
+            return FakeResponse(status_code=304)
+        if url == constants.CHROMEDRIVER_STORAGE_URL:
+            return FakeResponse(LEGACY_LISTING, headers={"ETag": self.etag(url)})
+        if url == constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL:
+            content = json.dumps({"versions": self.versions}).encode()
+            return FakeResponse(content, headers={"ETag": self.etag(url)})
+        raise AssertionError(url)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+    server = FakeServer()
+    monkeypatch.setattr("requests.request", server.request)
+    return server
+
+
+class TestSyncManifests:
+    def test_first_sync_indexes_everything(self, server):
+        rows = GetChromeDriver(OsPlatform.linux).sync_manifests()
+
+        assert manifest_sync.new_versions(rows) == [
+            "2.9",
+            "114.0.5735.90",
+            "115.0.5763.0",
+        ]
+        assert list(manifest_sync.read_index()) == rows
+        assert manifest_sync.read_delta()["rows"] == rows
+
+    def test_unchanged_manifests_are_not_downloaded(self, server):
+        get_driver = GetChromeDriver(OsPlatform.linux)
+        get_driver.sync_manifests()
+        delta = manifest_sync.read_delta()
+
+        assert get_driver.sync_manifests() == []
+        assert [headers["If-None-Match"] for _, headers in server.requests[2:]] == [
+            '"legacy"',
+            '"1"',
+        ]
+        # The delta of the last sync with new rows is kept
+        assert manifest_sync.read_delta() == delta
+
+    def test_only_new_versions_are_appended(self, server):
+        get_driver = GetChromeDriver(OsPlatform.linux)
+        get_driver.sync_manifests()
+
+        server.versions.append(driver_version("116.0.5793.0"))
+        rows = get_driver.sync_manifests()
+
+        assert manifest_sync.new_versions(rows) == ["116.0.5793.0"]
+        assert manifest_sync.read_delta()["rows"] == rows
+        assert len(list(manifest_sync.read_index())) == 4
+        state = manifest_sync.load_state()
+        assert state[constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL]["count"] == 2
+
+    def test_rewritten_manifest_is_diffed_against_index(self, server):
+        get_driver = GetChromeDriver(OsPlatform.linux)
+        get_driver.sync_manifests()
+
+        server.versions = [driver_version("116.0.5793.0")] + server.versions
+        rows = get_driver.sync_manifests()
+
+        assert manifest_sync.new_versions(rows) == ["116.0.5793.0"]
+        assert len(list(manifest_sync.read_index())) == 4
+
+    def test_separate_sync_directory(self, server, tmp_path):
+        GetChromeDriver(OsPlatform.linux).sync_manifests(root=str(tmp_path))
+
+        assert list(manifest_sync.read_index()) == []
+        assert len(list(manifest_sync.read_index(str(tmp_path)))) == 3
@@ -0,0 +1,98 @@
+import io
+import json
+
+import pytest
+
+from get_chrome_driver import GetChromeDriver, constants, matrix
+from get_chrome_driver.enums import OsPlatform, Platform
+from tests.conftest import FakeResponse
+
+LEGACY_LISTING = b"""<?xml version='1.0' encoding='UTF-8'?>
+<ListBucketResult xmlns="http://doc.s3.amazonaws.com/2006-03-01">
+<Name>chromedriver</Name>
+<Contents><Key>2.9/chromedriver_linux64.zip</Key></Contents>
+<Contents><Key>2.9/notes.txt</Key></Contents>
+<Contents><Key>LATEST_RELEASE</Key></Contents>
+<Contents><Key>114.0.5735.90/chromedriver_linux64.zip</Key></Contents>
+<Contents><Key>114.0.5735.90/chromedriver_win32.zip</Key></Contents>
+</ListBucketResult>"""
+
+KNOWN_GOOD_VERSIONS = {
+    "versions": [
+        {"version": "113.0.5672.0", "downloads": {}},
+        {
+            "version": "115.0.5763.0",
+            "downloads": {
+                "chromedriver": [
+                    {"platform": "linux64", "url": "https://cft/115/linux64.zip"},
+                    {"platform": "win64", "url": "https://cft/115/win64.zip"},
+                ]
+            },
+        },
+    ]
+}
+
+
+@pytest.fixture
+def get_driver(monkeypatch):
+    monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+    calls = []
+
+    def request(method, url, **kwargs):
+        calls.append(url)
+        if url == constants.CHROMEDRIVER_STORAGE_URL:
+            return FakeResponse(LEGACY_LISTING)
+        if url == constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL:
+            return FakeResponse(json.dumps(KNOWN_GOOD_VERSIONS).encode())
+        raise AssertionError(url)
+
+    monkeypatch.setattr("requests.request", request)
+    get_driver = GetChromeDriver(OsPlatform.linux)
+    get_driver.calls = calls
+    return get_driver
+
+
+class TestMatrix:
+    def test_all_rows_in_one_pass(self, get_driver):
+        rows = list(get_driver.version_matrix())
+
+        assert [(row["version"], row["platform"], row["api"]) for row in rows] == [
+            ("2.9", "linux64", "legacy"),
+            ("114.0.5735.90", "linux64", "legacy"),
+            ("114.0.5735.90", "win32", "legacy"),
+            ("115.0.5763.0", "linux64", "new"),
+            ("115.0.5763.0", "win64", "new"),
+        ]
+        assert rows[0]["url"] == (
+            "https://chromedriver.storage.googleapis.com/2.9/chromedriver_linux64.zip"
+        )
+        assert len(get_driver.calls) == 2
+
+    def test_filters(self, get_driver):
+        rows = list(
+            get_driver.version_matrix(
+                min_milestone=100, max_milestone=114, platforms=[Platform.linux64]
+            )
+        )
+
+        assert [(row["version"], row["platform"]) for row in rows] == [
+            ("114.0.5735.90", "linux64")
+        ]
+
+    def test_write_csv(self, get_driver):
+        file = io.StringIO()
+        count = matrix.write_csv(get_driver.version_matrix(platforms=["win64"]), file)
+
+        assert count == 1
+        assert file.getvalue().splitlines() == [
+            "version,platform,url,source,api",
+            f"115.0.5763.0,win64,https://cft/115/win64.zip,"
+            f"{constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL},new",
+        ]
+
+    def test_write_jsonl(self, get_driver):
+        file = io.StringIO()
+        count = matrix.write_jsonl(get_driver.version_matrix(), file)
+
+        assert count == 5
+        assert json.loads(file.getvalue().splitlines()[-1])["platform"] == "win64"
@@ -0,0 +1,143 @@
+import time
+
+import pytest
+from requests.exceptions import Timeout
+
+from get_chrome_driver import GetChromeDriver, constants
+from get_chrome_driver.enums import OsPlatform
+from get_chrome_driver.exceptions import GetChromeDriverError, VersionUrlError
+from get_chrome_driver.negative_cache import NegativeCache
+from tests.conftest import FakePopen, FakeResponse
+
+EMPTY_LISTING = b"""<?xml version='1.0' encoding='UTF-8'?>
+<ListBucketResult xmlns="http://doc.s3.amazonaws.com/2006-03-01">
+</ListBucketResult>"""
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+    calls = []
+
+    def request(method, url, **kwargs):
+        calls.append((method, url))
+        if url == constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL:
+            return FakeResponse(content=b'{"versions": []}')
+        if url == constants.CHROMEDRIVER_STORAGE_URL:
+            return FakeResponse(content=EMPTY_LISTING)
+        return FakeResponse(status_code=404)
+
+    monkeypatch.setattr("requests.request", request)
+    return calls
+
+
+class TestNegativeCache:
+    def test_add_and_get(self):
+        cache = NegativeCache(ttl=60)
+        cache.add("version_url/linux/64/1.0.0.0", "1.0.0.0", "No download")
+
+        assert cache.get("version_url/linux/64/1.0.0.0") == "No download"
+        assert cache.get("version_url/linux/64/2.0.0.0") is None
+
+    def test_shared_between_instances(self):
+        NegativeCache(ttl=60).add("key", "1.0.0.0", "No download")
+
+        assert NegativeCache(ttl=60).get("key") == "No download"
+
+    def test_expires(self):
+        cache = NegativeCache(ttl=0.05)
+        cache.add("key", "1.0.0.0", "No download")
+        time.sleep(0.1)
+
+        assert cache.get("key") is None
+
+    def test_discard_versions(self):
+        cache = NegativeCache(ttl=60)
+        cache.add("version_url/linux/64/114.0.5735.90", "114.0.5735.90", "x")
+        cache.add("matching_version/114.0.5735.45", "114.0.5735.45", "x")
+        cache.add("version_url/linux/64/115.0.5763.0", "115.0.5763.0", "x")
+
+        NegativeCache(ttl=60).discard_versions(["114.0.5735.90"])
+
+        assert cache.get("version_url/linux/64/114.0.5735.90") is None
+        assert cache.get("matching_version/114.0.5735.45") is None
+        assert cache.get("version_url/linux/64/115.0.5763.0") == "x"
+
+    def test_clear(self):
+        cache = NegativeCache(ttl=60)
+        cache.add("key", "1.0.0.0", "No download")
+        cache.clear()
+
+        assert cache.get("key") is None
+
+
+class TestKnownMisses:
+    def test_miss_fails_without_requests(self, calls):
+        with pytest.raises(VersionUrlError):
+            GetChromeDriver(OsPlatform.linux).version_url("1.0.0.0")
+        assert calls
+
+        calls.clear()
+        with pytest.raises(VersionUrlError):
+            GetChromeDriver(OsPlatform.linux).version_url("1.0.0.0")
+        assert calls == []
+
+    def test_platforms_are_cached_separately(self, calls):
+        with pytest.raises(VersionUrlError):
+            GetChromeDriver(OsPlatform.linux).version_url("1.0.0.0")
+
+        calls.clear()
+        with pytest.raises(VersionUrlError):
+            GetChromeDriver(OsPlatform.win).version_url("1.0.0.0")
+        assert calls
+
+    def test_disabled(self, calls):
+        for _ in range(2):
+            calls.clear()
+            with pytest.raises(VersionUrlError):
+                GetChromeDriver(OsPlatform.linux, negative_ttl=0).version_url("1.0.0.0")
+            assert calls
+
+    @pytest.mark.parametrize("failure", [FakeResponse(status_code=503), Timeout()])
+    def test_failed_fetch_is_not_a_miss(self, failure, monkeypatch):
+        monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+        calls = []
+
+        def request(method, url, **kwargs):
+            calls.append((method, url))
+            if url == constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL:
+                return FakeResponse(content=b'{"versions": []}')
+            if isinstance(failure, Exception):
+                raise failure
+            return failure
+
+        monkeypatch.setattr("requests.request", request)
+        monkeypatch.setattr("get_chrome_driver.rate_limit.time.sleep", lambda _: None)
+
+        for _ in range(2):
+            calls.clear()
+            with pytest.raises(GetChromeDriverError) as err:
+                GetChromeDriver(OsPlatform.linux).version_url("1.0.0.0")
+            assert not isinstance(err.value, VersionUrlError)
+            assert calls
+
+    def test_missing_known_good_versions_is_not_a_miss(self, monkeypatch):
+        monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+        monkeypatch.setattr(FakePopen, "version", "1.0.0.1")
+        monkeypatch.setattr("get_chrome_driver.get_driver.subprocess.Popen", FakePopen)
+        calls = []
+
+        def request(method, url, **kwargs):
+            calls.append((method, url))
+            if url == constants.CHROMEDRIVER_STORAGE_URL:
+                return FakeResponse(content=EMPTY_LISTING)
+            return FakeResponse(status_code=503)
+
+        monkeypatch.setattr("requests.request", request)
+        monkeypatch.setattr("get_chrome_driver.rate_limit.time.sleep", lambda _: None)
+
+        for _ in range(2):
+            calls.clear()
+            with pytest.raises(GetChromeDriverError, match="Could not fetch"):
+                GetChromeDriver(OsPlatform.linux, use_catalog=False).matching_version()
+            assert calls
@@ -0,0 +1,142 @@
+import os
+import socket
+import time
+
+import pytest
+
+from get_chrome_driver import GetChromeDriver, constants, get_driver, manifest_sync
+from get_chrome_driver.enums import OsPlatform
+from get_chrome_driver.exceptions import OfflineError
+from get_chrome_driver.transport import MemoryTransport
+from tests.conftest import FakePopen
+
+LEGACY_LISTING = b"""<?xml version='1.0' encoding='UTF-8'?>
+<ListBucketResult xmlns="http://doc.s3.amazonaws.com/2006-03-01">
+<Contents><Key>114.0.5735.90/chromedriver_linux64.zip</Key></Contents>
+</ListBucketResult>"""
+
+NEW_URL = "https://storage.googleapis.com/chrome-for-testing-public/120.0.6099.109/linux64/chromedriver-linux64.zip"
+KNOWN_GOOD_VERSIONS = {
+    "versions": [
+        {
+            "version": "120.0.6099.109",
+            "downloads": {"chromedriver": [{"platform": "linux64", "url": NEW_URL}]},
+        }
+    ]
+}
+
+
+@pytest.fixture
+def no_sockets(monkeypatch, tmp_path):
+    """Fail on any socket or name lookup, and run in an empty directory."""
+
+    def refuse(*args, **kwargs):
+        raise AssertionError("A socket was opened")
+
+    monkeypatch.setattr(socket.socket, "__init__", refuse)
+    monkeypatch.setattr(socket, "getaddrinfo", refuse)
+    monkeypatch.setattr(socket, "create_connection", refuse)
+    monkeypatch.setattr(FakePopen, "version", "120.0.6099.71")
+    monkeypatch.setattr(get_driver.subprocess, "Popen", FakePopen)
+    monkeypatch.setenv("PATH", os.environ.get("PATH", ""))
+    monkeypatch.chdir(tmp_path)
+
+
+def store_driver(version: str):
+    path = os.path.join(constants.STORE_DIR, version, "bin")
+    os.makedirs(path)
+    with open(os.path.join(path, "chromedriver"), "w") as file:
+        file.write("#!/bin/sh\n")
+
+
+@pytest.mark.usefixtures("no_sockets")
+class TestOffline:
+    def test_resolves_from_the_catalog_and_the_store(self):
+        transport = MemoryTransport(
+            {
+                constants.CHROMEDRIVER_STORAGE_URL: LEGACY_LISTING,
+                constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL: KNOWN_GOOD_VERSIONS,
+            }
+        )
+        GetChromeDriver(OsPlatform.linux, transport=transport).build_catalog()
+        store_driver("120.0.6099.109")
+
+        driver = GetChromeDriver(OsPlatform.linux, offline=True)
+
+        assert driver.version_url("120.0.6099.109") == NEW_URL
+        assert driver.matching_version() == "120.0.6099.109"
+        assert driver.install().endswith("chromedriver/120.0.6099.109/bin")
+
+    def test_prefers_the_store_to_a_catalog_ahead_of_it(self):
+        known_good_versions = {
+            "versions": [
+                {
+                    "version": version,
+                    "downloads": {
+                        "chromedriver": [
+                            {
+                                "platform": "linux64",
+                                "url": NEW_URL.replace("120.0.6099.109", version),
+                            }
+                        ]
+                    },
+                }
+                for version in ("120.0.6099.62", "120.0.6099.109")
+            ]
+        }
+        transport = MemoryTransport(
+            {
+                constants.CHROMEDRIVER_STORAGE_URL: LEGACY_LISTING,
+                constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL: known_good_versions,
+            }
+        )
+        GetChromeDriver(OsPlatform.linux, transport=transport).build_catalog()
+        store_driver("120.0.6099.62")
+
+        driver = GetChromeDriver(OsPlatform.linux, offline=True)
+
+        assert driver.matching_version() == "120.0.6099.62"
+        assert driver.install().endswith("chromedriver/120.0.6099.62/bin")
+
+    def test_resolves_from_the_sync_index_and_the_store(self):
+        manifest_sync.append_index(
+            [
+                {
+                    "version": "120.0.6099.109",
+                    "platform": "linux64",
+                    "url": NEW_URL,
+                    "source": constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL,
+                    "api": "new",
+                }
+            ]
+        )
+        store_driver("120.0.6099.62")
+
+        driver = GetChromeDriver(OsPlatform.linux, offline=True)
+
+        assert driver.version_url("120.0.6099.109") == NEW_URL
+        # The stored version installs offline, the newer indexed one does not
+        assert driver.matching_version() == "120.0.6099.62"
+        assert driver.install().endswith("chromedriver/120.0.6099.62/bin")
+
+    def test_missing_data_fails_at_once(self):
+        driver = GetChromeDriver(OsPlatform.linux, offline=True)
+
+        start = time.monotonic()
+        with pytest.raises(OfflineError):
+            driver.version_url("120.0.6099.109")
+        with pytest.raises(OfflineError):
+            driver.stable_version()
+        with pytest.raises(OfflineError):
+            driver.download_version("120.0.6099.109", extract=True)
+        assert time.monotonic() - start < 1
+
+        # Missing data is not remembered as a version without a download
+        store_driver("120.0.6099.109")
+        assert driver.install().endswith("chromedriver/120.0.6099.109/bin")
+
+    def test_environment(self, monkeypatch):
+        monkeypatch.setenv(constants.OFFLINE_ENV, "1")
+
+        with pytest.raises(OfflineError):
+            GetChromeDriver(OsPlatform.linux).version_url("120.0.6099.109")
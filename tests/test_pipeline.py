@@ -0,0 +1,143 @@
+import threading
+from collections import Counter
+
+import pytest
+
+from get_chrome_driver import GetChromeDriver, constants, get_driver
+from get_chrome_driver.enums import OsPlatform
+from tests.conftest import FakePopen, FakeResponse
+
+LEGACY_LISTING = b"""<?xml version='1.0' encoding='UTF-8'?>
+<ListBucketResult xmlns="http://doc.s3.amazonaws.com/2006-03-01">
+<Contents><Key>114.0.5735.90/chromedriver_linux64.zip</Key></Contents>
+</ListBucketResult>"""
+
+# Seconds to wait for the other steps before a step gives up
+STEP_TIMEOUT = 5
+
+
+class SteppedPopen(FakePopen):
+    steps = None
+
+    def communicate(self, timeout=None):
+        if self.steps:
+            self.steps.wait()
+        return super().communicate(timeout)
+
+
+@pytest.fixture
+def steps(monkeypatch):
+    """
+    Barrier of the two manifest fetches and the browser detection, which is broken
+    unless all three wait for it at the same time.
+    """
+
+    barrier = threading.Barrier(3, timeout=STEP_TIMEOUT)
+    monkeypatch.setattr(SteppedPopen, "steps", barrier)
+    return barrier
+
+
+@pytest.fixture
+def requests_by_url(monkeypatch):
+    monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+    requests_by_url = Counter()
+
+    def request(method, url, **kwargs):
+        requests_by_url[url] += 1
+        if SteppedPopen.steps:
+            SteppedPopen.steps.wait()
+        if url == constants.CHROMEDRIVER_STORAGE_URL:
+            return FakeResponse(LEGACY_LISTING)
+        return FakeResponse(b'{"versions": []}')
+
+    monkeypatch.setattr("requests.request", request)
+    monkeypatch.setattr(get_driver.subprocess, "Popen", SteppedPopen)
+
+    return requests_by_url
+
+
+class TestPipeline:
+    def test_matching_version_runs_steps_concurrently(self, steps, requests_by_url):
+        driver = GetChromeDriver(OsPlatform.linux, use_catalog=False)
+
+        # One after the other, the first step would break the barrier
+        assert driver.matching_version() == "114.0.5735.90"
+        assert not steps.broken
+        assert set(requests_by_url.values()) == {1}
+
+    def test_auto_download_reuses_fetched_manifests(
+        self, requests_by_url, monkeypatch, tmp_path
+    ):
+        downloaded = []
+
+        def download(url, output_path, **kwargs):
+            downloaded.append(url)
+            return f"{output_path}/chromedriver_linux64.zip", "chromedriver_linux64.zip"
+
+        monkeypatch.setattr(get_driver.downloader, "download", download)
+
+        driver = GetChromeDriver(OsPlatform.linux, use_catalog=False)
+        driver.auto_download(output_path=str(tmp_path))
+
+        assert downloaded == [
+            f"{constants.CHROMEDRIVER_STORAGE_URL}/114.0.5735.90/chromedriver_linux64.zip"
+        ]
+        # The download URL is resolved from the manifests fetched for the match
+        assert requests_by_url == {
+            constants.CHROMEDRIVER_STORAGE_URL: 1,
+            constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL: 1,
+        }
+
+    def test_catalog_skips_fetches(self, requests_by_url, monkeypatch):
+        class Catalog:
+            def age(self):
+                return 0
+
+            def latest_matching(self, version):
+                return "114.0.5735.90"
+
+        monkeypatch.setattr(get_driver.catalog, "load", lambda: Catalog())
+
+        driver = GetChromeDriver(OsPlatform.linux)
+
+        assert driver.matching_version() == "114.0.5735.90"
+        assert not requests_by_url
+
+    def test_failed_call_stops_fetches(self, monkeypatch):
+        monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+        requests = []
+
+        # time.sleep is patched away for the retry backoff
+        def pause(seconds: float):
+            threading.Event().wait(seconds)
+
+        class FailingResponse:
+            status_code = 503
+            ok = False
+            headers = {}
+
+            def close(self):
+                pass
+
+        def request(method, url, **kwargs):
+            requests.append(url)
+            pause(0.05)
+            return FailingResponse()
+
+        def no_browser(args, **kwargs):
+            raise FileNotFoundError(args[0])
+
+        monkeypatch.setattr("requests.request", request)
+        monkeypatch.setattr("get_chrome_driver.rate_limit.time.sleep", lambda _: None)
+        monkeypatch.setattr(get_driver.subprocess, "Popen", no_browser)
+
+        driver = GetChromeDriver(OsPlatform.linux, use_catalog=False)
+        with pytest.raises(FileNotFoundError):
+            driver.matching_version()
+
+        # Requests in flight finish, the retries are not sent
+        pause(0.1)
+        sent = len(requests)
+        pause(0.3)
+        assert len(requests) == sent
+        assert sent <= 4
@@ -0,0 +1,167 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+from get_chrome_driver import constants, prefetch, store
+from get_chrome_driver.enums import OsPlatform, Phase
+from get_chrome_driver.transport import MemoryTransport
+
+STABLE_URL = "https://storage.googleapis.com/chrome-for-testing-public/120.0.6099.109/linux64/chromedriver-linux64.zip"
+BETA_URL = "https://storage.googleapis.com/chrome-for-testing-public/121.0.6167.57/linux64/chromedriver-linux64.zip"
+
+
+class StopPrefetching(Exception):
+    pass
+
+
+class FakeTime:
+    """Stands in for the time module of prefetch, sleeps are recorded."""
+
+    def __init__(self, stop_after: int):
+        self.sleeps = []
+        self.__stop_after = stop_after
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        if len(self.sleeps) == self.__stop_after:
+            raise StopPrefetching()
+
+
+def archive() -> bytes:
+    content = io.BytesIO()
+    with zipfile.ZipFile(content, "w") as zip_file:
+        zip_file.writestr("chromedriver-linux64/chromedriver", "#!/bin/sh\n")
+    return content.getvalue()
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+    monkeypatch.setattr("get_chrome_driver.get_driver.pl.system", lambda: "Linux")
+
+    def no_network(method, url, **kwargs):
+        raise AssertionError(f"Requested {url}")
+
+    monkeypatch.setattr("requests.request", no_network)
+
+    return MemoryTransport(
+        {
+            constants.LAST_KNOWN_GOOD_VERSIONS_URL: {
+                "channels": {
+                    "Stable": {"version": "120.0.6099.109"},
+                    "Beta": {"version": "121.0.6167.57"},
+                }
+            },
+            constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL: {
+                "versions": [
+                    {
+                        "version": version,
+                        "downloads": {
+                            "chromedriver": [{"platform": "linux64", "url": url}]
+                        },
+                    }
+                    for version, url in [
+                        ("120.0.6099.109", STABLE_URL),
+                        ("121.0.6167.57", BETA_URL),
+                    ]
+                ]
+            },
+            STABLE_URL: archive(),
+            BETA_URL: archive(),
+        }
+    )
+
+
+def downloads(transport: MemoryTransport) -> list:
+    return [
+        url
+        for method, url in transport.requests
+        if method == "GET" and url in (STABLE_URL, BETA_URL)
+    ]
+
+
+class TestPrefetch:
+    def test_downloads_into_the_store_root(self, transport, tmp_path):
+        root = str(tmp_path / "store")
+
+        downloaded = prefetch.prefetch(OsPlatform.linux, root=root, transport=transport)
+
+        assert downloaded == ["120.0.6099.109", "121.0.6167.57"]
+        for version in downloaded:
+            driver = os.path.join(
+                store.version_dir(version, root), "bin", "chromedriver"
+            )
+            assert os.path.isfile(driver)
+        assert not os.path.exists(constants.STORE_DIR)
+
+    def test_skips_versions_in_the_store(self, transport, tmp_path):
+        root = str(tmp_path / "store")
+        prefetch.prefetch(
+            OsPlatform.linux, phases=[Phase.stable], root=root, transport=transport
+        )
+        transport.requests.clear()
+
+        downloaded = prefetch.prefetch(OsPlatform.linux, root=root, transport=transport)
+
+        assert downloaded == ["121.0.6167.57"]
+        assert downloads(transport) == [BETA_URL]
+
+    def test_skips_compressed_versions(self, transport, tmp_path):
+        root = str(tmp_path / "store")
+        version_dir = store.version_dir("120.0.6099.109", root)
+        os.makedirs(version_dir)
+        filename = constants.STORE_COMPRESSED_FILENAMES["xz"]
+        open(os.path.join(version_dir, filename), "w").close()
+
+        downloaded = prefetch.prefetch(
+            OsPlatform.linux, phases=[Phase.stable], root=root, transport=transport
+        )
+
+        assert downloaded == []
+        assert downloads(transport) == []
+
+
+class TestRun:
+    def test_runs_on_a_jittered_schedule(self, transport, tmp_path, monkeypatch):
+        runs = []
+        fake_time = FakeTime(stop_after=2)
+        monkeypatch.setattr(prefetch, "time", fake_time)
+
+        with pytest.raises(StopPrefetching):
+            prefetch.run(
+                interval=100,
+                jitter=0.2,
+                os_platform=OsPlatform.linux,
+                on_prefetch=runs.append,
+                root=str(tmp_path / "store"),
+                transport=transport,
+            )
+
+        # The second run finds the versions of the first in the store
+        assert runs == [["120.0.6099.109", "121.0.6167.57"], []]
+        assert all(80 <= seconds <= 120 for seconds in fake_time.sleeps)
+
+    def test_failed_run_is_retried(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+        runs = []
+        monkeypatch.setattr(prefetch, "time", FakeTime(stop_after=1))
+
+        # Every manifest is missing
+        with pytest.raises(StopPrefetching):
+            prefetch.run(
+                interval=100,
+                os_platform=OsPlatform.linux,
+                on_prefetch=runs.append,
+                root=str(tmp_path / "store"),
+                transport=MemoryTransport(),
+            )
+
+        assert runs == [[]]
+
+    def test_jittered_interval(self):
+        intervals = [prefetch.jittered_interval(100, 0.2) for _ in range(100)]
+
+        assert all(80 <= interval <= 120 for interval in intervals)
+        assert prefetch.jittered_interval(100, 0) == 100
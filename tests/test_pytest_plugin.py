@@ -0,0 +1,113 @@
+import os
+import sys
+
+import pytest
+
+from get_chrome_driver import pytest_plugin
+from get_chrome_driver.get_driver import GetChromeDriver
+
+pytest_plugins = ["pytester"]
+
+TEST_FILE = """
+def test_one(chromedriver_path):
+    print("path", chromedriver_path)
+
+def test_two(chromedriver_path):
+    print("path", chromedriver_path)
+"""
+
+
+@pytest.fixture
+def installs(monkeypatch, tmp_path):
+    installs = []
+
+    def install(self, output_path=None, chromium=False):
+        installs.append(chromium)
+        return str(tmp_path)
+
+    monkeypatch.setattr(GetChromeDriver, "install", install)
+    return installs
+
+
+def test_installed_once_per_session(pytester, installs, tmp_path):
+    pytester.makepyfile(TEST_FILE)
+
+    result = pytester.runpytest_inprocess("-p", "get_chrome_driver.pytest_plugin")
+
+    result.assert_outcomes(passed=2)
+    assert installs == [False]
+    result.stdout.fnmatch_lines(["chromedriver: installed * in *s"])
+
+
+def test_installed_at_session_start(pytester, installs):
+    pytester.makepyfile("def test_nothing():\n    pass\n")
+
+    result = pytester.runpytest_inprocess(
+        "-p", "get_chrome_driver.pytest_plugin", "--chromedriver"
+    )
+
+    result.assert_outcomes(passed=1)
+    assert installs == [False]
+
+
+def test_not_installed_when_unused(pytester, installs):
+    pytester.makepyfile("def test_nothing():\n    pass\n")
+
+    result = pytester.runpytest_inprocess("-p", "get_chrome_driver.pytest_plugin")
+
+    result.assert_outcomes(passed=1)
+    assert installs == []
+    assert "chromedriver:" not in result.stdout.str()
+
+
+def test_chromium(pytester, installs):
+    pytester.makepyfile(TEST_FILE)
+
+    pytester.runpytest_inprocess(
+        "-p", "get_chrome_driver.pytest_plugin", "--chromedriver-chromium"
+    )
+
+    assert installs == [True]
+
+
+def test_failure_is_reported_by_fixture(pytester, monkeypatch):
+    def install(self, output_path=None, chromium=False):
+        raise FileNotFoundError("google-chrome")
+
+    monkeypatch.setattr(GetChromeDriver, "install", install)
+    pytester.makepyfile(TEST_FILE + "\ndef test_other():\n    pass\n")
+
+    result = pytester.runpytest_inprocess(
+        "-p", "get_chrome_driver.pytest_plugin", "--chromedriver"
+    )
+
+    result.assert_outcomes(passed=1, errors=2)
+    result.stdout.fnmatch_lines(["chromedriver: failed after *s: google-chrome"])
+
+
+def test_worker_uses_path_from_controller(installs, monkeypatch):
+    monkeypatch.setenv("PATH", os.environ.get("PATH", ""))
+
+    class Config:
+        workerinput = {
+            "chromedriver_resolved": True,
+            "chromedriver_path": os.path.join("drivers", "chromedriver"),
+            "chromedriver_error": None,
+        }
+        workeroutput = {}
+
+    plugin = pytest_plugin.ChromeDriverPlugin(Config())
+
+    assert plugin.chromedriver_path() == os.path.join("drivers", "chromedriver")
+    assert installs == []
+
+
+def test_plugin_does_not_import_the_package_when_loaded(pytester):
+    result = pytester.run(
+        sys.executable,
+        "-c",
+        "import sys, get_chrome_driver.pytest_plugin; "
+        "print('get_chrome_driver.get_driver' in sys.modules)",
+    )
+
+    assert result.outlines == ["False"]
@@ -0,0 +1,175 @@
+import email.utils
+import os
+import time
+
+import pytest
+from requests.exceptions import ConnectionError
+
+from get_chrome_driver import constants, deadline, rate_limit
+from get_chrome_driver.enums import Stage
+from get_chrome_driver.exceptions import DeadlineExceededError
+from get_chrome_driver.rate_limit import RateLimiter
+from tests.conftest import FakeResponse
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record sleeps instead of sleeping."""
+
+    slept = []
+    monkeypatch.setattr(rate_limit.time, "sleep", slept.append)
+    return slept
+
+
+class TestRateLimiter:
+    def test_burst_then_wait(self, sleeps):
+        limiter = RateLimiter(rate=10, burst=2)
+
+        limiter.acquire("https://a/x")
+        limiter.acquire("https://a/y")
+        assert sleeps == []
+
+        limiter.acquire("https://a/z")
+        assert len(sleeps) >= 1
+        assert 0 < sleeps[0] <= 0.1
+
+    def test_hosts_have_own_buckets(self, sleeps):
+        limiter = RateLimiter(rate=1, burst=1)
+
+        limiter.acquire("https://a/x")
+        limiter.acquire("https://b/x")
+
+        assert sleeps == []
+
+    def test_wait_past_the_deadline_is_not_slept(self, sleeps):
+        limiter = RateLimiter(rate=1000, burst=10)
+        limiter.retry_after("https://a/x", 60)
+
+        with deadline.scope(timeout=10):
+            with pytest.raises(DeadlineExceededError):
+                with deadline.stage(Stage.metadata) as time_left:
+                    limiter.acquire("https://a/x", time_left=time_left)
+
+        assert sleeps == []
+
+    def test_retry_after_blocks_host(self):
+        limiter = RateLimiter(rate=1000, burst=10)
+        limiter.retry_after("https://a/x", 0.2)
+
+        start = time.monotonic()
+        limiter.acquire("https://a/y")
+
+        assert time.monotonic() - start >= 0.15
+
+    def test_shared_state_in_cache_dir(self, cache_dir, sleeps):
+        RateLimiter(rate=1, burst=1, shared=True).acquire("https://a/x")
+
+        assert os.path.isfile(
+            os.path.join(cache_dir, constants.RATE_LIMIT_DIRNAME, "a.json")
+        )
+
+        # Another limiter, e.g. in another process, finds the bucket empty
+        RateLimiter(rate=1, burst=1, shared=True).acquire("https://a/x")
+        assert len(sleeps) >= 1
+
+
+class TestSend:
+    def test_retries_until_success(self, sleeps):
+        responses = [
+            FakeResponse(status_code=503),
+            FakeResponse(status_code=429),
+            FakeResponse(status_code=200),
+        ]
+
+        response = rate_limit.send(lambda: responses.pop(0), "https://a/x")
+
+        assert response.status_code == 200
+        assert len(sleeps) == 2
+
+    def test_returns_last_response_when_retries_run_out(self, sleeps):
+        response = rate_limit.send(
+            lambda: FakeResponse(status_code=503), "https://a/x", retries=2
+        )
+
+        assert response.status_code == 503
+        assert len(sleeps) == 2
+
+    def test_does_not_retry_client_errors(self, sleeps):
+        response = rate_limit.send(lambda: FakeResponse(status_code=404), "https://a/x")
+
+        assert response.status_code == 404
+        assert sleeps == []
+
+    def test_retries_connection_errors(self, sleeps):
+        def request():
+            raise ConnectionError("down")
+
+        with pytest.raises(ConnectionError):
+            rate_limit.send(request, "https://a/x", retries=1)
+        assert len(sleeps) == 1
+
+    def test_honours_retry_after(self, sleeps):
+        responses = [
+            FakeResponse(status_code=429, headers={"Retry-After": "3"}),
+            FakeResponse(status_code=200),
+        ]
+
+        rate_limit.send(lambda: responses.pop(0), "https://a/x")
+
+        assert sleeps == [3]
+
+    def test_retry_after_past_the_deadline_is_not_waited(self, sleeps):
+        responses = [
+            FakeResponse(status_code=429, headers={"Retry-After": "60"}),
+            FakeResponse(status_code=200),
+        ]
+
+        with deadline.scope(stage_timeouts={"metadata": 10}):
+            with pytest.raises(DeadlineExceededError):
+                with deadline.stage(Stage.metadata) as time_left:
+                    rate_limit.send(
+                        lambda: responses.pop(0), "https://a/x", time_left=time_left
+                    )
+
+        assert sleeps == []
+
+    def test_retry_after_within_the_deadline_is_waited(self, sleeps):
+        responses = [
+            FakeResponse(status_code=429, headers={"Retry-After": "3"}),
+            FakeResponse(status_code=200),
+        ]
+
+        response = rate_limit.send(
+            lambda: responses.pop(0), "https://a/x", time_left=lambda needed=0: 10
+        )
+
+        assert response.status_code == 200
+        assert sleeps == [3]
+
+    def test_backoff_has_jitter_and_cap(self, sleeps):
+        rate_limit.send(
+            lambda: FakeResponse(status_code=500),
+            "https://a/x",
+            retries=6,
+            backoff_factor=1,
+            backoff_max=4,
+        )
+
+        assert all(0 <= sleep <= 4 for sleep in sleeps)
+
+
+class TestRetryAfter:
+    def test_seconds(self):
+        assert rate_limit.retry_after(FakeResponse(headers={"Retry-After": "7"})) == 7
+
+    def test_http_date(self):
+        date = email.utils.formatdate(time.time() + 30, usegmt=True)
+        seconds = rate_limit.retry_after(FakeResponse(headers={"Retry-After": date}))
+
+        assert 25 <= seconds <= 30
+
+    def test_missing_or_invalid(self):
+        assert rate_limit.retry_after(FakeResponse()) is None
+        assert (
+            rate_limit.retry_after(FakeResponse(headers={"Retry-After": "x"})) is None
+        )
@@ -0,0 +1,116 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from get_chrome_driver import deadline, get_driver
+from get_chrome_driver.enums import OsPlatform
+from get_chrome_driver.exceptions import DeadlineExceededError
+from get_chrome_driver.get_driver import GetChromeDriver, add_to_path
+from get_chrome_driver.single_flight import SingleFlight
+from get_chrome_driver.transport import MemoryTransport, PooledTransport
+
+
+class KeyRecorder:
+    """Stands in for the in-flight calls of get_driver, records their keys."""
+
+    def __init__(self):
+        self.keys = []
+
+    def do(self, key, func):
+        self.keys.append(key)
+        return "result"
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_are_coalesced(self):
+        flights = SingleFlight()
+        calls = []
+
+        def func():
+            calls.append(threading.get_ident())
+            time.sleep(0.2)
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: flights.do("key", func), range(8)))
+
+        assert results == ["result"] * 8
+        assert len(calls) == 1
+
+    def test_error_is_shared(self):
+        flights = SingleFlight()
+
+        def func():
+            time.sleep(0.2)
+            raise ValueError("failed")
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(flights.do, "key", func) for _ in range(4)]
+
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+
+    def test_follower_waits_within_its_deadline(self):
+        flights = SingleFlight()
+        started = threading.Event()
+
+        def func():
+            started.set()
+            time.sleep(0.5)
+            return "result"
+
+        def follow():
+            with deadline.scope(timeout=0.05):
+                return flights.do("key", func)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(flights.do, "key", func)
+            started.wait()
+            start = time.monotonic()
+            follower = executor.submit(follow)
+
+            with pytest.raises(DeadlineExceededError):
+                follower.result()
+            assert time.monotonic() - start < 0.4
+            assert leader.result() == "result"
+
+    def test_sequential_calls_run_again(self):
+        flights = SingleFlight()
+
+        assert flights.do("key", lambda: 1) == 1
+        assert flights.do("key", lambda: 2) == 2
+
+    def test_configurations_do_not_share_calls(self, monkeypatch):
+        monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+        recorder = KeyRecorder()
+        monkeypatch.setattr(get_driver, "_flights", recorder)
+
+        for get_chrome_driver in [
+            GetChromeDriver(OsPlatform.linux),
+            GetChromeDriver(OsPlatform.linux, transport=PooledTransport()),
+            GetChromeDriver(OsPlatform.linux, offline=True),
+            GetChromeDriver(OsPlatform.linux, transport=MemoryTransport()),
+            GetChromeDriver(OsPlatform.linux, use_catalog=False),
+            GetChromeDriver(OsPlatform.mac),
+        ]:
+            get_chrome_driver.version_url("120.0.6099.109")
+
+        # Only the two instances fetching from the network share their calls
+        assert recorder.keys[0] == recorder.keys[1]
+        assert len(set(recorder.keys)) == 5
+
+    def test_add_to_path_is_idempotent(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("PATH", os.pathsep.join(["/usr/bin", "/bin"]))
+
+        add_to_path(str(tmp_path))
+        add_to_path(str(tmp_path))
+
+        assert os.environ["PATH"].split(os.pathsep) == [
+            "/usr/bin",
+            "/bin",
+            str(tmp_path),
+        ]
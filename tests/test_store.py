@@ -0,0 +1,208 @@
+import os
+import time
+
+import pytest
+
+from get_chrome_driver import GetChromeDriver, constants, store
+from get_chrome_driver.enums import OsPlatform
+
+
+def add_version(root, version: str, size: int, days_ago: float):
+    bin_dir = root / version / "bin"
+    bin_dir.mkdir(parents=True)
+    (bin_dir / "chromedriver").write_bytes(b"0" * size)
+    store.touch(version, root=str(root))
+    last_used = time.time() - days_ago * 86400
+    os.utime(root / version / ".last_used", (last_used, last_used))
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "chromedriver"
+    add_version(root, "118.0.5993.70", 100, days_ago=10)
+    add_version(root, "118.0.5993.88", 100, days_ago=5)
+    add_version(root, "119.0.6045.105", 100, days_ago=3)
+    add_version(root, "120.0.6099.109", 100, days_ago=0)
+    return root
+
+
+def record_scans(monkeypatch, paths_in_use: list) -> list:
+    """Replace the process listing, record if 118.0.5993.70 was locked at each."""
+
+    scans = []
+
+    def scan(store_root):
+        version_lock = store.lock("118.0.5993.70", root=store_root)
+        locked = not version_lock.acquire(blocking=False)
+        if not locked:
+            version_lock.release()
+        scans.append(locked)
+        return paths_in_use
+
+    monkeypatch.setattr(store, "__paths_in_use", scan)
+    return scans
+
+
+def remaining(root) -> list:
+    return sorted(stored.version for stored in store.versions(str(root)))
+
+
+class TestStore:
+    def test_versions_least_recently_used_first(self, root):
+        versions = [stored.version for stored in store.versions(str(root))]
+
+        assert versions == [
+            "118.0.5993.70",
+            "118.0.5993.88",
+            "119.0.6045.105",
+            "120.0.6099.109",
+        ]
+
+    def test_max_bytes(self, root):
+        evicted = store.collect_garbage(root=str(root), max_bytes=250)
+
+        assert evicted == ["118.0.5993.70", "118.0.5993.88"]
+        assert remaining(root) == ["119.0.6045.105", "120.0.6099.109"]
+
+    def test_max_versions_per_milestone(self, root):
+        evicted = store.collect_garbage(root=str(root), max_versions_per_milestone=1)
+
+        assert evicted == ["118.0.5993.70"]
+
+    def test_recently_used_is_kept(self, root):
+        evicted = store.collect_garbage(root=str(root), max_bytes=0)
+
+        assert "120.0.6099.109" not in evicted
+        assert remaining(root) == ["120.0.6099.109"]
+
+    def test_locked_is_kept(self, root):
+        with store.lock("118.0.5993.70", root=str(root)):
+            evicted = store.collect_garbage(root=str(root), max_bytes=250)
+
+        assert evicted == ["118.0.5993.88", "119.0.6045.105"]
+
+    def test_no_policy(self, root):
+        assert store.collect_garbage(root=str(root)) == []
+
+    def test_sizes_only_walked_for_max_bytes(self, root, monkeypatch):
+        def dir_size(path):
+            raise AssertionError(f"Walked {path}")
+
+        monkeypatch.setattr(store, "__dir_size", dir_size)
+
+        assert all(stored.size is None for stored in store.versions(str(root), False))
+        assert store.collect_garbage(root=str(root), max_versions_per_milestone=1) == [
+            "118.0.5993.70"
+        ]
+
+    def test_in_use_is_kept(self, root, monkeypatch):
+        scans = record_scans(
+            monkeypatch, [str(root / "118.0.5993.70" / "bin" / "chromedriver")]
+        )
+
+        evicted = store.collect_garbage(root=str(root), max_versions_per_milestone=1)
+
+        assert evicted == []
+        # Skipped with the processes listed before the lock
+        assert scans == [False]
+
+    def test_evicted_is_rescanned_under_the_lock(self, root, monkeypatch):
+        scans = record_scans(monkeypatch, [])
+
+        evicted = store.collect_garbage(root=str(root), max_versions_per_milestone=1)
+
+        assert evicted == ["118.0.5993.70"]
+        assert scans == [False, True]
+
+    def test_processes_not_listed_without_candidates(self, root, monkeypatch):
+        scans = record_scans(monkeypatch, [])
+
+        store.collect_garbage(root=str(root), max_versions_per_milestone=2)
+
+        assert scans == []
+
+
+@pytest.fixture(params=["xz", "zstd"])
+def codec(request, monkeypatch):
+    """Compress with each codec, zstd only when zstandard is installed."""
+
+    if request.param == "zstd":
+        pytest.importorskip("zstandard")
+    else:
+        monkeypatch.setattr(store, "__zstandard", lambda: None)
+    return request.param
+
+
+class TestCompressedStore:
+    def test_idle_versions_are_compressed(self, root, codec):
+        (root / "118.0.5993.70" / "bin" / "chromedriver").write_bytes(b"0" * 1000000)
+
+        compressed = store.compress_idle(root=str(root), min_idle=4 * 86400)
+
+        assert [entry.version for entry in compressed] == [
+            "118.0.5993.70",
+            "118.0.5993.88",
+        ]
+        assert compressed[0].size == 1000000
+        assert compressed[0].compressed_size < 10000
+        assert store.compressed_path("118.0.5993.70", root=str(root)).endswith(
+            constants.STORE_COMPRESSED_FILENAMES[codec]
+        )
+        assert not (root / "118.0.5993.70" / "bin").exists()
+        # Recently used versions stay extracted, compressed versions stay in the store
+        assert (root / "119.0.6045.105" / "bin" / "chromedriver").exists()
+        assert len(remaining(root)) == 4
+
+    def test_locked_is_not_compressed(self, root, codec):
+        with store.lock("118.0.5993.70", root=str(root)):
+            compressed = store.compress_idle(root=str(root), min_idle=4 * 86400)
+
+        assert [entry.version for entry in compressed] == ["118.0.5993.88"]
+
+    def test_in_use_is_not_compressed(self, root, codec, monkeypatch):
+        scans = record_scans(
+            monkeypatch, [str(root / "118.0.5993.70" / "bin" / "chromedriver")]
+        )
+
+        compressed = store.compress_idle(root=str(root), min_idle=6 * 86400)
+
+        assert compressed == []
+        assert scans == [False]
+
+    def test_compressed_is_rescanned_under_the_lock(self, root, codec, monkeypatch):
+        scans = record_scans(monkeypatch, [])
+
+        compressed = store.compress_idle(root=str(root), min_idle=6 * 86400)
+
+        assert [entry.version for entry in compressed] == ["118.0.5993.70"]
+        assert scans == [False, True]
+
+    def test_decompress(self, root, codec):
+        driver = root / "118.0.5993.70" / "bin" / "chromedriver"
+        driver.chmod(0o755)
+        store.compress("118.0.5993.70", root=str(root))
+
+        seconds = store.decompress("118.0.5993.70", root=str(root))
+
+        assert seconds >= 0
+        assert driver.read_bytes() == b"0" * 100
+        assert os.access(driver, os.X_OK)
+        assert store.compressed_path("118.0.5993.70", root=str(root)) is None
+        assert store.decompress("118.0.5993.70", root=str(root)) is None
+
+    def test_download_extracts_a_compressed_version(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+        add_version(tmp_path / constants.STORE_DIR, "120.0.6099.109", 100, 30)
+        store.compress("120.0.6099.109")
+
+        def request(method, url, **kwargs):
+            raise AssertionError(f"Requested {url}")
+
+        monkeypatch.setattr("requests.request", request)
+
+        output_path = GetChromeDriver(OsPlatform.linux).download_version(
+            "120.0.6099.109", extract=True
+        )
+
+        assert (tmp_path / output_path / "chromedriver").read_bytes() == b"0" * 100
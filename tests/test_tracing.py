@@ -0,0 +1,97 @@
+import json
+import threading
+
+import pytest
+
+from get_chrome_driver import GetChromeDriver, constants, get_driver, tracing
+from get_chrome_driver.enums import OsPlatform
+from get_chrome_driver.tracing import Tracer
+from tests.conftest import FakePopen, FakeResponse
+
+LEGACY_LISTING = b"""<?xml version='1.0' encoding='UTF-8'?>
+<ListBucketResult xmlns="http://doc.s3.amazonaws.com/2006-03-01">
+<Contents><Key>114.0.5735.90/chromedriver_linux64.zip</Key></Contents>
+</ListBucketResult>"""
+
+
+class TestTracer:
+    def test_span_is_complete_event(self):
+        tracer = Tracer()
+        with tracer.span("download", "download", url="https://a/x") as args:
+            args["bytes"] = 10
+
+        events = [event for event in tracer.events() if event["ph"] == "X"]
+        assert len(events) == 1
+        assert events[0]["name"] == "download"
+        assert events[0]["cat"] == "download"
+        assert events[0]["args"] == {"url": "https://a/x", "bytes": 10}
+        assert events[0]["dur"] >= 0
+
+    def test_error_is_recorded(self):
+        tracer = Tracer()
+        with pytest.raises(ValueError):
+            with tracer.span("parse", "parse"):
+                raise ValueError("bad")
+
+        assert "bad" in tracer.events()[-1]["args"]["error"]
+
+    def test_threads_are_named(self):
+        tracer = Tracer()
+
+        def run():
+            with tracer.span("work", "test"):
+                pass
+
+        thread = threading.Thread(target=run, name="worker")
+        thread.start()
+        thread.join()
+
+        names = [event for event in tracer.events() if event["ph"] == "M"]
+        assert names[0]["args"] == {"name": "worker"}
+        assert names[0]["tid"] == tracer.events()[-1]["tid"]
+
+    def test_save(self, tmp_path):
+        tracer = Tracer()
+        with tracer.span("install", "api"):
+            pass
+
+        path = tmp_path / "trace.json"
+        tracer.save(str(path))
+
+        trace = json.loads(path.read_text())
+        assert trace["traceEvents"][-1]["name"] == "install"
+
+    def test_span_without_tracer(self):
+        with tracing.span(None, "install", "api", version="1") as args:
+            assert args == {"version": "1"}
+
+
+class TestGetChromeDriverTrace:
+    def test_matching_version_spans(self, monkeypatch):
+        monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+
+        def request(method, url, **kwargs):
+            if url == constants.CHROMEDRIVER_STORAGE_URL:
+                return FakeResponse(LEGACY_LISTING)
+            return FakeResponse(b'{"versions": []}')
+
+        monkeypatch.setattr("requests.request", request)
+        monkeypatch.setattr(get_driver.subprocess, "Popen", FakePopen)
+
+        tracer = Tracer()
+        driver = GetChromeDriver(OsPlatform.linux, use_catalog=False, tracer=tracer)
+
+        assert driver.matching_version() == "114.0.5735.90"
+
+        spans = {event["name"]: event for event in tracer.events()}
+        for name in [
+            "detect browser version",
+            "fetch legacy listing",
+            "parse legacy listing",
+            "parse legacy versions",
+            "fetch manifest",
+            "GET",
+        ]:
+            assert name in spans
+        assert spans["parse legacy listing"]["args"]["keys"] == 1
+        assert spans["GET"]["args"]["status"] == 200
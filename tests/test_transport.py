@@ -0,0 +1,199 @@
+import importlib.util
+import io
+import json
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from get_chrome_driver import GetChromeDriver, constants
+from get_chrome_driver.enums import OsPlatform
+from get_chrome_driver.exceptions import GetChromeDriverError
+from get_chrome_driver.transport import (
+    FileTransport,
+    Http2Transport,
+    MemoryTransport,
+    PooledTransport,
+    RequestsTransport,
+    Transport,
+)
+
+LEGACY_LISTING = b"""<?xml version='1.0' encoding='UTF-8'?>
+<ListBucketResult xmlns="http://doc.s3.amazonaws.com/2006-03-01">
+<Contents><Key>114.0.5735.90/chromedriver_linux64.zip</Key></Contents>
+</ListBucketResult>"""
+
+ARCHIVE_URL = (
+    f"{constants.CHROMEDRIVER_STORAGE_URL}/114.0.5735.90/chromedriver_linux64.zip"
+)
+
+
+def archive() -> bytes:
+    content = io.BytesIO()
+    with zipfile.ZipFile(content, "w") as zip_file:
+        zip_file.writestr("chromedriver", "#!/bin/sh\n")
+    return content.getvalue()
+
+
+@pytest.fixture
+def no_network(monkeypatch):
+    monkeypatch.setenv("GET_CHROME_DRIVER_DAEMON", "0")
+
+    def request(method, url, **kwargs):
+        raise AssertionError(f"Requested {url}")
+
+    monkeypatch.setattr("requests.request", request)
+
+
+@pytest.mark.usefixtures("no_network")
+class TestMemoryTransport:
+    def test_library_runs_against_fixtures(self, tmp_path):
+        transport = MemoryTransport(
+            {
+                constants.CHROMEDRIVER_STORAGE_URL: LEGACY_LISTING,
+                constants.KNOWN_GOOD_VERSIONS_WITH_DOWNLOADS_URL: {"versions": []},
+                ARCHIVE_URL: archive(),
+            }
+        )
+        driver = GetChromeDriver(
+            OsPlatform.linux, use_catalog=False, transport=transport
+        )
+
+        assert driver.version_url("114.0.5735.90") == ARCHIVE_URL
+        output_path = driver.download_version(
+            "114.0.5735.90", output_path=str(tmp_path), extract=True
+        )
+
+        assert (tmp_path / "chromedriver").read_text() == "#!/bin/sh\n"
+        assert output_path == str(tmp_path)
+        assert ("GET", ARCHIVE_URL) in transport.requests
+
+    def test_unknown_url_and_etag(self):
+        transport = MemoryTransport({"https://a/x.json": {"a": 1}})
+
+        response = transport.request("GET", "https://a/x.json")
+        assert response.ok
+        assert response.json() == {"a": 1}
+
+        etag = response.headers["etag"]
+        assert (
+            transport.request(
+                "GET", "https://a/x.json", headers={"If-None-Match": etag}
+            ).status_code
+            == 304
+        )
+        assert transport.request("GET", "https://a/y.json").status_code == 404
+
+
+@pytest.mark.usefixtures("no_network")
+class TestFileTransport:
+    def test_mirror_layout(self, tmp_path):
+        host = tmp_path / "chromedriver.storage.googleapis.com"
+        (host / "114.0.5735.90").mkdir(parents=True)
+        (host / "index").write_bytes(LEGACY_LISTING)
+        (host / "114.0.5735.90" / "chromedriver_linux64.zip").write_bytes(archive())
+
+        transport = FileTransport(str(tmp_path))
+
+        listing = transport.request("GET", constants.CHROMEDRIVER_STORAGE_URL)
+        assert listing.content == LEGACY_LISTING
+
+        head = transport.request("HEAD", ARCHIVE_URL)
+        assert head.status_code == 200
+        assert head.headers["Content-Length"] == str(len(archive()))
+
+        response = transport.request("GET", ARCHIVE_URL, stream=True)
+        assert b"".join(response.iter_content(chunk_size=16)) == archive()
+
+        assert (
+            transport.request(
+                "GET",
+                constants.CHROMEDRIVER_STORAGE_URL,
+                headers={"If-None-Match": listing.headers["ETag"]},
+            ).status_code
+            == 304
+        )
+        assert transport.request("GET", f"{ARCHIVE_URL}.sha").status_code == 404
+        assert transport.request("GET", "https://a/../../etc/passwd").status_code == 404
+
+    def test_download_from_mirror(self, tmp_path):
+        mirror = tmp_path / "mirror"
+        host = mirror / "chromedriver.storage.googleapis.com"
+        (host / "114.0.5735.90").mkdir(parents=True)
+        (host / "index").write_bytes(LEGACY_LISTING)
+        (host / "114.0.5735.90" / "chromedriver_linux64.zip").write_bytes(archive())
+        (mirror / "googlechromelabs.github.io" / "chrome-for-testing").mkdir(
+            parents=True
+        )
+        (
+            mirror
+            / "googlechromelabs.github.io"
+            / "chrome-for-testing"
+            / "known-good-versions-with-downloads.json"
+        ).write_text(json.dumps({"versions": []}))
+
+        driver = GetChromeDriver(
+            OsPlatform.linux, use_catalog=False, transport=FileTransport(str(mirror))
+        )
+        output_path = str(tmp_path / "bin")
+        driver.download_version("114.0.5735.90", output_path=output_path)
+
+        assert (tmp_path / "bin" / "chromedriver_linux64.zip").read_bytes() == archive()
+
+
+class TestRequestsTransports:
+    @pytest.fixture
+    def server(self):
+        connections = set()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                connections.add(self.client_address)
+                body = b"{}"
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_address[1]}", connections
+        server.shutdown()
+        server.server_close()
+
+    def test_pooled_transport_reuses_connections(self, server):
+        url, connections = server
+
+        with PooledTransport() as transport:
+            for _ in range(3):
+                assert transport.request("GET", f"{url}/x.json", timeout=5).json() == {}
+        assert len(connections) == 1
+
+        connections.clear()
+        transport = RequestsTransport()
+        for _ in range(3):
+            assert transport.request("GET", f"{url}/x.json", timeout=5).json() == {}
+        assert len(connections) == 3
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("httpx") is not None, reason="httpx is installed"
+)
+def test_http2_transport_needs_httpx():
+    with pytest.raises(GetChromeDriverError):
+        Http2Transport()
+
+
+def test_transport_without_request_is_not_instantiated():
+    class Incomplete(Transport):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,136 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from get_chrome_driver import GetChromeDriver, constants, get_driver, watch
+from get_chrome_driver.enums import OsPlatform
+
+linux_only = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="inotify is Linux only"
+)
+
+
+class StopWatching(Exception):
+    pass
+
+
+class FakeGetDriver:
+    def __init__(self, driver_path: str):
+        self.driver_path = driver_path
+        self.installs = 0
+
+    def auto_download(self, extract: bool = False, chromium: bool = False) -> str:
+        self.installs += 1
+        os.makedirs(self.driver_path, exist_ok=True)
+        with open(os.path.join(self.driver_path, "chromedriver"), "w") as file:
+            file.write("#!/bin/sh\n")
+        return self.driver_path
+
+
+@pytest.fixture
+def browser(tmp_path, monkeypatch):
+    """A browser executable that reports a version."""
+
+    path = tmp_path / "chrome" / "google-chrome"
+    path.parent.mkdir()
+
+    def install(version: str):
+        path.write_text(f"#!/bin/sh\necho Google Chrome {version}\n")
+        path.chmod(0o755)
+
+    install("114.0.5735.45")
+    monkeypatch.setattr(watch, "LINUX_EXECUTABLES", {False: str(path), True: None})
+    monkeypatch.setattr(watch, "_current_os_platform", lambda: OsPlatform.linux)
+    return install
+
+
+@linux_only
+class TestWatch:
+    def test_current_follows_the_browser(self, browser, tmp_path):
+        fake = FakeGetDriver(str(tmp_path / "driver"))
+
+        state = watch.refresh(fake)
+
+        assert state["browser_version"] == "114.0.5735.45"
+        assert watch.current() == fake.driver_path
+
+        browser("120.0.6099.71")
+        assert watch.current() is None
+
+    def test_current_needs_the_driver(self, browser, tmp_path):
+        fake = FakeGetDriver(str(tmp_path / "driver"))
+        watch.refresh(fake)
+
+        os.remove(tmp_path / "driver" / "chromedriver")
+        assert watch.current() is None
+
+    def test_current_is_kept_per_platform_and_arch(self, browser, tmp_path):
+        fake = FakeGetDriver(str(tmp_path / "driver"))
+        watch.refresh(fake)
+
+        arch = 64 if sys.maxsize > 2**32 else 32
+        other_arch = 32 if arch == 64 else 64
+        assert watch.current(OsPlatform.linux, arch=arch) == fake.driver_path
+        assert watch.current(OsPlatform.linux, arch=other_arch) is None
+
+    def test_install_reads_the_watched_driver(self, browser, tmp_path, monkeypatch):
+        monkeypatch.setenv("PATH", os.environ.get("PATH", ""))
+        version_dir = tmp_path / "chromedriver" / "114.0.5735.90"
+        fake = FakeGetDriver(str(version_dir / "bin"))
+        watch.refresh(fake)
+
+        def no_resolution(*args, **kwargs):
+            raise AssertionError("Resolved")
+
+        monkeypatch.setattr("requests.request", no_resolution)
+        monkeypatch.setattr(get_driver.subprocess, "Popen", no_resolution)
+
+        assert GetChromeDriver(OsPlatform.linux).install() == fake.driver_path
+        # The watched version is marked as used, like any installed one
+        assert (version_dir / constants.STORE_LAST_USED_FILENAME).is_file()
+
+    def test_inotify_reports_changes(self, tmp_path):
+        path = tmp_path / "file"
+        path.write_text("a")
+
+        with watch.Inotify() as inotify:
+            inotify.add_watch(str(path))
+            assert not inotify.wait(0.05)
+
+            path.write_text("b")
+            assert inotify.wait(1)
+
+    def test_run_refreshes_on_update(self, browser, tmp_path):
+        fake = FakeGetDriver(str(tmp_path / "driver"))
+        versions = []
+
+        def on_refresh(state):
+            versions.append(state["browser_version"])
+            if len(versions) == 2:
+                raise StopWatching()
+
+        errors = []
+
+        def run():
+            try:
+                watch.run(fake, poll_interval=10, settle=0.1, on_refresh=on_refresh)
+            except StopWatching:
+                pass
+            except Exception as err:
+                errors.append(err)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+
+        deadline = time.monotonic() + 5
+        while not versions and time.monotonic() < deadline:
+            time.sleep(0.01)
+        browser("120.0.6099.71")
+
+        thread.join(5)
+        assert not errors
+        assert versions == ["114.0.5735.45", "120.0.6099.71"]
+        assert fake.installs == 2